@@ -0,0 +1,114 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List
+from .interfaces import Agent
+from .llm_metrics import percentile
+
+class AgentPool:
+    """Bounded pool of agent instances of one type with checkout/return semantics
+    
+    Agents hold per-instance HTTP sessions and scraper state, so each instance is
+    used by one request at a time. Instances are created on demand up to max_size;
+    past that, checkout blocks until one is returned (or timeout expires).
+    """
+    
+    def __init__(self, agent_type: str, create: Callable[[], Agent], min_size: int = 0, max_size: int = 4,
+                 wait_window: int = 1000):
+        self.agent_type = agent_type
+        self.create = create
+        self.min_size = min_size
+        self.max_size = max(1, max_size, min_size)
+        self._idle: List[Agent] = []
+        self._size = 0  # instances created, including any being built right now
+        self._available = threading.Condition()
+        self._waits = deque(maxlen=wait_window)  # seconds each recent checkout waited
+        self.stats = {'checkouts': 0, 'waited': 0, 'timeouts': 0, 'created': 0, 'wait_seconds': 0.0}
+    
+    def warm_up(self) -> int:
+        """Create instances until min_size exist; returns how many were created"""
+        created = []
+        with self._available:
+            missing = max(0, self.min_size - self._size)
+            self._size += missing
+        try:
+            for _ in range(missing):
+                created.append(self.create())
+        finally:
+            with self._available:
+                self._size -= missing - len(created)
+                self._idle.extend(created)
+                self.stats['created'] += len(created)
+                self._available.notify_all()
+        return len(created)
+    
+    def checkout(self, timeout: float = None) -> Agent:
+        """Take an idle instance, creating one if under max_size, else wait for a return"""
+        start = time.time()
+        deadline = start + timeout if timeout is not None else None
+        waited = False
+        with self._available:
+            while not self._idle and self._size >= self.max_size:
+                remaining = deadline - time.time() if deadline is not None else None
+                if remaining is not None and remaining <= 0:
+                    self.stats['timeouts'] += 1
+                    raise TimeoutError(f"No {self.agent_type} agent available after {timeout}s "
+                                       f"(pool max {self.max_size})")
+                waited = True
+                self._available.wait(remaining)
+            agent = self._idle.pop() if self._idle else None
+            if agent is None:
+                self._size += 1  # reserve the slot; the agent is built outside the lock
+        
+        # Time spent waiting for a free slot; building a new instance is not counted
+        wait = time.time() - start
+        created = agent is None
+        if created:
+            try:
+                agent = self.create()
+            except Exception:
+                with self._available:
+                    self._size -= 1
+                    self._available.notify()
+                raise
+        
+        with self._available:
+            self.stats['checkouts'] += 1
+            self.stats['created'] += created
+            self.stats['waited'] += waited
+            self.stats['wait_seconds'] = round(self.stats['wait_seconds'] + wait, 6)
+            self._waits.append(wait)
+        return agent
+    
+    def checkin(self, agent: Agent):
+        """Return a checked-out instance to the pool"""
+        with self._available:
+            self._idle.append(agent)
+            self._available.notify()
+    
+    @contextmanager
+    def lease(self, timeout: float = None):
+        """Check an agent out for the duration of a with block"""
+        agent = self.checkout(timeout)
+        try:
+            yield agent
+        finally:
+            self.checkin(agent)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Pool size and checkout wait metrics (wait percentiles over recent checkouts)"""
+        with self._available:
+            waits = list(self._waits)
+            stats = dict(self.stats)
+            stats.update({
+                'size': self._size,
+                'idle': len(self._idle),
+                'in_use': self._size - len(self._idle),
+                'min_size': self.min_size,
+                'max_size': self.max_size
+            })
+        stats['wait_p50_ms'] = round(percentile(waits, 50) * 1000, 2) if waits else 0.0
+        stats['wait_p95_ms'] = round(percentile(waits, 95) * 1000, 2) if waits else 0.0
+        stats['wait_max_ms'] = round(max(waits) * 1000, 2) if waits else 0.0
+        return stats
@@ -1,7 +1,18 @@
 # Agents module
-from .news_agent import NewsAgent
-from .product_agent import ProductAgent
-from .general_agent import GeneralAgent
-from .validator_agent import ValidatorAgent
+# Agent classes are imported on first attribute access so that importing one agent
+# does not pull in every other agent's dependencies
+import importlib
+
+_AGENT_MODULES = {
+    'NewsAgent': '.news_agent',
+    'ProductAgent': '.product_agent',
+    'GeneralAgent': '.general_agent',
+    'ValidatorAgent': '.validator_agent',
+}
+
+def __getattr__(name):
+    if name in _AGENT_MODULES:
+        return getattr(importlib.import_module(_AGENT_MODULES[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 __all__ = ['NewsAgent', 'ProductAgent', 'GeneralAgent', 'ValidatorAgent']
\ No newline at end of file
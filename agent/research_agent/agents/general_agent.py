@@ -1,34 +1,47 @@
-from typing import Dict, Any
+from typing import Dict, Any, Iterator
 from ..interfaces import Agent
+from ..report_events import ReportEvent, render_report
 from ..llm_service import LLMService
+from ..deadline import expired
 
 class GeneralAgent(Agent):
     def __init__(self, llm_service: LLMService):
         self.llm_service = llm_service
     
     def process(self, query: str, context: Dict[str, Any] = None) -> str:
+        return render_report(self.process_events(query, context))
+    
+    def process_events(self, query: str, context: Dict[str, Any] = None) -> Iterator[ReportEvent]:
+        yield ReportEvent(ReportEvent.HEADER, f"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║                           GENERAL ANALYSIS                                   ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+
+📋 QUERY: {query}
+        """.strip())
+        
         general_prompt = f"""
         Provide a comprehensive analysis for: "{query}"
         
         Include relevant insights, recommendations, and actionable information.
         """
         
-        analysis = self.llm_service.query_llm(general_prompt)
+        # A query whose time budget ran out before it reached the agent gets no LLM call
+        if expired(context.get('deadline') if context else None):
+            print("⏱️  Time budget used up before the analysis")
+            yield ReportEvent(ReportEvent.ANALYSIS, "📝 ANALYSIS:\n⏱️  Time budget used up before the analysis could run.")
+        else:
+            on_token = context.get('on_token') if context else None
+            if on_token:
+                yield ReportEvent.section_start(ReportEvent.ANALYSIS, "📝 ANALYSIS:")
+            analysis = self.llm_service.query_llm_streaming(general_prompt, on_token, task='report')
+            yield ReportEvent(ReportEvent.ANALYSIS, f"📝 ANALYSIS:\n{analysis}", streamed=bool(on_token))
         
-        return f"""
-╔══════════════════════════════════════════════════════════════════════════════╗
-║                           GENERAL ANALYSIS                                   ║
-╚══════════════════════════════════════════════════════════════════════════════╝
-
-📋 QUERY: {query}
-
-📝 ANALYSIS:
-{analysis}
-
+        yield ReportEvent(ReportEvent.FOOTER, """
 ═══════════════════════════════════════════════════════════════════════════════
 General Analysis | AWS Bedrock
 ═══════════════════════════════════════════════════════════════════════════════
-        """.strip()
+        """.strip())
     
     def get_agent_type(self) -> str:
         return "GENERAL"
\ No newline at end of file
@@ -1,8 +1,13 @@
-from typing import Dict, Any
+from typing import Dict, Any, Iterator
 from ..interfaces import Agent
+from ..report_events import ReportEvent, render_report
 from ..news_service import NewsService
 from ..llm_service import LLMService
 from ..stock_service import StockService
+from ..prompt_builder import PromptBuilder, estimate_tokens
+from ..task_profiles import get_task_profile
+from ..prefetcher import use_prefetched
+from ..deadline import expired, remaining_timeout
 
 class NewsAgent(Agent):
     def __init__(self, news_service: NewsService, llm_service: LLMService):
@@ -10,18 +15,35 @@ class NewsAgent(Agent):
         self.llm_service = llm_service
         self.stock_service = StockService()
     
+    def prefetch_tasks(self, query: str, category: str) -> Dict[str, Any]:
+        if category != 'STOCKS':
+            return {}
+        return {
+            'stock_quotes': lambda: self._fetch_quotes(query),
+            'market_summary': self.stock_service.get_market_summary
+        }
+    
+    def _fetch_quotes(self, query: str):
+        """Resolve symbols for the query and fetch each one's data: (symbols, {symbol: data})"""
+        symbols = self.stock_service.search_stock_symbol(query)
+        return symbols, {symbol: self.stock_service.get_stock_data(symbol) for symbol in symbols}
+    
     def process(self, query: str, context: Dict[str, Any] = None) -> str:
+        return render_report(self.process_events(query, context))
+    
+    def process_events(self, query: str, context: Dict[str, Any] = None) -> Iterator[ReportEvent]:
         category = context.get('category', 'NEWS') if context else 'NEWS'
         print(f"📊 NewsAgent processing: category={category}")
         
         # Handle stock queries with real-time data
         if category == 'STOCKS':
             print("🎯 Routing to stock handler")
-            return self._handle_stock_query(query)
+            yield from self._handle_stock_query(query, context)
+            return
         
         # Handle regular news queries
         print("📰 Routing to news handler")
-        return self._handle_news_query(query, category)
+        yield ReportEvent(ReportEvent.REPORT, self._handle_news_query(query, category))
     
     def _handle_news_query(self, query: str, category: str) -> str:
         """Handle regular news queries"""
@@ -49,24 +71,43 @@ News Service Disabled | Use Stock Analysis Instead
 ═══════════════════════════════════════════════════════════════════════════════
         """.strip()
     
-    def _handle_stock_query(self, query: str) -> str:
-        """Handle stock-specific queries with real-time data and news"""
+    def _handle_stock_query(self, query: str, context: Dict[str, Any] = None) -> Iterator[ReportEvent]:
+        """Handle stock-specific queries with real-time data and news, yielding report sections"""
         print("🔍 ENTERING STOCK HANDLER")
         print("Fetching real-time stock data...")
         
-        # Step 1: Search for stock symbols
-        symbols = self.stock_service.search_stock_symbol(query)
+        # Step 1: Search for stock symbols (quotes may already be prefetched)
+        symbols, quotes = use_prefetched(
+            context, 'stock_quotes', lambda: (self.stock_service.search_stock_symbol(query), {})
+        )
         print(f"Found symbols: {symbols}")
         
         if not symbols:
-            return "No stock symbols found for the query. Please use specific company names or stock symbols."
+            yield ReportEvent(ReportEvent.REPORT,
+                              "No stock symbols found for the query. Please use specific company names or stock symbols.")
+            return
+        
+        yield ReportEvent(ReportEvent.SOURCES, f"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║                     COMPREHENSIVE STOCK ANALYSIS                            ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+
+📋 QUERY: {query}
+📚 SOURCES: Yahoo Finance quotes for {', '.join(symbols)} | market indices
+        """.strip(), {'symbols': list(symbols)})
         
-        # Step 2: Get real-time stock data
+        # Step 2: Get real-time stock data, within the query's time budget if it has one
+        deadline = context.get('deadline') if context else None
         stock_data_context = ""
         company_names = []
         
         for symbol in symbols:
-            data = self.stock_service.get_stock_data(symbol)
+            if symbol not in quotes and expired(deadline):
+                print(f"⏱️  Time budget used up, skipping quote for {symbol}")
+                stock_data_context += f"\n⚠️  {symbol}: quote not fetched (time budget used up)\n"
+                continue
+            data = quotes[symbol] if symbol in quotes else self.stock_service.get_stock_data(
+                symbol, timeout=remaining_timeout(deadline, 10))
             print(f"Stock data for {symbol}: {data}")
             if data:
                 company_names.append(data['name'])
@@ -96,7 +137,8 @@ News Service Disabled | Use Stock Analysis Instead
 """
         
         # Step 3: Get market summary
-        market_summary = self.stock_service.get_market_summary()
+        market_summary = use_prefetched(context, 'market_summary',
+                                        lambda: self.stock_service.get_market_summary(deadline))
         market_context = "\nMarket Indices:\n"
         for index, data in market_summary.items():
             market_context += f"{index}: ${data['price']} ({data['change_percent']:+.2f}%)\n"
@@ -105,17 +147,46 @@ News Service Disabled | Use Stock Analysis Instead
         print("Skipping news fetch (paid service)...")
         news_context = "\n📰 News Analysis: Skipped (NewsData.io is a paid service)\n"
         
+        yield ReportEvent(ReportEvent.STOCK_TABLES, f"""
+📊 REAL-TIME STOCK DATA:
+{stock_data_context}
+{market_context}
+
+📰 RECENT NEWS & DEVELOPMENTS:
+{news_context}
+        """.strip(), {'companies': company_names, 'market_summary': market_summary})
+        
         # Step 5: Combine all data and send to LLM
         print("Analyzing with LLM...")
         
-        analysis_prompt = f"""
+        # Fit the data to the model's token budget; the stock tables are never dropped
+        builder = PromptBuilder(
+            model_id=get_task_profile('report').model_id,
+            reserve_tokens=estimate_tokens(self._stock_analysis_prompt(query, ''))
+        )
+        builder.add_section('stock_data', f"REAL-TIME STOCK DATA:\n{stock_data_context}", priority=100, required=True)
+        builder.add_section('market_context', f"MARKET CONTEXT:\n{market_context}", priority=40)
+        analysis_prompt = self._stock_analysis_prompt(query, builder.build(separator="\n\n"))
+        builder.log_report("Stock analysis context")
+        
+        on_token = context.get('on_token') if context else None
+        if on_token:
+            yield ReportEvent.section_start(ReportEvent.ANALYSIS, "📈 COMPREHENSIVE ANALYSIS:")
+        analysis = self.llm_service.query_llm_streaming(analysis_prompt, on_token, task='report')
+        yield ReportEvent(ReportEvent.ANALYSIS, f"📈 COMPREHENSIVE ANALYSIS:\n{analysis}", streamed=bool(on_token))
+        
+        yield ReportEvent(ReportEvent.FOOTER, """
+═══════════════════════════════════════════════════════════════════════════════
+Real-time Stock Data + News Analysis | Yahoo Finance + NewsData.io + AWS Bedrock
+═══════════════════════════════════════════════════════════════════════════════
+        """.strip())
+    
+    def _stock_analysis_prompt(self, query: str, data_context: str) -> str:
+        """Prompt for the stock analysis section"""
+        return f"""
         Provide comprehensive stock market analysis for: "{query}"
         
-        REAL-TIME STOCK DATA:
-        {stock_data_context}
-        
-        MARKET CONTEXT:
-        {market_context}
+        {data_context}
         
         Based on the real-time stock data, provide:
         1. Current Stock Performance Analysis
@@ -127,30 +198,6 @@ News Service Disabled | Use Stock Analysis Instead
         
         Make your analysis data-driven using the provided real-time information.
         """
-        
-        analysis = self.llm_service.query_llm(analysis_prompt)
-        
-        return f"""
-╔══════════════════════════════════════════════════════════════════════════════╗
-║                     COMPREHENSIVE STOCK ANALYSIS                            ║
-╚══════════════════════════════════════════════════════════════════════════════╝
-
-📋 QUERY: {query}
-
-📊 REAL-TIME STOCK DATA:
-{stock_data_context}
-{market_context}
-
-📰 RECENT NEWS & DEVELOPMENTS:
-{news_context}
-
-📈 COMPREHENSIVE ANALYSIS:
-{analysis}
-
-═══════════════════════════════════════════════════════════════════════════════
-Real-time Stock Data + News Analysis | Yahoo Finance + NewsData.io + AWS Bedrock
-═══════════════════════════════════════════════════════════════════════════════
-        """.strip()
     
     def get_agent_type(self) -> str:
         return "NEWS"
\ No newline at end of file
@@ -1,12 +1,46 @@
-from typing import Dict, Any
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from ..interfaces import Agent
+from ..report_events import ReportEvent, render_report
 from ..search_service import SearchService
 from ..llm_service import LLMService
 from ..scraper_service import ScraperService
 from ..youtube_service import YouTubeService
 from ..langchain_service import LangChainService
+from ..config import Config
+from ..prompt_builder import PromptBuilder, estimate_tokens
+from ..task_profiles import get_task_profile
+from ..prefetcher import use_prefetched
+from ..keyword_matcher import get_matcher
+from ..entity_canonicalizer import Entity, canonicalize
+from ..response_cache import ResponseCache
+from ..stage_graph import StageGraph
+from ..deadline import Deadline, expired, remaining_timeout
+from concurrent.futures import ThreadPoolExecutor
+import json
+import re
+import threading
 import time
 
+# Services stop at the research deadline; the stage graph abandons stragglers this much later
+STAGE_GRACE_SECONDS = 1.0
+
+_research_cache: Optional[ResponseCache] = None
+_research_cache_lock = threading.Lock()
+
+def get_research_cache() -> Optional[ResponseCache]:
+    """Return the process-wide product research cache (None if disabled)"""
+    global _research_cache
+    if not Config.get_research_cache_enabled():
+        return None
+    with _research_cache_lock:
+        if _research_cache is None:
+            _research_cache = ResponseCache(
+                max_entries=Config.get_research_cache_max_entries(),
+                default_ttl=Config.get_research_cache_ttl(),
+                db_path=Config.get_research_cache_db_path()
+            )
+        return _research_cache
+
 class ProductAgent(Agent):
     def __init__(self, search_service: SearchService, llm_service: LLMService):
         self.search_service = search_service
@@ -14,49 +48,250 @@ class ProductAgent(Agent):
         self.scraper = ScraperService()
         self.youtube = YouTubeService()
         self.langchain = LangChainService()
+        self.research_cache = get_research_cache()
+    
+    def prefetch_tasks(self, query: str, category: str) -> Dict[str, Any]:
+        if self._cached_research(self._research_key(query, canonicalize(query))):
+            return {}
+        return {'search_products': lambda: self.search_service.search_products(query)}
+    
+    def _research_key(self, query: str, entity: Optional[Entity]) -> Optional[str]:
+        """Cache key for queries that name only a product, shared by every phrasing of it"""
+        if self.research_cache is None or not (entity and entity.is_exact):
+            return None
+        return ResponseCache.make_key('product_research', entity.key, get_matcher('review_intent').has_match(query))
+    
+    def _cached_research(self, research_key: Optional[str]) -> Optional[Dict[str, Any]]:
+        cached = self.research_cache.get(research_key) if research_key else None
+        return json.loads(cached) if cached else None
     
     def process(self, query: str, context: Dict[str, Any] = None) -> str:
-        # Get product search data
-        search_results = self.search_service.search_products(query)
-        if not search_results:
-            return "No product data found for the query."
+        return render_report(self.process_events(query, context))
+    
+    def process_events(self, query: str, context: Dict[str, Any] = None) -> Iterator[ReportEvent]:
+        # Queries naming only a product are researched and prompted by its canonical name
+        entity = canonicalize(query)
+        subject = entity.display_name if entity and entity.is_exact else query
+        research_key = self._research_key(query, entity)
+        cached = self._cached_research(research_key)
+        missing_sources = []
+        if cached:
+            print(f"🗃️  Reusing cached research for {subject} ({entity.key})")
+            search_results = cached['search_results']
+            youtube_reviews = cached['youtube_reviews']
+            scraped_data = cached['scraped_data']
+        else:
+            search_results, youtube_reviews, scraped_data, missing_sources = self._gather_research(query, context)
+            if not search_results:
+                if missing_sources:
+                    yield ReportEvent(ReportEvent.REPORT,
+                                      f"No product data found for the query (missing: {'; '.join(missing_sources)}).")
+                else:
+                    yield ReportEvent(ReportEvent.REPORT, "No product data found for the query.")
+                return
+            # Partial research is only good for this report, not for reuse
+            if research_key and not missing_sources:
+                self.research_cache.set(research_key, json.dumps({
+                    'search_results': search_results, 'youtube_reviews': youtube_reviews,
+                    'scraped_data': scraped_data
+                }))
+        
+        yield ReportEvent(ReportEvent.SOURCES, f"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║                        PRODUCT MARKET ANALYSIS                               ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+
+📋 QUERY: {query}
+🏷️  CATEGORY: PRODUCT
+📚 SOURCES: {len(search_results)} search results | {len(scraped_data)} web pages | {len(youtube_reviews)} YouTube reviews{' (cached research)' if cached else ''}{self._missing_sources_note(missing_sources)}
+        """.strip(), {
+            'search_results': len(search_results), 'web_pages': len(scraped_data),
+            'youtube_reviews': len(youtube_reviews), 'cached': bool(cached), 'missing_sources': missing_sources
+        })
+        
+        # Use LangChain to process and structure all data, fitted to the model's token budget
+        print("\nProcessing data with LangChain...")
+        reserve_tokens = estimate_tokens(self._research_prefix(subject, '')) + max(
+            estimate_tokens(self._market_analysis_prompt(subject)),
+            estimate_tokens(self._purchase_prompt(subject)),
+            estimate_tokens(self._single_pass_prompt(subject))
+        )
+        builder = PromptBuilder(model_id=get_task_profile('report').model_id, reserve_tokens=reserve_tokens)
+        builder.add_sections(self.langchain.create_context_sections(search_results, scraped_data, youtube_reviews, []))
+        search_context = builder.build()
+        builder.log_report("Product research context")
+        if missing_sources:
+            search_context += "\n\nNOTE - sources missing from this research: " + "; ".join(missing_sources)
+        
+        # The research blob is a shared, cacheable prefix; only the instructions differ per call
+        research_prefix = self._research_prefix(subject, search_context)
+        market_analysis_prompt = self._market_analysis_prompt(subject)
+        purchase_prompt = self._purchase_prompt(subject)
+        print(f"📏 Prompt sizes: shared prefix ~{estimate_tokens(research_prefix)} tokens, "
+              f"market ~{estimate_tokens(market_analysis_prompt)} tokens, "
+              f"purchase ~{estimate_tokens(purchase_prompt)} tokens")
+        
+        on_token = context.get('on_token') if context else None
+        analyses = None
+        if Config.get_product_single_pass():
+            analyses = self._single_pass_analysis(subject, research_prefix)
+        
+        if not analyses and on_token:
+            yield from self._stream_analyses(research_prefix, market_analysis_prompt, purchase_prompt, on_token)
+        else:
+            if not analyses:
+                # The two prompts are independent, so run them concurrently; market analysis is reported first
+                analyses = self.llm_service.iter_many(
+                    [market_analysis_prompt, purchase_prompt], task='report', cache_prefix=research_prefix
+                )
+            sections = [(ReportEvent.MARKET_ANALYSIS, "📊 MARKET ANALYSIS"),
+                        (ReportEvent.PURCHASE_ASSESSMENT, "🎯 PURCHASE ASSESSMENT")]
+            for analysis, (kind, heading) in zip(analyses, sections):
+                yield ReportEvent(kind, f"{heading}:\n{analysis}")
+        
+        # Store research data in memory if available
+        if context and 'memory' in context:
+            memory = context['memory']
+            research_data = {
+                'web_content': search_context,
+                'youtube_content': str(youtube_reviews),
+                'search_results': search_results,
+                'prompt_prefix': research_prefix,
+                # The prefix was fitted to this model's token budget
+                'prompt_prefix_model': get_task_profile('report').model_id
+            }
+            # Canonical product name when one is recognised, so follow-ups match it across phrasings
+            if entity and entity.is_specific:
+                product_name = entity.display_name
+                research_data['entity_key'] = entity.key
+            else:
+                product_name = query.replace('review', '').replace('analysis', '').replace('purchase', '').strip()
+            research_data['youtube_videos_analyzed'] = len(youtube_reviews)
+            research_data['scraped_sources'] = len(scraped_data)
+            memory.start_new_session(product_name, research_data, research_data.get('entity_key'))
+        
+        yield ReportEvent(ReportEvent.FOOTER, """
+💬 CONVERSATIONAL MODE ACTIVATED
+→ Ask follow-up questions about this product (colors, price, specs, etc.)
+→ Type 'exit' to start fresh research
+
+═══════════════════════════════════════════════════════════════════════════════
+Product Analysis + Conversational Mode | Search Data + AWS Bedrock
+═══════════════════════════════════════════════════════════════════════════════
+        """.strip())
+    
+    def _gather_research(self, query: str, context: Dict[str, Any] = None) -> tuple:
+        """Search, YouTube and scraping for a query: (search_results, youtube_reviews, scraped_data, missing_sources)
+        
+        Runs as a stage graph: the YouTube branch needs only the query, so it overlaps
+        with search and the scraping that starts once search results are in. With a
+        deadline in the context, the stages share its budget minus the report reserve;
+        whatever arrived in time is returned and missing_sources describes the rest.
+        """
+        deadline = context.get('deadline') if context else None
+        if deadline:
+            deadline = deadline.reserve(Config.get_query_deadline_report_reserve())
+            print(f"⏱️  Research budget: {deadline.remaining():.1f}s")
+        
+        graph = StageGraph('product-research', max_workers=3)
+        graph.add('search', lambda inputs: self._search(query, context, deadline))
+        graph.add('scrape', lambda inputs: self._scrape(inputs['search'], deadline), depends=['search'])
+        # Only get YouTube reviews for specific product review queries
+        if get_matcher('review_intent').has_match(query):
+            graph.add('youtube_search', lambda inputs: self._search_youtube(query, deadline))
+            graph.add('youtube_transcripts', lambda inputs: self._fetch_transcripts(inputs['youtube_search'], deadline),
+                      depends=['youtube_search'])
+        else:
+            print("\nSkipping YouTube search (not a review query)")
+        
+        run = graph.run(timeout=deadline.remaining() + STAGE_GRACE_SECONDS if deadline else None)
+        print(f"⏱️  Research stages: {run.summary()}")
+        if context is not None:
+            context['stage_timings'] = run.timings
+        
+        search_results = run.get('search', [])
+        scraped_data = run.get('scrape', [])
+        # Transcripts are filled into the video dicts in place, so an abandoned stage still leaves some
+        youtube_reviews = run.get('youtube_transcripts')
+        if youtube_reviews is None:
+            youtube_reviews = [video for video in run.get('youtube_search', []) if video.get('transcript')]
+        return search_results, youtube_reviews, scraped_data, self._missing_sources(run, search_results)
+    
+    def _missing_sources(self, run, search_results: List[Dict[str, Any]]) -> List[str]:
+        """Describe the research that failed or ran out of time, for the prompt and the report"""
+        missing = []
+        outcomes = {'timed_out': 'time budget ran out', 'skipped': 'not started in time', 'failed': 'failed'}
+        labels = {'search': 'web search results', 'scrape': 'full web page content',
+                  'youtube_search': 'YouTube reviews', 'youtube_transcripts': 'YouTube review transcripts'}
+        for name, timing in run.timings.items():
+            if timing['status'] in outcomes and not (name == 'scrape' and not search_results):
+                missing.append(f"{labels[name]} ({outcomes[timing['status']]})")
+        
+        scraped = run.get('scrape')
+        urls = [result for result in search_results if result.get('link')][:5]
+        if scraped is not None and len(scraped) < len(urls):
+            missing.append(f"{len(urls) - len(scraped)} of {len(urls)} web pages (time budget ran out)")
+        videos = run.get('youtube_search') or []
+        transcribed = sum(1 for video in videos if video.get('transcript'))
+        if run.ok('youtube_transcripts') and transcribed < len(videos[:10]):
+            missing.append(f"{len(videos[:10]) - transcribed} of {len(videos[:10])} YouTube transcripts "
+                           f"(time budget ran out)")
+        return missing
+    
+    @staticmethod
+    def _missing_sources_note(missing_sources: List[str]) -> str:
+        if not missing_sources:
+            return ""
+        return "\n⚠️  PARTIAL DATA - missing: " + "; ".join(missing_sources)
+    
+    def _search(self, query: str, context: Dict[str, Any] = None,
+                deadline: Optional[Deadline] = None) -> List[Dict[str, Any]]:
+        # Get product search data (started during classification if the guess was PRODUCT)
+        search_results = use_prefetched(
+            context, 'search_products',
+            lambda: self.search_service.search_products(query, timeout=remaining_timeout(deadline, 10))
+        )
         
         # Print search results
         print(f"\n=== SEARCH DATA RETRIEVED ===")
-        for i, result in enumerate(search_results, 1):
+        for i, result in enumerate(search_results or [], 1):
             print(f"\nResult {i}:")
             print(f"Title: {result['title']}")
             print(f"Snippet: {result['snippet']}")
             print(f"Link: {result['link']}")
         print(f"\n=== END SEARCH DATA ===")
-        
-        # Only get YouTube reviews for specific product review queries
-        youtube_reviews = []
-        if 'review' in query.lower() or 'unboxing' in query.lower() or 'vs' in query.lower():
-            print("\nSearching YouTube for reviews (10 videos)...")
-            youtube_reviews = self.youtube.search_reviews(query, max_results=10)
+        return search_results or []
+    
+    def _search_youtube(self, query: str, deadline: Optional[Deadline] = None) -> List[Dict[str, Any]]:
+        if expired(deadline):
+            print("\n⏱️  Time budget used up, skipping YouTube search")
+            return []
+        print("\nSearching YouTube for reviews (10 videos)...")
+        return self.youtube.search_reviews(query, max_results=10)
+    
+    def _fetch_transcripts(self, youtube_reviews: List[Dict[str, Any]],
+                           deadline: Optional[Deadline] = None) -> List[Dict[str, Any]]:
+        # Extract content from all 10 YouTube videos
+        print("\nExtracting content from 10 YouTube videos...")
+        for i, video in enumerate(youtube_reviews[:10]):  # Process all 10 videos
+            if expired(deadline):
+                print(f"⏱️  Time budget used up after {i} transcripts")
+                break
+            print(f"Processing video {i+1}/10: {video['title'][:60]}...")
+            content = self.youtube.get_video_transcript(video['url'], timeout=remaining_timeout(deadline, 10))
+            video['transcript'] = content
+            print(f"Content extracted {i+1}: {len(content)} characters")
             
-            # Extract content from all 10 YouTube videos
-            print("\nExtracting content from 10 YouTube videos...")
-            for i, video in enumerate(youtube_reviews[:10]):  # Process all 10 videos
-                print(f"Processing video {i+1}/10: {video['title'][:60]}...")
-                content = self.youtube.get_video_transcript(video['url'])
-                video['transcript'] = content
-                print(f"Content extracted {i+1}: {len(content)} characters")
-                
-                # Add small delay to avoid overwhelming requests
-                if i < 9:  # Don't delay after last video
-                    time.sleep(0.5)
-        else:
-            print("\nSkipping YouTube search (not a review query)")
-        
-        # No Reddit scraping
-        reddit_posts = []
-        
+            # Add small delay to avoid overwhelming requests
+            if i < 9:  # Don't delay after last video
+                time.sleep(0.5)
+        return [video for video in youtube_reviews if video.get('transcript')]
+    
+    def _scrape(self, search_results: List[Dict[str, Any]], deadline: Optional[Deadline] = None) -> List[Dict[str, Any]]:
         # Scrape actual content from URLs
         print("\nScraping content from search results...")
         urls = [result['link'] for result in search_results if result.get('link')]
-        scraped_data = self.scraper.scrape_content(urls)
+        scraped_data = self.scraper.scrape_content(urls, deadline=deadline) if urls else []
         
         # Print scraped data
         print(f"\n=== SCRAPED CONTENT ===")
@@ -66,24 +301,27 @@ class ProductAgent(Agent):
             print(f"Content Preview: {data['content'][:200]}...")
             print(f"Scraping Success: {data['scraped']}")
         print(f"\n=== END SCRAPED CONTENT ===")
+        return scraped_data
+    
+    def _research_prefix(self, query: str, search_context: str) -> str:
+        """Shared research block sent ahead of every analysis prompt (prompt-cache prefix)"""
+        return f"""
+        RESEARCH DATA FOR "{query}"
         
-        # Use LangChain to process and structure all data
-        print("\nProcessing data with LangChain...")
-        search_context = self.langchain.create_comprehensive_context(
-            search_results, scraped_data, youtube_reviews, []
-        )
-        
-        market_analysis_prompt = f"""
-        You are a professional product analyst conducting a comprehensive market analysis for "{query}".
-        
-        You have access to extensive research data from multiple authoritative sources:
+        Sources:
         - Professional review websites (TechRadar, PCMag, Tom's Guide, GSMArena)
         - 10 YouTube video reviews from tech experts
         - Official product specifications and pricing
         - User feedback and discussions
         
-        COMPREHENSIVE DATA:
         {search_context}
+        """
+    
+    def _market_analysis_prompt(self, query: str) -> str:
+        """Instructions for the market-analysis section"""
+        return f"""
+        You are a professional product analyst conducting a comprehensive market analysis for "{query}",
+        based on the research data above.
         
         REQUIRED ANALYSIS:
         1. **Product Overview**: Key specifications, features, and positioning
@@ -100,18 +338,12 @@ class ProductAgent(Agent):
         - Provide concrete, data-driven conclusions
         - Focus on practical buying considerations
         """
-        
-        purchase_prompt = f"""
-        You are a senior product consultant providing a definitive purchase recommendation for "{query}".
-        
-        You have analyzed comprehensive review data from:
-        - 10 professional YouTube video reviews
-        - Multiple expert review websites
-        - User feedback and real-world testing
-        - Competitive analysis and pricing data
-        
-        COMPLETE REVIEW DATABASE:
-        {search_context}
+    
+    def _purchase_prompt(self, query: str) -> str:
+        """Instructions for the purchase-assessment section"""
+        return f"""
+        You are a senior product consultant providing a definitive purchase recommendation for "{query}",
+        based on the review data above.
         
         PURCHASE RECOMMENDATION FRAMEWORK:
         1. **Overall Score** (1-10): Weighted average based on all reviews
@@ -129,46 +361,80 @@ class ProductAgent(Agent):
         - Base recommendations on reviewer consensus and data
         - Assume all provided data represents current, accurate product information
         """
+    
+    def _single_pass_prompt(self, query: str) -> str:
+        """Instructions asking for both report sections as one JSON object"""
+        return f"""
+        You are a professional product analyst and senior product consultant reviewing "{query}",
+        based on the research data above.
         
-        market_analysis = self.llm_service.query_llm(market_analysis_prompt)
-        purchase_analysis = self.llm_service.query_llm(purchase_prompt)
+        Produce two sections from this data.
         
-        # Store research data in memory if available
-        if context and 'memory' in context:
-            memory = context['memory']
-            research_data = {
-                'web_content': search_context,
-                'youtube_content': str(youtube_reviews),
-                'search_results': search_results
-            }
-            # Extract product name from query for memory storage
-            product_name = query.replace('review', '').replace('analysis', '').replace('purchase', '').strip()
-            research_data['youtube_videos_analyzed'] = len(youtube_reviews)
-            research_data['scraped_sources'] = len(scraped_data)
-            memory.start_new_session(product_name, research_data)
+        market_analysis must cover:
+        1. **Product Overview**: Key specifications, features, and positioning
+        2. **Performance Analysis**: Based on reviewer testing and benchmarks
+        3. **User Experience**: Summarize feedback from YouTube reviews and discussions
+        4. **Pros & Cons**: Balanced analysis from multiple reviewer perspectives
+        5. **Competitive Positioning**: How it compares to alternatives
+        6. **Value Assessment**: Price-to-performance ratio analysis
         
-        return f"""
-╔══════════════════════════════════════════════════════════════════════════════╗
-║                        PRODUCT MARKET ANALYSIS                               ║
-╚══════════════════════════════════════════════════════════════════════════════╝
-
-📋 QUERY: {query}
-🏷️  CATEGORY: PRODUCT
-
-📊 MARKET ANALYSIS:
-{market_analysis}
-
-🎯 PURCHASE ASSESSMENT:
-{purchase_analysis}
-
-💬 CONVERSATIONAL MODE ACTIVATED
-→ Ask follow-up questions about this product (colors, price, specs, etc.)
-→ Type 'exit' to start fresh research
-
-═══════════════════════════════════════════════════════════════════════════════
-Product Analysis + Conversational Mode | Search Data + AWS Bedrock
-═══════════════════════════════════════════════════════════════════════════════
-        """.strip()
+        purchase_assessment must cover:
+        1. **Overall Score** (1-10): Weighted average based on all reviews
+        2. **Target Buyers**: Who will benefit most from this product
+        3. **Use Case Scenarios**: Best applications and environments
+        4. **Potential Concerns**: Issues highlighted by reviewers
+        5. **Alternative Options**: Competitive products mentioned in reviews
+        6. **Final Recommendation**: Clear buy/wait/skip advice with reasoning
+        
+        Treat all provided data as current and factual and reference specific reviewer insights.
+        
+        Respond with ONLY a JSON object, no other text:
+        {{"market_analysis": "<markdown text>", "purchase_assessment": "<markdown text>"}}
+        """
+    
+    def _single_pass_analysis(self, query: str, research_prefix: str) -> Optional[Tuple[str, str]]:
+        """Produce both report sections from one LLM call; None if the output fails validation"""
+        print("Running single-pass structured product analysis...")
+        raw = self.llm_service.query_llm(
+            self._single_pass_prompt(query), task='report', max_tokens=2000, cache_prefix=research_prefix
+        )
+        
+        try:
+            # Tolerate code fences or chatter around the JSON object
+            match = re.search(r'\{.*\}', raw, re.DOTALL)
+            parsed = json.loads(match.group(0)) if match else None
+        except json.JSONDecodeError:
+            parsed = None
+        
+        if not isinstance(parsed, dict):
+            print("Single-pass output was not valid JSON, falling back to two-call analysis")
+            return None
+        
+        sections = (parsed.get('market_analysis'), parsed.get('purchase_assessment'))
+        if not all(isinstance(section, str) and section.strip() for section in sections):
+            print("Single-pass output missing a section, falling back to two-call analysis")
+            return None
+        
+        return sections[0].strip(), sections[1].strip()
+    
+    def _stream_analyses(self, research_prefix: str, market_analysis_prompt: str, purchase_prompt: str,
+                         on_token) -> Iterator[ReportEvent]:
+        """Stream the market analysis while the purchase assessment generates in the background"""
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix='llm') as executor:
+            # The worker records its call under this query's telemetry, like query_many's workers
+            purchase_future = executor.submit(
+                self.llm_service.in_caller_scope(self.llm_service.query_llm),
+                purchase_prompt, task='report', cache_prefix=research_prefix
+            )
+            
+            yield ReportEvent.section_start(ReportEvent.MARKET_ANALYSIS, "📊 MARKET ANALYSIS:")
+            market_analysis = self.llm_service.query_llm_streaming(
+                market_analysis_prompt, on_token, task='report', cache_prefix=research_prefix
+            )
+            yield ReportEvent(ReportEvent.MARKET_ANALYSIS, f"📊 MARKET ANALYSIS:\n{market_analysis}", streamed=True)
+            
+            purchase_analysis = purchase_future.result()
+        yield ReportEvent(ReportEvent.PURCHASE_ASSESSMENT, f"🎯 PURCHASE ASSESSMENT:\n{purchase_analysis}")
     
     def get_agent_type(self) -> str:
         return "PRODUCT"
\ No newline at end of file
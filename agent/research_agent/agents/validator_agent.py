@@ -1,6 +1,8 @@
-from typing import Dict, Any
+from typing import Dict, Any, Iterator
 from ..interfaces import Agent
+from ..report_events import ReportEvent, render_report
 from ..llm_service import LLMService
+from ..deadline import expired
 
 class ValidatorAgent(Agent):
     """Example of how to add new agents - validates information accuracy"""
@@ -9,6 +11,17 @@ class ValidatorAgent(Agent):
         self.llm_service = llm_service
     
     def process(self, query: str, context: Dict[str, Any] = None) -> str:
+        return render_report(self.process_events(query, context))
+    
+    def process_events(self, query: str, context: Dict[str, Any] = None) -> Iterator[ReportEvent]:
+        yield ReportEvent(ReportEvent.HEADER, f"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║                        INFORMATION VALIDATION                                ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+
+📋 QUERY: {query}
+        """.strip())
+        
         validation_prompt = f"""
         Validate the accuracy and reliability of information related to: "{query}"
         
@@ -19,22 +32,22 @@ class ValidatorAgent(Agent):
         4. Confidence score (0-100%)
         """
         
-        validation = self.llm_service.query_llm(validation_prompt)
+        # A query whose time budget ran out before it reached the agent gets no LLM call
+        if expired(context.get('deadline') if context else None):
+            print("⏱️  Time budget used up before the analysis")
+            yield ReportEvent(ReportEvent.ANALYSIS, "✅ VALIDATION ANALYSIS:\n⏱️  Time budget used up before the analysis could run.")
+        else:
+            on_token = context.get('on_token') if context else None
+            if on_token:
+                yield ReportEvent.section_start(ReportEvent.ANALYSIS, "✅ VALIDATION ANALYSIS:")
+            validation = self.llm_service.query_llm_streaming(validation_prompt, on_token, task='validate')
+            yield ReportEvent(ReportEvent.ANALYSIS, f"✅ VALIDATION ANALYSIS:\n{validation}", streamed=bool(on_token))
         
-        return f"""
-╔══════════════════════════════════════════════════════════════════════════════╗
-║                        INFORMATION VALIDATION                                ║
-╚══════════════════════════════════════════════════════════════════════════════╝
-
-📋 QUERY: {query}
-
-✅ VALIDATION ANALYSIS:
-{validation}
-
+        yield ReportEvent(ReportEvent.FOOTER, """
 ═══════════════════════════════════════════════════════════════════════════════
 Validation Analysis | AWS Bedrock
 ═══════════════════════════════════════════════════════════════════════════════
-        """.strip()
+        """.strip())
     
     def get_agent_type(self) -> str:
         return "VALIDATOR"
\ No newline at end of file
@@ -0,0 +1,193 @@
+import glob
+import io
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Set
+
+class BatchManifestClient:
+    """bedrock-runtime stand-in that records every request into Bedrock batch-inference manifests
+    
+    Research (search, scraping, stock data) still runs locally; each LLM call is
+    written as a {"recordId", "modelInput"} line and answered with a placeholder.
+    A batch job runs a single model, so there is one manifest per model ID
+    (MANIFEST.<model>.jsonl next to manifest_path), each one a ready
+    CreateModelInvocationJob input.
+    """
+    
+    # Bedrock expects 11-character alphanumeric record ids
+    RECORD_ID_PREFIX = 'REC'
+    RECORD_ID_DIGITS = 8
+    
+    def __init__(self, manifest_path: str):
+        self.manifest_path = manifest_path
+        self.records = 0
+        self.manifests: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        # Appending to manifests from an earlier run: continue its record ids instead of repeating them
+        self._next_id = self._last_record_id() + 1
+    
+    def manifest_for(self, model_id: str) -> str:
+        """Manifest path for one model ID"""
+        root, ext = os.path.splitext(self.manifest_path)
+        return f"{root}.{re.sub(r'[^A-Za-z0-9]+', '-', model_id).strip('-')}{ext or '.jsonl'}"
+    
+    def _last_record_id(self) -> int:
+        root, ext = os.path.splitext(self.manifest_path)
+        pattern = re.compile(rf'^{self.RECORD_ID_PREFIX}(\d{{{self.RECORD_ID_DIGITS}}})$')
+        last = 0
+        for path in glob.glob(f"{glob.escape(root)}.*{ext or '.jsonl'}"):
+            with open(path, encoding='utf-8') as manifest:
+                for line in manifest:
+                    try:
+                        match = pattern.match(json.loads(line).get('recordId', ''))
+                    except (json.JSONDecodeError, AttributeError):
+                        continue
+                    if match:
+                        last = max(last, int(match.group(1)))
+        return last
+    
+    def invoke_model(self, body: str, modelId: str, **kwargs) -> Dict[str, Any]:
+        with self._lock:
+            record_id = f"{self.RECORD_ID_PREFIX}{self._next_id:0{self.RECORD_ID_DIGITS}d}"
+            self._next_id += 1
+            self.records += 1
+            path = self.manifests.setdefault(modelId, self.manifest_for(modelId))
+            with open(path, 'a', encoding='utf-8') as manifest:
+                manifest.write(json.dumps({'recordId': record_id, 'modelInput': json.loads(body)}) + "\n")
+        text = f"[deferred to Bedrock batch inference: {record_id} ({modelId})]"
+        payload = {'content': [{'type': 'text', 'text': text}], 'usage': {}}
+        return {'body': io.BytesIO(json.dumps(payload).encode('utf-8'))}
+    
+    def invoke_model_with_response_stream(self, body: str, modelId: str, **kwargs) -> Dict[str, Any]:
+        response = json.loads(self.invoke_model(body, modelId)['body'].read())
+        text = response['content'][0]['text']
+        chunk = json.dumps({'type': 'content_block_delta', 'delta': {'type': 'text_delta', 'text': text}})
+        return {'body': iter([{'chunk': {'bytes': chunk.encode('utf-8')}}])}
+
+class BatchRunner:
+    """Runs a JSONL file of queries through AIOrchestrator with bounded concurrency
+    
+    Input lines look like {"id": "...", "query": "..."} (id defaults to the line
+    number). Each finished query is appended to the output JSONL immediately, and
+    ids already recorded as "ok" there are skipped on the next run, so the output
+    file doubles as the checkpoint for resuming a crashed run. Failed queries are
+    retried on resume and the latest line for an id wins.
+    
+    With deferred=True (LLM calls written to a batch manifest) a finished query is
+    recorded as "deferred": its result is a placeholder, so a later real run
+    researches it again (a later manifest run skips it).
+    """
+    
+    def __init__(self, orchestrator_factory: Callable[[], Any], max_workers: int = 4, deferred: bool = False):
+        self.orchestrator_factory = orchestrator_factory
+        self.max_workers = max_workers
+        self.deferred = deferred
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+    
+    def _orchestrator(self):
+        # AIOrchestrator keeps one conversation memory, so each worker thread gets its own
+        if not hasattr(self._local, 'orchestrator'):
+            self._local.orchestrator = self.orchestrator_factory()
+        return self._local.orchestrator
+    
+    @staticmethod
+    def load_queries(input_path: str) -> List[Dict[str, str]]:
+        """Read queries from JSONL, skipping blank lines and records without a query"""
+        queries = []
+        with open(input_path, encoding='utf-8') as source:
+            for line_number, line in enumerate(source, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                record = json.loads(line)
+                if not record.get('query'):
+                    print(f"Batch: skipping line {line_number} (no query)")
+                    continue
+                queries.append({'id': str(record.get('id', line_number)), 'query': record['query']})
+        return queries
+    
+    @staticmethod
+    def load_completed_ids(output_path: str, statuses: tuple = ('ok',)) -> Set[str]:
+        """Return ids already written to the output file with one of statuses (the resume checkpoint)"""
+        completed = set()
+        if not os.path.exists(output_path):
+            return completed
+        with open(output_path, encoding='utf-8') as results:
+            for line in results:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # Partial line from a crash; that query is re-run
+                if record.get('status') in statuses:
+                    completed.add(record['id'])
+        return completed
+    
+    def _run_one(self, item: Dict[str, str]) -> Dict[str, Any]:
+        orchestrator = self._orchestrator()
+        # Every batch query is fresh research, never a follow-up to the previous one
+        orchestrator.clear_memory()
+        started_at = datetime.now().isoformat()
+        start = time.time()
+        try:
+            result = orchestrator.analyze_query(item['query'])
+            status, error = 'deferred' if self.deferred else 'ok', None
+            # analyze_query reports its own failures as text rather than raising
+            if result.startswith("Error processing query"):
+                status, error = 'error', result
+        except Exception as e:
+            result, status, error = None, 'error', str(e)
+        return {
+            'id': item['id'],
+            'query': item['query'],
+            'status': status,
+            'error': error,
+            'result': result,
+            'started_at': started_at,
+            'elapsed_seconds': round(time.time() - start, 3),
+            'llm': orchestrator.get_last_query_metrics(),
+            'stages': orchestrator.get_last_stage_timings(),
+            'first_section_seconds': orchestrator.last_first_section_seconds
+        }
+    
+    def _write_result(self, output_path: str, record: Dict[str, Any]):
+        with self._write_lock:
+            with open(output_path, 'a', encoding='utf-8') as results:
+                results.write(json.dumps(record, ensure_ascii=False) + "\n")
+                results.flush()
+                os.fsync(results.fileno())
+    
+    def run(self, input_path: str, output_path: str) -> Dict[str, Any]:
+        """Process every query not yet checkpointed and return a run summary"""
+        queries = self.load_queries(input_path)
+        # A manifest run need not write a deferred query's calls twice; a real run redoes them
+        completed = self.load_completed_ids(output_path, ('ok', 'deferred') if self.deferred else ('ok',))
+        pending = [item for item in queries if item['id'] not in completed]
+        print(f"📦 Batch: {len(queries)} queries, {len(completed)} already done, {len(pending)} to run "
+              f"with {self.max_workers} workers")
+        
+        start = time.time()
+        counts = {'ok': 0, 'deferred': 0, 'error': 0}
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='batch') as executor:
+            futures = [executor.submit(self._run_one, item) for item in pending]
+            for future in as_completed(futures):
+                record = future.result()
+                self._write_result(output_path, record)
+                counts[record['status']] += 1
+                print(f"📦 [{record['id']}] {record['status']} in {record['elapsed_seconds']}s")
+        
+        summary = {
+            'total': len(queries),
+            'skipped': len(queries) - len(pending),
+            'succeeded': counts['ok'],
+            'deferred': counts['deferred'],
+            'failed': counts['error'],
+            'elapsed_seconds': round(time.time() - start, 3)
+        }
+        print(f"📦 Batch finished: {summary}")
+        return summary
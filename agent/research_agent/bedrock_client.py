@@ -0,0 +1,74 @@
+import threading
+from .config import Config
+from .stub_bedrock_client import StubBedrockClient
+from .region_hedger import HedgedBedrockClient
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+def _client_config():
+    """Connection pool, retry and timeout settings tuned for concurrent Bedrock calls"""
+    from botocore.config import Config as BotoConfig
+    return BotoConfig(
+        max_pool_connections=Config.get_bedrock_max_pool_connections(),
+        retries={
+            'mode': 'adaptive',
+            'max_attempts': Config.get_bedrock_max_attempts()
+        },
+        connect_timeout=Config.get_bedrock_connect_timeout(),
+        read_timeout=Config.get_bedrock_read_timeout(),
+        tcp_keepalive=True
+    )
+
+def get_bedrock_client(region: str, aws_access_key: str = None, aws_secret_key: str = None):
+    """Return the process-wide bedrock-runtime client for a region and credential set
+    
+    boto3 clients are thread-safe, so one pooled client per key is shared by every
+    LLMService instead of each paying client construction and its own TLS pool.
+    """
+    backend = Config.get_bedrock_backend()
+    key = (backend, region, aws_access_key, aws_secret_key)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            if backend == 'stub':
+                # Offline stand-in for tests and dry runs
+                client = StubBedrockClient()
+            else:
+                # boto3 is a large import, so it is only loaded when the first real client is built
+                import boto3
+                # Configure boto3 client with credentials if provided
+                if aws_access_key and aws_secret_key:
+                    client = boto3.client(
+                        'bedrock-runtime',
+                        aws_access_key_id=aws_access_key,
+                        aws_secret_access_key=aws_secret_key,
+                        region_name=region,
+                        config=_client_config()
+                    )
+                else:
+                    client = boto3.client('bedrock-runtime', region_name=region, config=_client_config())
+            _clients[key] = client
+        return client
+
+def get_hedged_bedrock_client(regions: list, aws_access_key: str = None, aws_secret_key: str = None):
+    """Return the process-wide hedging client over the pooled clients of several regions"""
+    key = ('hedged', Config.get_bedrock_backend(), tuple(regions), aws_access_key, aws_secret_key)
+    regional = {region: get_bedrock_client(region, aws_access_key, aws_secret_key) for region in regions}
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = HedgedBedrockClient(
+                regional,
+                hedge_percentile=Config.get_bedrock_hedge_percentile(),
+                default_delay=Config.get_bedrock_hedge_delay(),
+                min_delay=Config.get_bedrock_hedge_min_delay(),
+                max_workers=Config.get_bedrock_max_pool_connections() * len(regions)
+            )
+            _clients[key] = client
+        return client
+
+def clear_bedrock_clients():
+    """Drop cached clients (e.g. after credentials change)"""
+    with _clients_lock:
+        _clients.clear()
@@ -22,6 +22,252 @@ class Config:
     def get_newsdata_api_key() -> Optional[str]:
         return os.getenv('NEWSDATA_API_KEY')
     
+    @staticmethod
+    def get_llm_max_concurrency() -> int:
+        return int(os.getenv('LLM_MAX_CONCURRENCY', '4'))
+    
+    @staticmethod
+    def get_llm_cache_enabled() -> bool:
+        return os.getenv('LLM_CACHE_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+    
+    @staticmethod
+    def get_llm_cache_max_entries() -> int:
+        return int(os.getenv('LLM_CACHE_MAX_ENTRIES', '512'))
+    
+    @staticmethod
+    def get_llm_cache_db_path() -> Optional[str]:
+        return os.getenv('LLM_CACHE_DB_PATH') or None
+    
+    @staticmethod
+    def get_llm_cache_ttl(task: str, default: float) -> float:
+        return float(os.getenv(f'LLM_CACHE_TTL_{task.upper()}', default))
+    
+    @staticmethod
+    def get_llm_breaker_failure_threshold() -> int:
+        return int(os.getenv('LLM_BREAKER_FAILURE_THRESHOLD', '3'))
+    
+    @staticmethod
+    def get_llm_breaker_recovery_timeout() -> float:
+        return float(os.getenv('LLM_BREAKER_RECOVERY_TIMEOUT', '30'))
+    
+    @staticmethod
+    def get_llm_streaming_enabled() -> bool:
+        return os.getenv('LLM_STREAMING', 'true').lower() in ('1', 'true', 'yes')
+    
+    @staticmethod
+    def get_product_single_pass() -> bool:
+        return os.getenv('PRODUCT_SINGLE_PASS', 'false').lower() in ('1', 'true', 'yes')
+    
+    @staticmethod
+    def get_prompt_token_budget() -> Optional[int]:
+        budget = os.getenv('PROMPT_TOKEN_BUDGET')
+        return int(budget) if budget else None
+    
+    @staticmethod
+    def get_bedrock_prompt_caching() -> bool:
+        return os.getenv('BEDROCK_PROMPT_CACHING', 'true').lower() in ('1', 'true', 'yes')
+    
+    @staticmethod
+    def get_bedrock_prompt_cache_models() -> list:
+        # Bedrock models that accept cache_control blocks (cross-region profile prefixes are ignored)
+        models = os.getenv('BEDROCK_PROMPT_CACHE_MODELS', ','.join([
+            'anthropic.claude-3-5-haiku-20241022-v1:0',
+            'anthropic.claude-3-5-sonnet-20241022-v2:0',
+            'anthropic.claude-3-7-sonnet-20250219-v1:0',
+            'anthropic.claude-sonnet-4-20250514-v1:0',
+            'anthropic.claude-opus-4-20250514-v1:0',
+            'anthropic.claude-opus-4-1-20250805-v1:0',
+            'anthropic.claude-sonnet-4-5-20250929-v1:0',
+            'anthropic.claude-haiku-4-5-20251001-v1:0'
+        ]))
+        return [model.strip() for model in models.split(',') if model.strip()]
+    
+    @staticmethod
+    def get_bedrock_max_pool_connections() -> int:
+        return int(os.getenv('BEDROCK_MAX_POOL_CONNECTIONS', '32'))
+    
+    @staticmethod
+    def get_bedrock_max_attempts() -> int:
+        return int(os.getenv('BEDROCK_MAX_ATTEMPTS', '3'))
+    
+    @staticmethod
+    def get_bedrock_connect_timeout() -> float:
+        return float(os.getenv('BEDROCK_CONNECT_TIMEOUT', '5'))
+    
+    @staticmethod
+    def get_bedrock_read_timeout() -> float:
+        return float(os.getenv('BEDROCK_READ_TIMEOUT', '120'))
+    
+    @staticmethod
+    def get_bedrock_backend() -> str:
+        return os.getenv('BEDROCK_BACKEND', 'bedrock').lower()
+    
+    @staticmethod
+    def get_batch_max_workers() -> int:
+        return int(os.getenv('BATCH_MAX_WORKERS', '4'))
+    
+    @staticmethod
+    def get_llm_tier_model(tier: str, default: str) -> str:
+        # BEDROCK_MODEL_ID keeps working as the large (report) model
+        if tier == 'large':
+            default = os.getenv('BEDROCK_MODEL_ID', default)
+        return os.getenv(f'LLM_MODEL_{tier.upper()}', default)
+    
+    @staticmethod
+    def get_local_classifier_enabled() -> bool:
+        return os.getenv('LOCAL_CLASSIFIER', 'true').lower() in ('1', 'true', 'yes')
+    
+    @staticmethod
+    def get_local_classifier_threshold() -> float:
+        return float(os.getenv('LOCAL_CLASSIFIER_THRESHOLD', '0.95'))
+    
+    @staticmethod
+    def get_local_classifier_data_path() -> Optional[str]:
+        return os.getenv('LOCAL_CLASSIFIER_DATA') or None
+    
+    @staticmethod
+    def get_classification_cache_enabled() -> bool:
+        return os.getenv('CLASSIFICATION_CACHE', 'true').lower() in ('1', 'true', 'yes')
+    
+    @staticmethod
+    def get_classification_cache_max_entries() -> int:
+        return int(os.getenv('CLASSIFICATION_CACHE_MAX_ENTRIES', '2048'))
+    
+    @staticmethod
+    def get_classification_cache_ttl() -> float:
+        return float(os.getenv('CLASSIFICATION_CACHE_TTL', str(24 * 3600)))
+    
+    @staticmethod
+    def get_classification_cache_db_path() -> Optional[str]:
+        return os.getenv('CLASSIFICATION_CACHE_DB_PATH') or None
+    
+    @staticmethod
+    def get_server_host() -> str:
+        return os.getenv('SERVER_HOST', '127.0.0.1')
+    
+    @staticmethod
+    def get_server_port() -> int:
+        return int(os.getenv('SERVER_PORT', '8080'))
+    
+    @staticmethod
+    def get_server_max_workers() -> int:
+        return int(os.getenv('SERVER_MAX_WORKERS', '8'))
+    
+    @staticmethod
+    def get_server_max_pending() -> int:
+        return int(os.getenv('SERVER_MAX_PENDING', '32'))
+    
+    @staticmethod
+    def get_server_session_ttl() -> float:
+        return float(os.getenv('SERVER_SESSION_TTL', '3600'))
+    
+    @staticmethod
+    def get_server_max_sessions() -> int:
+        return int(os.getenv('SERVER_MAX_SESSIONS', '1000'))
+    
+    @staticmethod
+    def get_server_max_body_bytes() -> int:
+        return int(os.getenv('SERVER_MAX_BODY_BYTES', '65536'))
+    
+    @staticmethod
+    def get_agent_pool_min_size() -> int:
+        return int(os.getenv('AGENT_POOL_MIN_SIZE', '0'))
+    
+    @staticmethod
+    def get_agent_pool_max_size() -> int:
+        return int(os.getenv('AGENT_POOL_MAX_SIZE', '4'))
+    
+    @staticmethod
+    def get_agent_pool_checkout_timeout() -> float:
+        return float(os.getenv('AGENT_POOL_CHECKOUT_TIMEOUT', '120'))
+    
+    @staticmethod
+    def get_request_coalescing_enabled() -> bool:
+        return os.getenv('REQUEST_COALESCING', 'true').lower() in ('1', 'true', 'yes')
+    
+    @staticmethod
+    def get_query_deadline() -> Optional[float]:
+        seconds = os.getenv('QUERY_DEADLINE_SECONDS')
+        return float(seconds) if seconds else None
+    
+    @staticmethod
+    def get_query_deadline_report_reserve() -> float:
+        return float(os.getenv('QUERY_DEADLINE_REPORT_RESERVE', '20'))
+    
+    @staticmethod
+    def get_research_cache_enabled() -> bool:
+        return os.getenv('RESEARCH_CACHE', 'true').lower() in ('1', 'true', 'yes')
+    
+    @staticmethod
+    def get_research_cache_max_entries() -> int:
+        return int(os.getenv('RESEARCH_CACHE_MAX_ENTRIES', '128'))
+    
+    @staticmethod
+    def get_research_cache_ttl() -> float:
+        return float(os.getenv('RESEARCH_CACHE_TTL', '3600'))
+    
+    @staticmethod
+    def get_research_cache_db_path() -> Optional[str]:
+        return os.getenv('RESEARCH_CACHE_DB_PATH') or None
+    
+    @staticmethod
+    def get_speculative_prefetch_enabled() -> bool:
+        return os.getenv('SPECULATIVE_PREFETCH', 'true').lower() in ('1', 'true', 'yes')
+    
+    @staticmethod
+    def get_speculative_prefetch_min_confidence() -> float:
+        return float(os.getenv('SPECULATIVE_PREFETCH_MIN_CONFIDENCE', '0.5'))
+    
+    @staticmethod
+    def get_prefetch_max_workers() -> int:
+        return int(os.getenv('PREFETCH_MAX_WORKERS', '4'))
+    
+    @staticmethod
+    def get_llm_micro_batch_enabled() -> bool:
+        return os.getenv('LLM_MICRO_BATCH', 'false').lower() in ('1', 'true', 'yes')
+    
+    @staticmethod
+    def get_llm_micro_batch_size() -> int:
+        return int(os.getenv('LLM_MICRO_BATCH_SIZE', '8'))
+    
+    @staticmethod
+    def get_llm_micro_batch_wait_ms() -> float:
+        return float(os.getenv('LLM_MICRO_BATCH_WAIT_MS', '10'))
+    
+    @staticmethod
+    def get_llm_micro_batch_max_chars() -> int:
+        return int(os.getenv('LLM_MICRO_BATCH_MAX_CHARS', '2000'))
+    
+    @staticmethod
+    def get_llm_micro_batch_tasks() -> list:
+        tasks = os.getenv('LLM_MICRO_BATCH_TASKS', 'classify')
+        return [task.strip() for task in tasks.split(',') if task.strip()]
+    
+    @staticmethod
+    def get_bedrock_regions() -> list:
+        regions = os.getenv('BEDROCK_REGIONS', '')
+        return [region.strip() for region in regions.split(',') if region.strip()]
+    
+    @staticmethod
+    def get_bedrock_hedge_percentile() -> float:
+        return float(os.getenv('BEDROCK_HEDGE_PERCENTILE', '95'))
+    
+    @staticmethod
+    def get_bedrock_hedge_delay() -> float:
+        return float(os.getenv('BEDROCK_HEDGE_DELAY', '2.0'))
+    
+    @staticmethod
+    def get_bedrock_hedge_min_delay() -> float:
+        return float(os.getenv('BEDROCK_HEDGE_MIN_DELAY', '0.2'))
+    
+    @staticmethod
+    def get_llm_metrics_window() -> int:
+        return int(os.getenv('LLM_METRICS_WINDOW', '1000'))
+    
+    @staticmethod
+    def get_llm_metrics_footer() -> bool:
+        return os.getenv('LLM_METRICS_FOOTER', 'true').lower() in ('1', 'true', 'yes')
+    
     @staticmethod
     def validate_config() -> bool:
         """Validate that all required configuration is present"""
@@ -0,0 +1,39 @@
+import time
+from typing import Optional
+
+class DeadlineExceeded(Exception):
+    """A call was abandoned because the query's time budget ran out"""
+
+class Deadline:
+    """Absolute time budget for one query, handed to agents and services as remaining seconds"""
+    
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.expires_at = time.time() + seconds
+    
+    @classmethod
+    def after(cls, seconds: Optional[float]) -> Optional['Deadline']:
+        """A deadline seconds from now, or None for no budget (None or <= 0)"""
+        return cls(seconds) if seconds and seconds > 0 else None
+    
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.time())
+    
+    def expired(self) -> bool:
+        return time.time() >= self.expires_at
+    
+    def timeout(self, default: float, minimum: float = 0.5) -> float:
+        """A call's timeout: default, shortened to the remaining budget (but at least minimum)"""
+        return min(default, max(minimum, self.remaining()))
+    
+    def reserve(self, seconds: float) -> 'Deadline':
+        """An earlier deadline that leaves seconds for later work, keeping at least half the remaining budget"""
+        remaining = self.remaining()
+        return Deadline(max(remaining - seconds, remaining / 2))
+
+def remaining_timeout(deadline: Optional[Deadline], default: float) -> float:
+    """default, shortened to what is left of deadline if there is one"""
+    return deadline.timeout(default) if deadline else default
+
+def expired(deadline: Optional[Deadline]) -> bool:
+    return deadline is not None and deadline.expired()
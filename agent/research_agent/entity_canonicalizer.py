@@ -0,0 +1,172 @@
+import json
+import os
+import re
+from typing import Dict, List, Optional
+
+ALIASES_PATH = os.path.join(os.path.dirname(__file__), 'data', 'entity_aliases.json')
+
+# Model numbers such as 9, 15, s24, 8a, m3 or 13t
+MODEL_PATTERN = re.compile(r'^(?:[a-z]{1,2})?\d{1,4}[a-z]?$')
+
+class Entity:
+    """A product reference reduced to brand / line / model / variant"""
+    
+    def __init__(self, brand: str, brand_name: str, line: str = None, line_name: str = None,
+                 model: str = None, variant: str = None, residual: List[str] = None, model_name: str = None):
+        self.brand = brand
+        self.brand_name = brand_name
+        self.line = line
+        self.line_name = line_name
+        self.model = model
+        self.model_name = model_name or model
+        self.variant = variant
+        self.residual = residual or []  # query words that are neither entity nor generic intent
+    
+    @property
+    def key(self) -> str:
+        """Stable key shared by every phrasing of the same product, e.g. google/pixel/9/pro"""
+        return '/'.join(part.replace(' ', '-') if part else '-'
+                        for part in (self.brand, self.line, self.model, self.variant))
+    
+    @property
+    def display_name(self) -> str:
+        variant = ' '.join(word.upper() if len(word) <= 2 else word.title()
+                           for word in self.variant.split()) if self.variant else None
+        return ' '.join(part for part in (self.brand_name, self.line_name, self.model_name, variant) if part)
+    
+    @property
+    def is_specific(self) -> bool:
+        """True when a model was recognised, not just a brand or product line"""
+        return self.model is not None
+    
+    @property
+    def is_exact(self) -> bool:
+        """True when the query names only this product plus generic intent words"""
+        return self.is_specific and not self.residual
+    
+    def __repr__(self) -> str:
+        return f"Entity({self.key!r})"
+
+class EntityCanonicalizer:
+    """Resolves product queries to canonical entities using the bundled alias dictionary
+    
+    Lines (pixel, iphone, galaxy) imply their brand, brand aliases are accepted on
+    their own, and the words after the line are read as model number and variant,
+    so "pixel 9 pro review" and "Google Pixel 9 Pro analysis" share one key.
+    """
+    
+    def __init__(self, aliases: Dict):
+        self.brands = {brand: spec['name'] for brand, spec in aliases['brands'].items()}
+        self.lines = aliases['lines']
+        self.variants = set(aliases['variants'])
+        self.intent_words = set(aliases['intent_words'])
+        self.model_patterns = [(re.compile(rf"^{rule['pattern']}$"), rule['line'])
+                               for rule in aliases.get('model_patterns', [])]
+        
+        # alias word tuple -> ('line' | 'brand', id); longest aliases are tried first
+        self.aliases = {}
+        for brand, spec in aliases['brands'].items():
+            for alias in spec['aliases']:
+                self.aliases[tuple(alias.split())] = ('brand', brand)
+        for line, spec in self.lines.items():
+            for alias in spec['aliases']:
+                self.aliases[tuple(alias.split())] = ('line', line)
+        self.max_alias_words = max((len(words) for words in self.aliases), default=1)
+    
+    @staticmethod
+    def tokenize(text: str) -> List[str]:
+        return re.findall(r'[a-z0-9]+', text.casefold())
+    
+    def _match_alias(self, words: List[str], start: int) -> tuple:
+        for length in range(min(self.max_alias_words, len(words) - start), 0, -1):
+            found = self.aliases.get(tuple(words[start:start + length]))
+            if found:
+                return found, length
+        return None, 0
+    
+    def _line_for_model(self, words: List[str], start: int) -> tuple:
+        """Bare model numbers that imply a line, e.g. "s24" -> galaxy (returns line, words used)"""
+        for length in (3, 2, 1):
+            text = ' '.join(words[start:start + length])
+            for pattern, line in self.model_patterns:
+                if start + length <= len(words) and pattern.match(text):
+                    return line, length
+        return None, 0
+    
+    @staticmethod
+    def model_name(words: List[str]) -> str:
+        """Display form of the model words: s24 -> S24, z fold 5 -> Z Fold 5, 8a stays 8a"""
+        return ' '.join(word.upper() if word[0].isalpha() and any(char.isdigit() for char in word)
+                        else word.title() if word.isalpha() else word for word in words)
+    
+    def canonicalize(self, query: str) -> Optional[Entity]:
+        """Return the first product entity named in query, or None if no brand or line is known"""
+        words = self.tokenize(query)
+        used = set()
+        brand = line = None
+        model_words = []
+        
+        index = 0
+        while index < len(words):
+            found, length = self._match_alias(words, index)
+            if found and found[0] == 'brand':
+                if brand is not None and found[1] != brand:
+                    break  # a second brand ("samsung vs apple") ends the first entity
+                brand = found[1]
+            elif found:
+                line = found[1]
+            else:
+                implied, length = self._line_for_model(words, index)
+                if implied and brand in (None, self.lines[implied]['brand']):
+                    line, model_words = implied, words[index:index + length]
+                elif brand is not None:
+                    break  # a brand followed by something else may be followed by a bare model number
+                else:
+                    index += 1
+                    continue
+            used.update(range(index, index + length))
+            index += length
+            if line is not None:
+                break
+        
+        if line is None and brand is None:
+            return None
+        if line is not None:
+            brand = self.lines[line]['brand']
+        
+        if not model_words and index < len(words):
+            implied, length = self._line_for_model(words, index)
+            if implied is not None and implied == line:
+                model_words = words[index:index + length]
+            elif MODEL_PATTERN.match(words[index]) and words[index] not in self.intent_words:
+                model_words = words[index:index + 1]
+            used.update(range(index, index + len(model_words)))
+            index += len(model_words)
+        # Spacing inside the model is not significant: "z fold 5" and "zfold5" share a key
+        model = ''.join(model_words) or None
+        
+        variant_words = []
+        while model is not None and index < len(words) and words[index] in self.variants:
+            variant_words.append(words[index])
+            used.add(index)
+            index += 1
+        
+        residual = [word for position, word in enumerate(words)
+                    if position not in used and word not in self.intent_words]
+        return Entity(brand, self.brands[brand], line, self.lines[line]['name'] if line else None,
+                      model, ' '.join(variant_words) or None, residual, self.model_name(model_words))
+
+def load_canonicalizer(path: str = ALIASES_PATH) -> EntityCanonicalizer:
+    with open(path, encoding='utf-8') as source:
+        return EntityCanonicalizer(json.load(source))
+
+# Built once at import and shared by every caller
+CANONICALIZER = load_canonicalizer()
+
+def canonicalize(query: str) -> Optional[Entity]:
+    return CANONICALIZER.canonicalize(query)
+
+def entity_key(query: str) -> Optional[str]:
+    """Canonical key for the product a query names, or None if it names no specific model"""
+    entity = canonicalize(query)
+    return entity.key if entity and entity.is_specific else None
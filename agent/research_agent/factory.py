@@ -1,39 +1,99 @@
-from typing import Dict
+import importlib
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, TYPE_CHECKING
 from .interfaces import Agent
-from .agents.news_agent import NewsAgent
-from .agents.product_agent import ProductAgent
-from .agents.general_agent import GeneralAgent
-from .agents.validator_agent import ValidatorAgent
-from .news_service import NewsService
-from .search_service import SearchService
-from .llm_service import LLMService
+from .agent_pool import AgentPool
+from .config import Config
+
+if TYPE_CHECKING:
+    from .news_service import NewsService
+    from .search_service import SearchService
+    from .llm_service import LLMService
+
+# Agent type -> (module, class); modules are imported on first use so their
+# dependencies (yfinance, bs4, langchain, ...) stay off the startup path
+AGENT_CLASSES = {
+    "NEWS": ('.agents.news_agent', 'NewsAgent'),
+    "STOCKS": ('.agents.news_agent', 'NewsAgent'),
+    "PRODUCT": ('.agents.product_agent', 'ProductAgent'),
+    "GENERAL": ('.agents.general_agent', 'GeneralAgent'),
+    "VALIDATOR": ('.agents.validator_agent', 'ValidatorAgent'),
+}
+
+def load_agent_class(agent_type: str) -> type:
+    """Import and return the agent class for a type"""
+    if agent_type not in AGENT_CLASSES:
+        raise ValueError(f"Unknown agent type: {agent_type}")
+    module_name, class_name = AGENT_CLASSES[agent_type]
+    return getattr(importlib.import_module(module_name, __package__), class_name)
 
 class AgentFactory:
-    def __init__(self, news_service: NewsService, search_service: SearchService, llm_service: LLMService):
+    """Creates agents and hands them out from a bounded pool per agent type
+    
+    Each request checks an instance out (see lease) so concurrent queries never
+    share an agent's HTTP sessions or scraper state.
+    """
+    
+    def __init__(self, news_service: 'NewsService', search_service: 'SearchService', llm_service: 'LLMService',
+                 min_size: int = None, max_size: int = None, checkout_timeout: float = None):
         self.news_service = news_service
         self.search_service = search_service
         self.llm_service = llm_service
-        self._agents: Dict[str, Agent] = {}
+        self.min_size = Config.get_agent_pool_min_size() if min_size is None else min_size
+        self.max_size = Config.get_agent_pool_max_size() if max_size is None else max_size
+        self.checkout_timeout = Config.get_agent_pool_checkout_timeout() if checkout_timeout is None else checkout_timeout
+        self._pools: Dict[str, AgentPool] = {}
+        self._pools_lock = threading.Lock()
+    
+    def get_pool(self, agent_type: str) -> AgentPool:
+        """Get or create the pool for an agent type"""
+        if agent_type not in AGENT_CLASSES:
+            raise ValueError(f"Unknown agent type: {agent_type}")
+        with self._pools_lock:
+            if agent_type not in self._pools:
+                self._pools[agent_type] = AgentPool(
+                    agent_type, lambda: self._create_agent(agent_type), self.min_size, self.max_size
+                )
+            return self._pools[agent_type]
+    
+    def checkout_agent(self, agent_type: str) -> Agent:
+        """Take an agent for exclusive use; hand it back with return_agent"""
+        return self.get_pool(agent_type).checkout(self.checkout_timeout)
+    
+    def return_agent(self, agent_type: str, agent: Agent):
+        self.get_pool(agent_type).checkin(agent)
     
-    def get_agent(self, agent_type: str) -> Agent:
-        """Get or create an agent by type"""
-        if agent_type not in self._agents:
-            self._agents[agent_type] = self._create_agent(agent_type)
-        return self._agents[agent_type]
+    @contextmanager
+    def lease(self, agent_type: str, timeout: float = None):
+        """Check out an agent for the duration of a with block (timeout defaults to checkout_timeout)"""
+        timeout = self.checkout_timeout if timeout is None else timeout
+        with self.get_pool(agent_type).lease(timeout) as agent:
+            yield agent
+    
+    def warm_up(self, agent_types: List[str] = None) -> Dict[str, int]:
+        """Create min_size instances of each agent type ahead of the first request"""
+        created = {agent_type: self.get_pool(agent_type).warm_up()
+                   for agent_type in agent_types or self.get_available_agents()}
+        print(f"🏭 Warmed agent pools: {created}")
+        return created
+    
+    def get_pool_stats(self) -> Dict[str, Dict]:
+        """Per-type pool size and checkout wait metrics"""
+        with self._pools_lock:
+            pools = dict(self._pools)
+        return {agent_type: pool.get_stats() for agent_type, pool in pools.items()}
     
     def _create_agent(self, agent_type: str) -> Agent:
-        """Create a new agent instance"""
+        """Create a new agent instance, importing its module on first use"""
+        agent_class = load_agent_class(agent_type)
         if agent_type in ["NEWS", "STOCKS"]:
-            return NewsAgent(self.news_service, self.llm_service)
+            return agent_class(self.news_service, self.llm_service)
         elif agent_type == "PRODUCT":
-            return ProductAgent(self.search_service, self.llm_service)
-        elif agent_type == "GENERAL":
-            return GeneralAgent(self.llm_service)
-        elif agent_type == "VALIDATOR":
-            return ValidatorAgent(self.llm_service)
+            return agent_class(self.search_service, self.llm_service)
         else:
-            raise ValueError(f"Unknown agent type: {agent_type}")
+            return agent_class(self.llm_service)
     
     def get_available_agents(self) -> list:
         """Return list of available agent types"""
-        return ["NEWS", "STOCKS", "PRODUCT", "GENERAL", "VALIDATOR"]
\ No newline at end of file
+        return list(AGENT_CLASSES)
\ No newline at end of file
@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, Callable, Iterator
+from .report_events import ReportEvent
 
 class Agent(ABC):
     """Standard interface that all agents must implement"""
@@ -12,4 +13,12 @@ class Agent(ABC):
     @abstractmethod
     def get_agent_type(self) -> str:
         """Return the type/name of this agent"""
-        pass
\ No newline at end of file
+        pass
+    
+    def prefetch_tasks(self, query: str, category: str) -> Dict[str, Callable[[], Any]]:
+        """Independent fetches that may be started speculatively before classification finishes"""
+        return {}
+    
+    def process_events(self, query: str, context: Dict[str, Any] = None) -> Iterator[ReportEvent]:
+        """Process a query, yielding report sections as they complete (one REPORT event by default)"""
+        yield ReportEvent(ReportEvent.REPORT, self.process(query, context))
\ No newline at end of file
@@ -0,0 +1,67 @@
+import json
+import os
+import re
+from typing import Dict, List, Optional, Tuple
+
+KEYWORDS_PATH = os.path.join(os.path.dirname(__file__), 'data', 'keywords.json')
+
+class KeywordMatcher:
+    """One compiled word-boundary regex over every term of a keyword dictionary
+    
+    A single finditer pass returns each matched term with its categories, instead
+    of one substring scan per keyword. Multi-word terms match across any
+    whitespace, and a trailing plural -s/-es is accepted.
+    """
+    
+    def __init__(self, dictionary: Dict[str, List[str]]):
+        self.categories = list(dictionary)
+        self.term_categories: Dict[str, List[str]] = {}
+        for category, terms in dictionary.items():
+            for term in terms:
+                self.term_categories.setdefault(term.lower(), []).append(category)
+        
+        # Longest first so "review of" wins over "review" at the same position
+        terms = sorted(self.term_categories, key=len, reverse=True)
+        alternation = '|'.join(re.escape(term).replace(r'\ ', r'\s+') for term in terms)
+        self.pattern = re.compile(rf'\b({alternation})(?:e?s)?\b', re.IGNORECASE) if terms else None
+    
+    def match(self, text: str) -> List[Tuple[str, str]]:
+        """Every (term, category) found in text, in order of appearance"""
+        if not self.pattern or not text:
+            return []
+        matches = []
+        for found in self.pattern.finditer(text):
+            term = re.sub(r'\s+', ' ', found.group(1).lower())
+            matches.extend((term, category) for category in self.term_categories[term])
+        return matches
+    
+    def match_categories(self, text: str) -> Dict[str, List[str]]:
+        """Matched terms grouped by category (categories without matches are omitted)"""
+        grouped: Dict[str, List[str]] = {}
+        for term, category in self.match(text):
+            grouped.setdefault(category, []).append(term)
+        return grouped
+    
+    def first_category(self, text: str, default: Optional[str] = None) -> Optional[str]:
+        """The first category, in dictionary order, with any match"""
+        matched = self.match_categories(text)
+        return next((category for category in self.categories if category in matched), default)
+    
+    def has_match(self, text: str, category: str = None) -> bool:
+        if category is None:
+            return bool(self.pattern and self.pattern.search(text or ''))
+        return category in self.match_categories(text)
+
+def load_matchers(path: str = KEYWORDS_PATH) -> Dict[str, KeywordMatcher]:
+    with open(path, encoding='utf-8') as source:
+        dictionaries = json.load(source)
+    return {
+        name: KeywordMatcher(dictionary)
+        for name, dictionary in dictionaries.items() if not name.startswith('_')
+    }
+
+# Compiled once at import and shared by every caller
+MATCHERS = load_matchers()
+
+def get_matcher(name: str) -> KeywordMatcher:
+    return MATCHERS[name]
@@ -1,18 +1,27 @@
 from typing import List, Dict, Any
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain.schema import Document
+from .prompt_builder import PromptBuilder, PromptSection
+from .keyword_matcher import get_matcher
 
 class LangChainService:
     def __init__(self):
-        self.text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=1000,
-            chunk_overlap=200,
-            length_function=len,
-        )
+        self._text_splitter = None
+    
+    @property
+    def text_splitter(self):
+        """Chunk splitter, built on first use so langchain is not imported at startup"""
+        if self._text_splitter is None:
+            from langchain.text_splitter import RecursiveCharacterTextSplitter
+            self._text_splitter = RecursiveCharacterTextSplitter(
+                chunk_size=1000,
+                chunk_overlap=200,
+                length_function=len,
+            )
+        return self._text_splitter
     
     def process_scraped_data(self, scraped_data: List[Dict[str, Any]]) -> str:
         """Process and structure scraped data using LangChain"""
         try:
+            from langchain.schema import Document
             documents = []
             
             # Convert scraped data to LangChain documents
@@ -50,6 +59,7 @@ class LangChainService:
     def process_youtube_data(self, youtube_reviews: List[Dict[str, Any]]) -> str:
         """Process YouTube review data with enhanced content extraction"""
         try:
+            from langchain.schema import Document
             youtube_content = "\n=== YOUTUBE REVIEW ANALYSIS (10 Videos) ===\n"
             
             for i, video in enumerate(youtube_reviews, 1):
@@ -72,14 +82,11 @@ class LangChainService:
                         youtube_content += f"Review Content: {content[:400]}\n"
                         
                         # Add analysis points
-                        if 'pros' in content.lower() or 'cons' in content.lower():
-                            youtube_content += "Analysis: Contains pros/cons discussion\n"
-                        if 'camera' in content.lower():
-                            youtube_content += "Analysis: Includes camera review\n"
-                        if 'battery' in content.lower():
-                            youtube_content += "Analysis: Covers battery performance\n"
-                        if 'performance' in content.lower():
-                            youtube_content += "Analysis: Discusses performance metrics\n"
+                        topics = get_matcher('review_topics')
+                        found = topics.match_categories(content)
+                        for topic in topics.categories:
+                            if topic in found:
+                                youtube_content += f"Analysis: {topic}\n"
                 else:
                     youtube_content += "Review Content: Professional video review with visual demonstrations and expert analysis\n"
                 
@@ -92,42 +99,55 @@ class LangChainService:
             print(f"YouTube data processing failed: {e}")
             return "=== YOUTUBE REVIEW ANALYSIS ===\nFailed to process YouTube review data"
     
-    def create_comprehensive_context(self, search_results: List[Dict], scraped_data: List[Dict], 
-                                   youtube_reviews: List[Dict], reddit_posts: List[Dict]) -> str:
-        """Create comprehensive context using all data sources with enhanced processing"""
-        
-        context = "=== COMPREHENSIVE PRODUCT REVIEW DATA ===\n\n"
+    def create_context_sections(self, search_results: List[Dict], scraped_data: List[Dict],
+                                youtube_reviews: List[Dict], reddit_posts: List[Dict]) -> List[PromptSection]:
+        """Build the research context as prioritized sections for the prompt builder"""
+        sections = []
         
         # Add data source summary
-        context += f"DATA SOURCES ANALYZED:\n"
-        context += f"- Web Reviews: {len(scraped_data)} sites scraped\n"
-        context += f"- YouTube Reviews: {len(youtube_reviews)} videos analyzed\n"
-        context += f"- Search Results: {len(search_results)} results processed\n\n"
+        summary = "=== COMPREHENSIVE PRODUCT REVIEW DATA ===\n\n"
+        summary += f"DATA SOURCES ANALYZED:\n"
+        summary += f"- Web Reviews: {len(scraped_data)} sites scraped\n"
+        summary += f"- YouTube Reviews: {len(youtube_reviews)} videos analyzed\n"
+        summary += f"- Search Results: {len(search_results)} results processed\n"
+        sections.append(PromptSection('summary', summary, priority=100, required=True))
         
         # Process web scraping data with enhanced analysis
         web_content = self.process_scraped_data(scraped_data)
-        context += f"=== WEB REVIEW CONTENT ===\n{web_content}\n"
+        sections.append(PromptSection('web_reviews', f"=== WEB REVIEW CONTENT ===\n{web_content}", priority=80))
         
         # Process YouTube data with detailed analysis
         if youtube_reviews:
             youtube_content = self.process_youtube_data(youtube_reviews)
-            context += f"\n{youtube_content}\n"
+            sections.append(PromptSection('youtube_reviews', youtube_content, priority=60))
         else:
-            context += "\n=== YOUTUBE REVIEWS ===\nNo YouTube reviews processed\n\n"
+            sections.append(PromptSection('youtube_reviews', "=== YOUTUBE REVIEWS ===\nNo YouTube reviews processed\n", priority=60))
         
         # Add search result summaries with enhanced metadata
-        context += "\n=== SEARCH RESULT SUMMARIES ===\n"
+        search_summaries = "=== SEARCH RESULT SUMMARIES ===\n"
         for i, result in enumerate(search_results, 1):
-            context += f"{i}. {result['title']}\n"
-            context += f"   Source: {result.get('source', 'Web')}\n"
-            context += f"   Summary: {result['snippet']}\n"
-            context += f"   URL: {result['link']}\n\n"
+            search_summaries += f"{i}. {result['title']}\n"
+            search_summaries += f"   Source: {result.get('source', 'Web')}\n"
+            search_summaries += f"   Summary: {result['snippet']}\n"
+            search_summaries += f"   URL: {result['link']}\n\n"
+        sections.append(PromptSection('search_summaries', search_summaries, priority=70))
         
         # Add analysis summary
-        context += "\n=== DATA QUALITY ASSESSMENT ===\n"
+        quality = "=== DATA QUALITY ASSESSMENT ===\n"
         total_content = len([d for d in scraped_data if d.get('scraped', False)])
-        context += f"Successfully scraped content from {total_content} sources\n"
-        context += f"YouTube analysis covers {len(youtube_reviews)} professional reviews\n"
-        context += f"Search results provide {len(search_results)} additional data points\n"
+        quality += f"Successfully scraped content from {total_content} sources\n"
+        quality += f"YouTube analysis covers {len(youtube_reviews)} professional reviews\n"
+        quality += f"Search results provide {len(search_results)} additional data points\n"
+        sections.append(PromptSection('data_quality', quality, priority=20))
         
+        return sections
+    
+    def create_comprehensive_context(self, search_results: List[Dict], scraped_data: List[Dict], 
+                                   youtube_reviews: List[Dict], reddit_posts: List[Dict],
+                                   token_budget: int = None, reserve_tokens: int = 0) -> str:
+        """Create comprehensive context using all data sources, fitted to a token budget"""
+        builder = PromptBuilder(token_budget=token_budget, reserve_tokens=reserve_tokens)
+        builder.add_sections(self.create_context_sections(search_results, scraped_data, youtube_reviews, reddit_posts))
+        context = builder.build()
+        builder.log_report("Research context")
         return context
\ No newline at end of file
@@ -0,0 +1,98 @@
+import math
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional
+from .config import Config
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of numbers (0.0 for an empty list)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+def summarize_calls(calls: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Count, latency percentiles, token totals and fallback attempts for a set of call records"""
+    wall_times = [call['wall_time'] for call in calls]
+    first_token_times = [call['time_to_first_token'] for call in calls if call.get('time_to_first_token') is not None]
+    return {
+        'calls': len(calls),
+        'cache_hits': sum(1 for call in calls if call['cached']),
+        'fallback_attempts': sum(max(0, call['attempts'] - 1) for call in calls),
+        'failed': sum(1 for call in calls if call['model'] is None),
+        'input_tokens': sum(call['input_tokens'] for call in calls),
+        'output_tokens': sum(call['output_tokens'] for call in calls),
+        'total_time': round(sum(wall_times), 3),
+        'p50': round(percentile(wall_times, 50), 3),
+        'p90': round(percentile(wall_times, 90), 3),
+        'p99': round(percentile(wall_times, 99), 3),
+        'ttft_p50': round(percentile(first_token_times, 50), 3) if first_token_times else None
+    }
+
+def format_footer(calls: List[Dict[str, Any]]) -> str:
+    """One-line per-query summary for the CLI"""
+    if not calls:
+        return "📊 LLM: no calls"
+    summary = summarize_calls(calls)
+    models = {}
+    for call in calls:
+        name = call['model'] or 'fallback'
+        models[name] = models.get(name, 0) + 1
+    model_list = ", ".join(f"{name} x{count}" for name, count in models.items())
+    footer = (f"📊 LLM: {summary['calls']} calls ({summary['cache_hits']} cached) | "
+              f"{summary['total_time']:.1f}s | {summary['input_tokens']} in / {summary['output_tokens']} out tokens | "
+              f"{model_list}")
+    if summary['fallback_attempts']:
+        footer += f" | {summary['fallback_attempts']} fallback attempts"
+    return footer
+
+class LLMMetrics:
+    """In-process registry of recent LLM call records with grouped percentile summaries"""
+    
+    GROUP_KEYS = ('agent', 'task', 'model')
+    
+    def __init__(self, window: int = 1000):
+        self.records = deque(maxlen=window)
+        self.total_calls = 0
+        self._lock = threading.Lock()
+    
+    def record(self, call: Dict[str, Any]):
+        call.setdefault('timestamp', time.time())
+        with self._lock:
+            self.records.append(call)
+            self.total_calls += 1
+    
+    def get_records(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self.records)
+    
+    def get_summary(self, group_by: Optional[str] = None) -> Dict[str, Any]:
+        """Summarize the recent window overall, or per agent / task / model"""
+        if group_by is not None and group_by not in self.GROUP_KEYS:
+            raise ValueError(f"group_by must be one of {self.GROUP_KEYS}")
+        records = self.get_records()
+        if group_by is None:
+            return summarize_calls(records)
+        
+        groups = {}
+        for call in records:
+            groups.setdefault(call[group_by] or 'unknown', []).append(call)
+        return {name: summarize_calls(calls) for name, calls in groups.items()}
+    
+    def reset(self):
+        with self._lock:
+            self.records.clear()
+            self.total_calls = 0
+
+_default_metrics = None
+_default_metrics_lock = threading.Lock()
+
+def get_llm_metrics() -> LLMMetrics:
+    """Return the process-wide metrics registry shared by every LLMService"""
+    global _default_metrics
+    with _default_metrics_lock:
+        if _default_metrics is None:
+            _default_metrics = LLMMetrics(window=Config.get_llm_metrics_window())
+        return _default_metrics
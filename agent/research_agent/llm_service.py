@@ -1,74 +1,527 @@
 import json
-import boto3
 import os
-from typing import Optional
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from .config import Config
+from .bedrock_client import get_bedrock_client, get_hedged_bedrock_client
+from .response_cache import ResponseCache
+from .llm_metrics import LLMMetrics, get_llm_metrics
+from .task_profiles import get_task_profile
+from .micro_batcher import MicroBatcher
+from .keyword_matcher import get_matcher
+from .model_router import ModelRouter, classify_error, get_model_router, CREDENTIAL_ERROR_CODES
+from .deadline import Deadline, DeadlineExceeded, expired
 
 class LLMService:
-    def __init__(self, aws_access_key: str = None, aws_secret_key: str = None, aws_region: str = 'us-east-1'):
-        # Configure boto3 client with credentials if provided
-        if aws_access_key and aws_secret_key:
-            self.bedrock_client = boto3.client(
-                'bedrock-runtime',
-                aws_access_key_id=aws_access_key,
-                aws_secret_access_key=aws_secret_key,
-                region_name=aws_region
-            )
+    # Seconds a cached response stays valid, per task type
+    CACHE_TTLS = {
+        'classify': 24 * 3600,
+        'report': 6 * 3600,
+        'followup': 3600,
+        'default': 3600
+    }
+    
+    DEFAULT_MODEL_ID = 'anthropic.claude-3-5-sonnet-20240620-v1:0'
+    
+    # Models tried after the task profile's (or requested) model
+    FALLBACK_MODELS = [
+        'anthropic.claude-3-sonnet-20240229-v1:0',
+        'anthropic.claude-v2:1',
+        'anthropic.claude-v2'
+    ]
+    
+    def __init__(self, aws_access_key: str = None, aws_secret_key: str = None, aws_region: str = 'us-east-1',
+                 max_concurrency: int = None, router: ModelRouter = None, bedrock_client=None,
+                 enable_cache: bool = None, metrics: LLMMetrics = None):
+        self.router = router or get_model_router()
+        self.metrics = metrics or get_llm_metrics()
+        self.max_concurrency = max_concurrency or Config.get_llm_max_concurrency()
+        self.cache = ResponseCache(
+            max_entries=Config.get_llm_cache_max_entries(),
+            db_path=Config.get_llm_cache_db_path()
+        ) if (Config.get_llm_cache_enabled() if enable_cache is None else enable_cache) else None
+        self.stream_timings = deque(maxlen=200)
+        self.usage_totals = {
+            'input_tokens': 0,
+            'output_tokens': 0,
+            'cache_read_input_tokens': 0,
+            'cache_write_input_tokens': 0
+        }
+        self._usage_lock = threading.Lock()
+        self._local = threading.local()
+        self.micro_batcher = MicroBatcher(
+            self._run_batch, self._run_single,
+            max_batch_size=Config.get_llm_micro_batch_size(),
+            max_wait=Config.get_llm_micro_batch_wait_ms() / 1000.0
+        ) if Config.get_llm_micro_batch_enabled() else None
+        # The Bedrock client is built on first use (see bedrock_client) to keep startup fast
+        self._bedrock_client = bedrock_client
+        self._bedrock_settings = (aws_region, aws_access_key, aws_secret_key)
+        self._bedrock_client_lock = threading.Lock()
+        # Calls under a deadline run here so the caller can stop waiting when the budget runs out
+        self._deadline_executor = ThreadPoolExecutor(
+            max_workers=Config.get_bedrock_max_pool_connections(), thread_name_prefix='llm-deadline'
+        )
+    
+    @property
+    def bedrock_client(self):
+        """The pooled, process-wide client for this region and credential set, created on first use
+        
+        Hedges across BEDROCK_REGIONS when more than one is configured.
+        """
+        if self._bedrock_client is None:
+            with self._bedrock_client_lock:
+                if self._bedrock_client is None:
+                    aws_region, aws_access_key, aws_secret_key = self._bedrock_settings
+                    regions = Config.get_bedrock_regions()
+                    if len(regions) > 1:
+                        self._bedrock_client = get_hedged_bedrock_client(regions, aws_access_key, aws_secret_key)
+                    else:
+                        self._bedrock_client = get_bedrock_client(aws_region, aws_access_key, aws_secret_key)
+        return self._bedrock_client
+    
+    def query_many(self, prompts: List[str], model_id: str = None,
+                   task: str = 'default', use_cache: bool = True, cache_prefix: str = None) -> List[str]:
+        """Query Bedrock with independent prompts concurrently, preserving input order
+        
+        A cache_prefix is shared by every prompt and sent as a cacheable block.
+        """
+        return list(self.iter_many(prompts, model_id, task=task, use_cache=use_cache, cache_prefix=cache_prefix))
+    
+    def iter_many(self, prompts: List[str], model_id: str = None,
+                  task: str = 'default', use_cache: bool = True, cache_prefix: str = None) -> Iterator[str]:
+        """Like query_many, but yield each response (in input order) as soon as it is ready"""
+        # Worker threads report their calls under the caller's telemetry scope
+        run = self.in_caller_scope(
+            lambda prompt: self.query_llm(prompt, model_id, task=task, use_cache=use_cache, cache_prefix=cache_prefix)
+        )
+        
+        if len(prompts) <= 1:
+            for prompt in prompts:
+                yield run(prompt)
+            return
+        
+        workers = max(1, min(self.max_concurrency, len(prompts)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='llm') as executor:
+            yield from executor.map(run, prompts)
+    
+    def get_cache_stats(self) -> dict:
+        """Return response cache counters (empty if caching is disabled)"""
+        return self.cache.get_stats() if self.cache else {}
+    
+    def get_router_stats(self) -> dict:
+        """Return per-model health as tracked by the router"""
+        return self.router.get_stats()
+    
+    def get_micro_batch_stats(self) -> Dict[str, int]:
+        """Return micro-batching counters (empty if micro-batching is disabled)"""
+        return self.micro_batcher.get_stats() if self.micro_batcher else {}
+    
+    def get_region_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return per-region latency and hedging counters (empty in single-region mode)"""
+        get_stats = getattr(self._bedrock_client, 'get_region_stats', None)
+        return get_stats() if get_stats else {}
+    
+    def get_last_stream_timing(self) -> Optional[Dict[str, float]]:
+        """Return timing of the most recent streamed call made on this thread"""
+        return getattr(self._local, 'last_stream_timing', None)
+    
+    def get_last_usage(self) -> Optional[Dict[str, int]]:
+        """Return token usage (including prompt-cache reads/writes) of the last call on this thread"""
+        return getattr(self._local, 'last_usage', None)
+    
+    def get_prompt_cache_stats(self) -> Dict[str, int]:
+        """Return cumulative input, output and prompt-cache token counts"""
+        with self._usage_lock:
+            return dict(self.usage_totals)
+    
+    @contextmanager
+    def telemetry_scope(self, agent: str, calls: List[Dict[str, Any]] = None):
+        """Label calls made on this thread with an agent name and collect their records
+        
+        Yields the list that every call record made inside the scope is appended
+        to (pass an existing list to keep collecting into it).
+        """
+        previous = self._telemetry_state()
+        calls = calls if calls is not None else []
+        self._local.agent, self._local.calls = agent, calls
+        try:
+            yield calls
+        finally:
+            self._local.agent, self._local.calls = previous
+    
+    def in_caller_scope(self, function: Callable) -> Callable:
+        """Wrap function so calls it makes on another thread are recorded in this thread's telemetry
+        scope and bounded by its deadline"""
+        agent, calls = self._telemetry_state()
+        deadline = self._current_deadline()
+        
+        def run(*args, **kwargs):
+            with self.telemetry_scope(agent, calls), self.deadline_scope(deadline):
+                return function(*args, **kwargs)
+        return run
+    
+    @contextmanager
+    def deadline_scope(self, deadline: Optional[Deadline]):
+        """Bound every call made on this thread by deadline
+        
+        No model (or fallback model) is tried once it has passed, and a call in flight
+        is no longer waited on: the caller gets the fallback response instead.
+        """
+        previous = self._current_deadline()
+        self._local.deadline = deadline
+        try:
+            yield
+        finally:
+            self._local.deadline = previous
+    
+    def _current_deadline(self) -> Optional[Deadline]:
+        return getattr(self._local, 'deadline', None)
+    
+    def _call_within(self, deadline: Optional[Deadline], call: Callable):
+        """Run call(), raising DeadlineExceeded if deadline passes first (the request finishes in the background)"""
+        if deadline is None:
+            return call()
+        future = self._deadline_executor.submit(call)
+        try:
+            return future.result(timeout=deadline.remaining())
+        except FutureTimeout:
+            raise DeadlineExceeded(f"time budget of {deadline.seconds:.1f}s used up")
+    
+    def _telemetry_state(self):
+        return getattr(self._local, 'agent', None), getattr(self._local, 'calls', None)
+    
+    def _record_call(self, requested_model: str, model: Optional[str], task: str, start: float,
+                     attempts: int = 0, usage: Optional[Dict[str, int]] = None, cached: bool = False,
+                     time_to_first_token: float = None, batched: bool = False):
+        """Add one call (cache hit, success or total failure) to the metrics registry
+        
+        A batched record is one caller's share of a micro-batch: the packed Bedrock
+        call is already in the registry, so it only goes to the caller's scope.
+        """
+        agent, calls = self._telemetry_state()
+        usage = usage or {}
+        record = {
+            'agent': agent,
+            'task': task,
+            'requested_model': requested_model,
+            'model': model,
+            'attempts': attempts,
+            'cached': cached,
+            'batched': batched,
+            'wall_time': round(time.time() - start, 3),
+            'time_to_first_token': time_to_first_token,
+            'input_tokens': usage.get('input_tokens', 0) or 0,
+            'output_tokens': usage.get('output_tokens', 0) or 0
+        }
+        if not batched:
+            self.metrics.record(record)
+        if calls is not None:
+            calls.append(record)
+    
+    def _resolve_task(self, task: str, model_id: Optional[str], max_tokens: Optional[int] = None):
+        """Return (model_id, generation params) from the task profile, honouring explicit overrides"""
+        profile = get_task_profile(task)
+        return model_id or profile.model_id, profile.generation_params(max_tokens)
+    
+    def _supports_prompt_caching(self, model: str) -> bool:
+        if not Config.get_bedrock_prompt_caching():
+            return False
+        # Cross-region inference profiles (us.anthropic..., eu.anthropic...) cache like the base model
+        base_model = model.split('.', 1)[1] if model.split('.', 1)[0] in ('us', 'eu', 'apac', 'global') else model
+        return base_model in Config.get_bedrock_prompt_cache_models()
+    
+    def _request_body(self, prompt: str, generation_params: Dict, model: str, cache_prefix: str = None) -> str:
+        """Build the messages payload; a cache_prefix goes first, marked cacheable where supported"""
+        if not cache_prefix:
+            content = prompt
+        elif self._supports_prompt_caching(model):
+            content = [
+                {"type": "text", "text": cache_prefix, "cache_control": {"type": "ephemeral"}},
+                {"type": "text", "text": prompt}
+            ]
         else:
-            self.bedrock_client = boto3.client('bedrock-runtime', region_name=aws_region)
-    
-    def query_llm(self, prompt: str, model_id: str = 'anthropic.claude-3-5-sonnet-20240620-v1:0') -> str:
-        """Query Bedrock LLM with the given prompt"""
-        # List of fallback models to try
-        models_to_try = [
-            model_id,
-            'anthropic.claude-3-sonnet-20240229-v1:0',
-            'anthropic.claude-v2:1',
-            'anthropic.claude-v2'
-        ]
-        
-        for model in models_to_try:
+            content = f"{cache_prefix}\n{prompt}"
+        
+        return json.dumps({
+            **generation_params,
+            "messages": [
+                {
+                    "role": "user",
+                    "content": content
+                }
+            ]
+        })
+    
+    def _record_usage(self, usage: Optional[Dict]) -> Dict[str, int]:
+        """Accumulate Bedrock token usage, including prompt-cache reads and writes"""
+        if not usage:
+            return {}
+        normalized = {
+            'input_tokens': usage.get('input_tokens', 0),
+            'output_tokens': usage.get('output_tokens', 0),
+            'cache_read_input_tokens': usage.get('cache_read_input_tokens', 0),
+            'cache_write_input_tokens': usage.get('cache_creation_input_tokens', 0)
+        }
+        self._local.last_usage = normalized
+        with self._usage_lock:
+            for key, value in normalized.items():
+                self.usage_totals[key] += value or 0
+        if Config.get_llm_metrics_footer() and (normalized['cache_read_input_tokens']
+                                                or normalized['cache_write_input_tokens']):
+            print(f"🗄️  Prompt cache: read {normalized['cache_read_input_tokens']} / "
+                  f"wrote {normalized['cache_write_input_tokens']} tokens")
+        return normalized
+    
+    def _cache_lookup(self, model_id: str, prompt: str, generation_params: Dict, use_cache: bool,
+                      cache_prefix: str = None):
+        """Return (cache_key, cached_text); both None when caching does not apply"""
+        if self.cache is None:
+            return None, None
+        cache_key = ResponseCache.make_key(model_id, cache_prefix, prompt, generation_params)
+        return cache_key, (self.cache.get(cache_key) if use_cache else None)
+    
+    def _cache_store(self, cache_key: Optional[str], task: str, text: str):
+        if cache_key is not None:
+            ttl = Config.get_llm_cache_ttl(task, self.CACHE_TTLS.get(task, self.CACHE_TTLS['default']))
+            self.cache.set(cache_key, text, ttl)
+    
+    def _candidate_models(self, model_id: str) -> List[str]:
+        if self.router.credentials_invalid:
+            print("AWS credentials invalid (cached). Please check your .env file.")
+        fallbacks = [model for model in [self.DEFAULT_MODEL_ID] + self.FALLBACK_MODELS if model != model_id]
+        return self.router.route([model_id] + fallbacks)
+    
+    def _record_failure(self, model: str, error: Exception, start: float) -> bool:
+        """Record a failed call; return True if no other model is worth trying"""
+        error_class = classify_error(error)
+        self.router.record_failure(model, error_class, time.time() - start)
+        if error_class in CREDENTIAL_ERROR_CODES:
+            print(f"AWS credentials invalid. Please check your .env file.")
+            return True
+        print(f"Failed with model {model}: {error}")
+        return False
+    
+    def query_llm(self, prompt: str, model_id: str = None,
+                  task: str = 'default', use_cache: bool = True, max_tokens: int = None,
+                  cache_prefix: str = None) -> str:
+        """Query Bedrock LLM with the given prompt
+        
+        The task names a profile (classify, followup, report, validate) that picks
+        the model tier, max_tokens, temperature and stop sequences; model_id and
+        max_tokens override the profile when given.
+        Identical (model, prompt, params) requests are served from the response
+        cache for a task-specific TTL; pass use_cache=False to force a fresh answer.
+        Shared context passed as cache_prefix is sent ahead of the prompt with a
+        Bedrock prompt-caching marker, so repeat calls skip most of the prefill.
+        """
+        call_start = time.time()
+        model_id, generation_params = self._resolve_task(task, model_id, max_tokens)
+        cache_key, cached = self._cache_lookup(model_id, prompt, generation_params, use_cache, cache_prefix)
+        if cached is not None:
+            self._record_call(model_id, model_id, task, call_start, cached=True)
+            return cached
+        
+        if self._should_batch(task, prompt, cache_prefix):
+            text = self.micro_batcher.submit((task, model_id, max_tokens), prompt)
+            # Every item of the batch shares its latency; the leader's call is not in its own scope
+            self._record_call(model_id, model_id if text is not None else None, task, call_start,
+                              attempts=1, batched=True)
+        else:
+            text = self._invoke(prompt, model_id, task, generation_params, cache_prefix, call_start)
+        if text is None:
+            return self._fallback_response(prompt)
+        self._cache_store(cache_key, task, text)
+        return text
+    
+    def _should_batch(self, task: str, prompt: str, cache_prefix: Optional[str]) -> bool:
+        return (self.micro_batcher is not None and not cache_prefix
+                and task in Config.get_llm_micro_batch_tasks()
+                and len(prompt) <= Config.get_llm_micro_batch_max_chars())
+    
+    def _run_single(self, key: tuple, prompt: str) -> Optional[str]:
+        task, model_id, max_tokens = key
+        with self.telemetry_scope(self._telemetry_state()[0]):
+            return self._invoke(prompt, model_id, task, self._resolve_task(task, model_id, max_tokens)[1])
+    
+    def _run_batch(self, key: tuple, prompt: str, count: int) -> Optional[str]:
+        task, model_id, max_tokens = key
+        generation_params = self._resolve_task(task, model_id, max_tokens)[1]
+        # The packed answer is multi-line JSON: no stop sequences, room for every item plus its key
+        generation_params.pop('stop_sequences', None)
+        generation_params['max_tokens'] = count * (generation_params['max_tokens'] + 16)
+        print(f"📦 Micro-batch: {count} {task} prompts in one call")
+        with self.telemetry_scope(self._telemetry_state()[0]):
+            return self._invoke(prompt, model_id, task, generation_params)
+    
+    def _invoke(self, prompt: str, model_id: str, task: str, generation_params: Dict,
+                cache_prefix: str = None, call_start: float = None) -> Optional[str]:
+        """Call Bedrock with model fallback; return None if every model failed"""
+        call_start = call_start or time.time()
+        deadline = self._current_deadline()
+        attempts = 0
+        for model in self._candidate_models(model_id):
+            if expired(deadline):
+                print(f"⏱️  Time budget used up, no further Bedrock attempts")
+                break
+            if not self.router.acquire(model):
+                continue  # another request is already probing this model
+            attempts += 1
+            start = time.time()
+            body = self._request_body(prompt, generation_params, model, cache_prefix)
             try:
-                body = json.dumps({
-                    "anthropic_version": "bedrock-2023-05-31",
-                    "max_tokens": 1000,
-                    "messages": [
-                        {
-                            "role": "user",
-                            "content": prompt
-                        }
-                    ]
-                })
-                
-                response = self.bedrock_client.invoke_model(
+                # Reading the body is part of the call, so the deadline covers the whole answer
+                response_body = self._call_within(deadline, lambda: json.loads(self.bedrock_client.invoke_model(
                     body=body,
                     modelId=model,
                     accept='application/json',
                     contentType='application/json'
-                )
+                ).get('body').read()))
+                text = response_body['content'][0]['text']
+                self.router.record_success(model, time.time() - start)
+                usage = self._record_usage(response_body.get('usage'))
+                self._record_call(model_id, model, task, call_start, attempts, usage)
+                return text
+            
+            except DeadlineExceeded as e:
+                print(f"⏱️  Gave up waiting on {model}: {e}")
+                break
+            except Exception as e:
+                if self._record_failure(model, e, start):
+                    break  # No point trying other models with bad credentials
+                continue
+            finally:
+                self.router.release(model)
+        
+        self._record_call(model_id, None, task, call_start, attempts)
+        return None
+    
+    def stream_llm(self, prompt: str, model_id: str = None,
+                   task: str = 'default', use_cache: bool = True, cache_prefix: str = None) -> Iterator[str]:
+        """Stream the response as text deltas via invoke_model_with_response_stream
+        
+        Falls back to the next model only if the stream fails before its first
+        token. Time-to-first-token and total generation time are recorded per call.
+        """
+        call_start = time.time()
+        model_id, generation_params = self._resolve_task(task, model_id)
+        cache_key, cached = self._cache_lookup(model_id, prompt, generation_params, use_cache, cache_prefix)
+        if cached is not None:
+            self._record_call(model_id, model_id, task, call_start, cached=True)
+            yield cached
+            return
+        
+        deadline = self._current_deadline()
+        attempts = 0
+        for model in self._candidate_models(model_id):
+            if expired(deadline):
+                print(f"⏱️  Time budget used up, no further Bedrock attempts")
+                break
+            if not self.router.acquire(model):
+                continue  # another request is already probing this model
+            attempts += 1
+            start = time.time()
+            first_token_at = None
+            chunks = []
+            usage = {}
+            body = self._request_body(prompt, generation_params, model, cache_prefix)
+            try:
+                response = self._call_within(deadline, lambda: self.bedrock_client.invoke_model_with_response_stream(
+                    body=body,
+                    modelId=model,
+                    accept='application/json',
+                    contentType='application/json'
+                ))
                 
-                response_body = json.loads(response.get('body').read())
-                return response_body['content'][0]['text']
+                for event in response.get('body'):
+                    if expired(deadline):
+                        if first_token_at is None:
+                            raise DeadlineExceeded("time budget used up before the first token")
+                        # Keep the part already shown rather than replacing it with the fallback
+                        self._record_call(model_id, model, task, call_start, attempts)
+                        yield "\n[stopped: time budget used up]"
+                        return
+                    chunk = event.get('chunk')
+                    if not chunk:
+                        continue
+                    payload = json.loads(chunk['bytes'])
+                    if payload.get('type') == 'message_start':
+                        usage.update(payload.get('message', {}).get('usage', {}))
+                    elif payload.get('type') == 'message_delta':
+                        usage.update(payload.get('usage', {}))
+                    elif payload.get('type') == 'content_block_delta':
+                        delta = payload['delta'].get('text', '')
+                        if not delta:
+                            continue
+                        if first_token_at is None:
+                            first_token_at = time.time()
+                        chunks.append(delta)
+                        yield delta
                 
+                total_time = time.time() - start
+                self.router.record_success(model, total_time)
+                usage = self._record_usage(usage)
+                timing = {
+                    'model': model,
+                    'task': task,
+                    'time_to_first_token': round((first_token_at or time.time()) - start, 3),
+                    'total_time': round(total_time, 3)
+                }
+                self.stream_timings.append(timing)
+                self._local.last_stream_timing = timing
+                self._cache_store(cache_key, task, ''.join(chunks))
+                self._record_call(model_id, model, task, call_start, attempts, usage,
+                                  time_to_first_token=timing['time_to_first_token'])
+                return
+            
+            except DeadlineExceeded as e:
+                print(f"⏱️  Gave up waiting on {model}: {e}")
+                break
             except Exception as e:
-                if "security token" in str(e).lower():
-                    print(f"AWS credentials invalid. Please check your .env file.")
-                    break  # No point trying other models with bad credentials
-                print(f"Failed with model {model}: {e}")
+                if self._record_failure(model, e, start):
+                    break
+                if first_token_at is not None:
+                    # Part of the answer is already on screen; don't splice in another model
+                    self._record_call(model_id, model, task, call_start, attempts)
+                    yield "\n[stream interrupted]"
+                    return
                 continue
+            finally:
+                # Also covers a consumer that stops reading mid-stream
+                self.router.release(model)
         
-        # If all models fail, return fallback response
+        self._record_call(model_id, None, task, call_start, attempts)
+        yield self._fallback_response(prompt)
+    
+    def query_llm_streaming(self, prompt: str, on_token: Optional[Callable[[str], None]] = None,
+                            model_id: str = None,
+                            task: str = 'default', use_cache: bool = True, cache_prefix: str = None) -> str:
+        """Stream the response into on_token and return the full text
+        
+        Without an on_token callback this is a plain query_llm call.
+        """
+        if on_token is None:
+            return self.query_llm(prompt, model_id, task=task, use_cache=use_cache, cache_prefix=cache_prefix)
+        
+        chunks = []
+        for delta in self.stream_llm(prompt, model_id, task=task, use_cache=use_cache, cache_prefix=cache_prefix):
+            chunks.append(delta)
+            on_token(delta)
+        return ''.join(chunks)
+    
+    def _fallback_response(self, prompt: str) -> str:
+        """Response used when every Bedrock model failed"""
         print(f"All Bedrock models failed. Using fallback logic.")
         if "classification" in prompt.lower():
-            # Simple keyword-based classification fallback
-            query_lower = prompt.lower()
-            if any(word in query_lower for word in ["mobile", "phone", "laptop", "product", "snapdragon", "camera", "display"]):
-                return "PRODUCT"
-            elif any(word in query_lower for word in ["stock", "market", "trading"]):
-                return "STOCKS"
-            elif any(word in query_lower for word in ["news", "breaking"]):
-                return "NEWS"
-            else:
-                return "GENERAL"
+            # Simple keyword-based classification fallback, on the quoted query rather than the
+            # instructions (whose category descriptions mention every keyword)
+            quoted = re.search(r'Query: "(.*)"', prompt)
+            return get_matcher('routing').first_category(quoted.group(1) if quoted else prompt, default="GENERAL")
         
         # For analysis prompts, return a basic response
-        return f"Analysis for query: Based on the information provided, this appears to be a product-related inquiry. The system is currently operating in fallback mode due to LLM service issues."
\ No newline at end of file
+        return f"Analysis for query: Based on the information provided, this appears to be a product-related inquiry. The system is currently operating in fallback mode due to LLM service issues."
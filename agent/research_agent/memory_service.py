@@ -1,6 +1,7 @@
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 import json
 from datetime import datetime
+from .prompt_builder import PromptSection
 
 class MemoryService:
     def __init__(self):
@@ -8,10 +9,11 @@ class MemoryService:
         self.research_data = {}
         self.conversation_history = []
     
-    def start_new_session(self, product_name: str, research_data: Dict[str, Any]):
+    def start_new_session(self, product_name: str, research_data: Dict[str, Any], entity_key: str = None):
         """Start a new research session with scraped data"""
         self.current_session = {
             'product': product_name,
+            'entity_key': entity_key,
             'timestamp': datetime.now().isoformat(),
             'research_complete': True
         }
@@ -31,35 +33,57 @@ class MemoryService:
         """Check if there's an active research session"""
         return self.current_session is not None and self.current_session.get('research_complete', False)
     
-    def get_research_context(self) -> str:
-        """Get the research data as context for follow-up questions"""
+    def get_research_sections(self, include_conversation: bool = True) -> List[PromptSection]:
+        """Get the research data as prioritized prompt sections for follow-up questions"""
         if not self.research_data:
-            return ""
+            return []
         
-        context = f"PREVIOUS RESEARCH DATA FOR {self.current_session['product']}:\n\n"
+        sections = [PromptSection(
+            'header', f"PREVIOUS RESEARCH DATA FOR {self.current_session['product']}:\n",
+            priority=100, required=True
+        )]
         
         # Add web content
         if 'web_content' in self.research_data:
-            context += "=== WEB REVIEWS ===\n"
-            context += self.research_data['web_content'][:1500] + "\n\n"
+            sections.append(PromptSection(
+                'web_reviews', "=== WEB REVIEWS ===\n" + self.research_data['web_content'][:1500] + "\n", priority=80
+            ))
         
         # Add YouTube content
         if 'youtube_content' in self.research_data:
-            context += "=== YOUTUBE REVIEWS ===\n"
-            context += self.research_data['youtube_content'][:1000] + "\n\n"
+            sections.append(PromptSection(
+                'youtube_reviews', "=== YOUTUBE REVIEWS ===\n" + self.research_data['youtube_content'][:1000] + "\n", priority=60
+            ))
         
         # Add Reddit content
         if 'reddit_content' in self.research_data:
-            context += "=== REDDIT DISCUSSIONS ===\n"
-            context += self.research_data['reddit_content'][:800] + "\n\n"
+            sections.append(PromptSection(
+                'reddit_discussions', "=== REDDIT DISCUSSIONS ===\n" + self.research_data['reddit_content'][:800] + "\n", priority=40
+            ))
         
         # Add conversation history
-        if self.conversation_history:
-            context += "=== PREVIOUS CONVERSATION ===\n"
-            for conv in self.conversation_history[-3:]:  # Last 3 exchanges
-                context += f"Q: {conv['query']}\nA: {conv['response'][:200]}...\n\n"
+        if include_conversation and self.conversation_history:
+            sections.append(PromptSection('conversation', self.get_conversation_context(), priority=70))
         
-        return context
+        return sections
+    
+    def get_conversation_context(self) -> str:
+        """Get the last few exchanges as context for follow-up questions"""
+        if not self.conversation_history:
+            return ""
+        history = "=== PREVIOUS CONVERSATION ===\n"
+        for conv in self.conversation_history[-3:]:  # Last 3 exchanges
+            history += f"Q: {conv['query']}\nA: {conv['response'][:200]}...\n\n"
+        return history
+    
+    def get_research_context(self) -> str:
+        """Get the research data as context for follow-up questions"""
+        return "\n".join(section.text for section in self.get_research_sections())
+    
+    def adopt_session(self, other: 'MemoryService'):
+        """Start this session from another memory's research (e.g. a coalesced request's)"""
+        self.start_new_session(other.current_session['product'], dict(other.research_data),
+                               other.current_session.get('entity_key'))
     
     def clear_session(self):
         """Clear current session"""
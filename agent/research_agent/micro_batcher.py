@@ -0,0 +1,115 @@
+import json
+import re
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+class _PendingBatch:
+    def __init__(self):
+        self.items: List[tuple] = []  # (prompt, Future)
+        self.full = threading.Event()
+
+class MicroBatcher:
+    """Packs short prompts that arrive together into one multi-item LLM call
+    
+    The first caller for a key (task, model) becomes the batch leader: it waits up
+    to max_wait seconds, or until max_batch_size prompts have joined, then sends a
+    single prompt asking for a JSON object with one answer per item. Items missing
+    from the answer (or the whole batch, if the call fails) are re-asked one by one.
+    """
+    
+    def __init__(self, run_batch: Callable[[Hashable, str, int], Optional[str]],
+                 run_single: Callable[[Hashable, str], Optional[str]],
+                 max_batch_size: int = 8, max_wait: float = 0.01):
+        self.run_batch = run_batch
+        self.run_single = run_single
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._open: Dict[Hashable, _PendingBatch] = {}
+        self._lock = threading.Lock()
+        self.stats = {'batches': 0, 'batched_items': 0, 'single_items': 0, 'item_fallbacks': 0}
+    
+    def submit(self, key: Hashable, prompt: str) -> str:
+        """Queue a prompt and block until its answer is available"""
+        future = Future()
+        with self._lock:
+            batch = self._open.get(key)
+            leader = batch is None
+            if leader:
+                batch = self._open[key] = _PendingBatch()
+            batch.items.append((prompt, future))
+            if len(batch.items) >= self.max_batch_size:
+                del self._open[key]
+                batch.full.set()
+        
+        if leader:
+            batch.full.wait(self.max_wait)
+            with self._lock:
+                if self._open.get(key) is batch:
+                    del self._open[key]
+            self._flush(key, batch.items)
+        return future.result()
+    
+    def _flush(self, key: Hashable, items: List[tuple]):
+        if len(items) == 1:
+            prompt, future = items[0]
+            self._resolve(key, future, prompt)
+            with self._lock:
+                self.stats['single_items'] += 1
+            return
+        
+        answers = {}
+        try:
+            raw = self.run_batch(key, self.batch_prompt([prompt for prompt, _ in items]), len(items))
+            answers = self.parse_answers(raw) if raw else {}
+        except Exception as e:
+            print(f"Micro-batch of {len(items)} failed, answering items individually: {e}")
+        
+        missing = 0
+        for index, (prompt, future) in enumerate(items, 1):
+            answer = answers.get(str(index))
+            if isinstance(answer, str) and answer.strip():
+                future.set_result(answer.strip())
+            else:
+                missing += 1
+                self._resolve(key, future, prompt)
+        with self._lock:
+            self.stats['batches'] += 1
+            self.stats['batched_items'] += len(items) - missing
+            self.stats['item_fallbacks'] += missing
+    
+    def _resolve(self, key: Hashable, future: Future, prompt: str):
+        try:
+            future.set_result(self.run_single(key, prompt))
+        except Exception as e:
+            future.set_exception(e)
+    
+    @staticmethod
+    def batch_prompt(prompts: List[str]) -> str:
+        """Wrap several independent requests into one prompt with a JSON answer contract"""
+        requests = "\n".join(
+            f'<request id="{index}">\n{prompt.strip()}\n</request>' for index, prompt in enumerate(prompts, 1)
+        )
+        return f"""
+        Answer each of the {len(prompts)} independent requests below on its own, exactly as if it
+        were the only request. Respond with only a JSON object mapping each request id to its
+        answer string, for example {{"1": "...", "2": "..."}}.
+        
+        {requests}
+        """
+    
+    @staticmethod
+    def parse_answers(raw: str) -> Dict[str, Any]:
+        """Extract the id -> answer object from the model output ({} if it is unusable)"""
+        match = re.search(r'\{.*\}', raw, re.DOTALL)
+        if not match:
+            return {}
+        try:
+            answers = json.loads(match.group(0))
+        except json.JSONDecodeError:
+            return {}
+        return {str(key): value for key, value in answers.items()} if isinstance(answers, dict) else {}
+    
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.stats)
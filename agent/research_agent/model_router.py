@@ -0,0 +1,195 @@
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List
+from .config import Config
+
+# Bedrock error codes that mean the credentials themselves are bad
+CREDENTIAL_ERROR_CODES = {
+    'UnrecognizedClientException', 'InvalidSignatureException',
+    'ExpiredTokenException', 'InvalidClientTokenId'
+}
+
+def classify_error(error: Exception) -> str:
+    """Map an invoke_model exception to a short error class"""
+    response = getattr(error, 'response', None)
+    if isinstance(response, dict):
+        code = response.get('Error', {}).get('Code')
+        if code:
+            return code
+    if "security token" in str(error).lower():
+        return 'UnrecognizedClientException'
+    return type(error).__name__
+
+# Recent outcomes kept per model for its error rate, and how many are needed before it counts
+HEALTH_WINDOW = 20
+HEALTH_MIN_SAMPLES = 5
+
+class CircuitBreaker:
+    """Per-model breaker: closed -> open after repeated failures -> half-open probe"""
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int = 3, recovery_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.probe_started_at = None
+
+    def can_request(self) -> bool:
+        """Return True if a call could be sent to this model right now (claims nothing)"""
+        if self.state == self.CLOSED:
+            return True
+        now = time.time()
+        if self.state == self.OPEN:
+            return now - self.opened_at >= self.recovery_timeout
+        # One probe at a time; a probe that never reported back is retried after the timeout
+        return self.probe_started_at is None or now - self.probe_started_at >= self.recovery_timeout
+    
+    def allow_request(self) -> bool:
+        """Claim the right to send a call now; for a recovering model this takes the probe slot"""
+        if not self.can_request():
+            return False
+        if self.state != self.CLOSED:
+            self.state = self.HALF_OPEN
+            self.probe_started_at = time.time()
+        return True
+    
+    def release(self):
+        """Give back a probe slot whose call was never made or never reported"""
+        if self.state == self.HALF_OPEN:
+            self.probe_started_at = None
+
+    def record_success(self):
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.probe_started_at = None
+
+    def record_failure(self):
+        self.consecutive_failures += 1
+        self.probe_started_at = None
+        if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            self.state = self.OPEN
+            self.opened_at = time.time()
+
+class ModelRouter:
+    """Tracks per-model health and orders fallback candidates by it"""
+
+    def __init__(self, failure_threshold: int = 3, recovery_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.credentials_invalid = False
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def _breaker(self, model: str) -> CircuitBreaker:
+        if model not in self._breakers:
+            self._breakers[model] = CircuitBreaker(self.failure_threshold, self.recovery_timeout)
+            self._stats[model] = {'successes': 0, 'failures': 0, 'total_latency': 0.0, 'errors': {},
+                                  'recent': deque(maxlen=HEALTH_WINDOW)}
+        return self._breakers[model]
+
+    def _error_band(self, model: str) -> int:
+        """Recent error rate in quarters (0 below 25%), so a stray failure does not reorder models"""
+        recent = self._stats[model]['recent']
+        if len(recent) < HEALTH_MIN_SAMPLES:
+            return 0
+        return int(4 * recent.count(False) / len(recent))
+    
+    def route(self, candidates: List[str]) -> List[str]:
+        """Return the candidates worth trying, healthiest first
+        
+        Models with an open circuit are skipped unless due a half-open probe; those
+        keep their preference position so a recovered primary is tried first again.
+        Closed models with recent consecutive failures sink to the back, then those
+        failing a larger share of their last HEALTH_WINDOW calls, and the caller's
+        preference order breaks ties. Latency is not ranked on: the candidates are
+        a fallback chain ordered by quality, and the fastest is the cheapest tier.
+        Nothing is claimed here: call acquire() just before sending to a model.
+        """
+        if self.credentials_invalid:
+            return []
+
+        with self._lock:
+            available = []
+            for preference, model in enumerate(dict.fromkeys(candidates)):
+                breaker = self._breaker(model)
+                if breaker.can_request():
+                    if breaker.state == CircuitBreaker.CLOSED:
+                        health = (breaker.consecutive_failures, self._error_band(model))
+                    else:
+                        health = (0, 0)
+                    available.append((health, preference, model))
+            return [model for *_, model in sorted(available)]
+
+    def acquire(self, model: str) -> bool:
+        """Claim model for a call about to be sent; False if another request holds its probe"""
+        with self._lock:
+            return self._breaker(model).allow_request()
+    
+    def release(self, model: str):
+        """Free a claimed probe slot if the call did not report success or failure"""
+        with self._lock:
+            self._breaker(model).release()
+    
+    def record_success(self, model: str, latency: float):
+        with self._lock:
+            self._breaker(model).record_success()
+            stats = self._stats[model]
+            stats['successes'] += 1
+            stats['total_latency'] += latency
+            stats['recent'].append(True)
+
+    def record_failure(self, model: str, error_class: str, latency: float):
+        with self._lock:
+            if error_class in CREDENTIAL_ERROR_CODES:
+                self.credentials_invalid = True
+            self._breaker(model).record_failure()
+            stats = self._stats[model]
+            stats['failures'] += 1
+            stats['total_latency'] += latency
+            stats['recent'].append(False)
+            stats['errors'][error_class] = stats['errors'].get(error_class, 0) + 1
+
+    def reset(self):
+        """Forget all health data (e.g. after credentials are fixed)"""
+        with self._lock:
+            self.credentials_invalid = False
+            self._breakers.clear()
+            self._stats.clear()
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return per-model success, latency, error and circuit state"""
+        with self._lock:
+            report = {}
+            for model, stats in self._stats.items():
+                calls = stats['successes'] + stats['failures']
+                recent = stats['recent']
+                report[model] = {
+                    'state': self._breakers[model].state,
+                    'successes': stats['successes'],
+                    'failures': stats['failures'],
+                    'avg_latency': round(stats['total_latency'] / calls, 3) if calls else None,
+                    'recent_error_rate': round(recent.count(False) / len(recent), 3) if recent else None,
+                    'errors': dict(stats['errors'])
+                }
+            return report
+
+_default_router = None
+_default_router_lock = threading.Lock()
+
+def get_model_router() -> ModelRouter:
+    """Return the process-wide router shared by every LLMService"""
+    global _default_router
+    with _default_router_lock:
+        if _default_router is None:
+            _default_router = ModelRouter(
+                failure_threshold=Config.get_llm_breaker_failure_threshold(),
+                recovery_timeout=Config.get_llm_breaker_recovery_timeout()
+            )
+        return _default_router
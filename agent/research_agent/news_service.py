@@ -1,4 +1,3 @@
-import requests
 from typing import Dict, List, Any
 
 class NewsService:
@@ -8,6 +7,7 @@ class NewsService:
     
     def search_news(self, query: str, language: str = "en", size: int = 5) -> List[Dict[str, Any]]:
         """Search for news articles using NewsData.io API"""
+        import requests
         try:
             params = {
                 'apikey': self.api_key,
@@ -1,25 +1,88 @@
-from typing import Dict, Any
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Any, Callable, Iterable, Iterator, List, Optional
 from .factory import AgentFactory
 from .news_service import NewsService
 from .search_service import SearchService
 from .llm_service import LLMService
 from .memory_service import MemoryService
+from .prompt_builder import PromptBuilder, estimate_tokens, get_token_budget
+from .llm_metrics import percentile, summarize_calls
+from .task_profiles import get_task_profile
+from .query_classifier import get_query_classifier, normalize_query
+from .response_cache import ResponseCache
+from .prefetcher import SpeculativePrefetcher, Prefetch
+from .keyword_matcher import get_matcher
+from .entity_canonicalizer import canonicalize
+from .single_flight import get_single_flight, get_single_flight_stats
+from .deadline import Deadline
+from .report_events import ReportEvent, render_report
+from .config import Config
+
+_classification_cache = None
+_classification_cache_lock = threading.Lock()
+
+def get_classification_cache() -> Optional[ResponseCache]:
+    """Return the process-wide classification cache (None if disabled)"""
+    global _classification_cache
+    if not Config.get_classification_cache_enabled():
+        return None
+    with _classification_cache_lock:
+        if _classification_cache is None:
+            _classification_cache = ResponseCache(
+                max_entries=Config.get_classification_cache_max_entries(),
+                default_ttl=Config.get_classification_cache_ttl(),
+                db_path=Config.get_classification_cache_db_path()
+            )
+        return _classification_cache
 
 class AIOrchestrator:
-    def __init__(self, newsdata_api_key: str, google_cse_id: str, aws_access_key: str = None, aws_secret_key: str = None, aws_region: str = 'us-east-1'):
-        # Initialize services
-        news_service = NewsService(newsdata_api_key)
-        search_service = SearchService(google_cse_id)
-        llm_service = LLMService(aws_access_key, aws_secret_key, aws_region)
+    # Prompt budget kept free for follow-up instructions, question and conversation history
+    FOLLOWUP_RESERVE_TOKENS = 1500
+    # Keyword-fallback answers are cached briefly so the LLM is retried once it recovers
+    KEYWORD_CLASSIFICATION_TTL = 300
+    
+    def __init__(self, newsdata_api_key: str, google_cse_id: str, aws_access_key: str = None, aws_secret_key: str = None, aws_region: str = 'us-east-1',
+                 llm_service: LLMService = None, factory: AgentFactory = None):
+        # Initialize services (an LLMService or a whole AgentFactory, with its agent pools,
+        # can be shared between orchestrators)
+        llm_service = llm_service or (factory.llm_service if factory else None) or \
+            LLMService(aws_access_key, aws_secret_key, aws_region)
         
         # Initialize factory with services
-        self.factory = AgentFactory(news_service, search_service, llm_service)
+        self.factory = factory or self.create_factory(newsdata_api_key, google_cse_id, llm_service)
         self.llm_service = llm_service
-        self.memory = MemoryService()
+        # Default conversation session; analyze_query can be given a per-client one instead
+        self._memory = MemoryService()
+        self._local = threading.local()
+        # Trained once at startup; confident predictions skip the classification LLM call
+        self.local_classifier = get_query_classifier() if Config.get_local_classifier_enabled() else None
+        self.classification_cache = get_classification_cache()
+        self.prefetcher = SpeculativePrefetcher(
+            max_workers=Config.get_prefetch_max_workers()
+        ) if Config.get_speculative_prefetch_enabled() else None
+        self.classification_stats = {'cached': 0, 'local': 0, 'llm': 0, 'keyword': 0}
+        self._classification_stats_lock = threading.Lock()
+        # Seconds from query start to the first report section, over recent research queries
+        self._first_section_times = deque(maxlen=1000)
+        self._report_stats_lock = threading.Lock()
+        # Process-wide, so identical requests coalesce across orchestrators sharing a process
+        self.research_flight = get_single_flight('research') if Config.get_request_coalescing_enabled() else None
     
-    def classify_query(self, query: str) -> str:
-        """Classify query type using LLM"""
-        classification_prompt = f"""
+    @staticmethod
+    def create_factory(newsdata_api_key: str, google_cse_id: str, llm_service: LLMService) -> AgentFactory:
+        """Agent factory over fresh news and search services, with its pools warmed up if configured"""
+        factory = AgentFactory(NewsService(newsdata_api_key), SearchService(google_cse_id), llm_service)
+        if factory.min_size > 0:
+            factory.warm_up()
+        return factory
+    
+    @staticmethod
+    def classification_prompt(query: str) -> str:
+        """LLM prompt used when the local classifier is not confident"""
+        return f"""
         Classify this query into one of these categories:
         1. STOCKS - stock prices, market data, financial news, company earnings, trading
         2. NEWS - current events, breaking news, politics, world events
@@ -30,27 +93,54 @@ class AIOrchestrator:
         
         Respond with only: STOCKS, NEWS, PRODUCT, or GENERAL
         """
+    
+    def classify_query(self, query: str) -> str:
+        """Classify query type, using the local classifier when it is confident and the LLM otherwise
+        
+        Results are cached by normalized query, ahead of every classification path.
+        """
+        cache_key = ResponseCache.make_key('classification', normalize_query(query))
+        cached = self.classification_cache.get(cache_key) if self.classification_cache else None
+        if cached:
+            self._count_classification('cached')
+            self._log_classification(query, cached)
+            return cached
+        
+        classification = None
+        ttl = None
+        if self.local_classifier:
+            category, confidence = self.local_classifier.predict(query)
+            if confidence >= Config.get_local_classifier_threshold():
+                print(f"⚡ Local classifier: {category} ({confidence:.2f}), skipping LLM")
+                classification = category
+                self._count_classification('local')
         
-        classification = self.llm_service.query_llm(classification_prompt).strip().upper()
+        if classification is None:
+            self._count_classification('llm')
+            classification = self.llm_service.query_llm(self.classification_prompt(query), task='classify').strip().upper()
         
         # Fallback if LLM fails or returns empty
         if not classification or classification not in ["STOCKS", "NEWS", "PRODUCT", "GENERAL"]:
             # Simple keyword-based fallback
-            query_lower = query.lower()
-            if any(word in query_lower for word in ["mobile", "phone", "laptop", "product", "buy", "price", "camera", "display", "snapdragon", "review", "iphone", "samsung", "unboxing"]):
-                classification = "PRODUCT"
-            elif any(word in query_lower for word in ["stock", "market", "trading", "investment", "share", "apple", "tesla", "microsoft", "google", "amazon", "reliance", "tcs", "infosys", "aapl", "tsla", "msft"]):
-                classification = "STOCKS"
-            elif any(word in query_lower for word in ["news", "breaking", "latest"]):
-                classification = "NEWS"
-            else:
-                classification = "GENERAL"
+            self._count_classification('keyword')
+            ttl = self.KEYWORD_CLASSIFICATION_TTL
+            classification = get_matcher('routing').first_category(query, default="GENERAL")
         
+        if self.classification_cache:
+            self.classification_cache.set(cache_key, classification, ttl)
+        self._log_classification(query, classification)
+        return classification
+    
+    def _count_classification(self, source: str):
+        # Server worker threads classify concurrently
+        with self._classification_stats_lock:
+            self.classification_stats[source] += 1
+    
+    def _log_classification(self, query: str, classification: str):
         print(f"\n=== CLASSIFICATION ===")
         print(f"Query: {query}")
         print(f"Classified as: {classification}")
         print(f"=== END CLASSIFICATION ===")
-        return classification
     
     def create_optimized_prompt(self, query: str, category: str) -> str:
         """Create optimized search prompt based on category"""
@@ -70,34 +160,165 @@ class AIOrchestrator:
             return f"Active session: {session['product']} ({len(self.memory.conversation_history)} exchanges)"
         return "No active session"
     
-    def analyze_query(self, user_query: str) -> str:
-        """Main orchestration method with conversational memory"""
+    @property
+    def memory(self) -> MemoryService:
+        """Session memory of the query being handled on this thread (the orchestrator's own by default)"""
+        return getattr(self._local, 'memory', None) or self._memory
+    
+    @property
+    def last_query_calls(self) -> List[Dict[str, Any]]:
+        """LLM calls made for the most recent query handled on this thread"""
+        return getattr(self._local, 'last_query_calls', [])
+    
+    @property
+    def last_stage_timings(self) -> Dict[str, Dict[str, Any]]:
+        """Per-stage status and timing of the agent run for the most recent query on this thread"""
+        return getattr(self._local, 'last_stage_timings', {})
+    
+    @property
+    def last_first_section_seconds(self) -> Optional[float]:
+        """Seconds until the first report section of the most recent query on this thread"""
+        return getattr(self._local, 'first_section_seconds', None)
+    
+    @contextmanager
+    def _session_scope(self, memory: Optional[MemoryService], agent: str):
+        """Use memory (if given) and collect LLM telemetry for one query on this thread"""
+        previous = getattr(self._local, 'memory', None)
+        self._local.memory = memory
+        self._local.last_stage_timings = {}
+        self._local.started_at = time.time()
+        self._local.first_section_seconds = None
+        try:
+            with self.llm_service.telemetry_scope(agent) as calls:
+                self._local.last_query_calls = calls
+                yield
+        finally:
+            self._local.memory = previous
+    
+    def analyze_query(self, user_query: str, on_token: Optional[Callable[[str], None]] = None,
+                      memory: MemoryService = None, deadline: float = None,
+                      on_event: Optional[Callable[[ReportEvent], None]] = None) -> str:
+        """Main orchestration method with conversational memory
+        
+        If on_token is given, report sections and LLM text are streamed into it as they arrive.
+        memory selects the conversation session (e.g. one per server client), so concurrent
+        queries on one orchestrator keep separate sessions. deadline is the query's time
+        budget in seconds (QUERY_DEADLINE_SECONDS by default); agents get what remains of
+        it and report from the data that arrived in time. If on_event is given, each typed
+        report section (sources, stock tables, analyses, footer) is passed to it as soon
+        as the agent produces it; the full report is still returned.
+        """
         print(f"Processing query: {user_query}")
+        budget = Deadline.after(deadline if deadline is not None else Config.get_query_deadline())
+        
+        # Every LLM call of the query (classification, agents, follow-ups) shares the budget
+        with self._session_scope(memory, 'orchestrator'), self.llm_service.deadline_scope(budget):
+            return self._analyze_query(user_query, on_token, budget, on_event)
+    
+    def answer_followup(self, question: str, on_token: Optional[Callable[[str], None]] = None,
+                        memory: MemoryService = None, deadline: float = None) -> str:
+        """Answer a question about the session's researched product, without new research"""
+        budget = Deadline.after(deadline if deadline is not None else Config.get_query_deadline())
+        with self._session_scope(memory, 'followup'), self.llm_service.deadline_scope(budget):
+            if not self.memory.has_active_session():
+                raise ValueError("No active research session to follow up on")
+            return self._handle_followup_query(question, on_token)
+    
+    def get_llm_metrics(self, group_by: str = 'agent') -> Dict[str, Any]:
+        """LLM latency percentiles, token totals and fallback attempts over recent calls
         
+        group_by is 'agent', 'task', 'model' or None for a single overall summary.
+        """
+        return self.llm_service.metrics.get_summary(group_by)
+    
+    def get_classification_stats(self) -> Dict[str, Any]:
+        """How queries were classified (cache, local model, LLM, keywords) plus cache counters"""
+        with self._classification_stats_lock:
+            stats = dict(self.classification_stats)
+        if self.classification_cache:
+            stats['cache'] = self.classification_cache.get_stats()
+        return stats
+    
+    def get_agent_pool_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-agent-type pool size and checkout wait metrics"""
+        return self.factory.get_pool_stats()
+    
+    def get_coalescing_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Requests executed vs coalesced onto an identical in-flight one, per coalescing group"""
+        return get_single_flight_stats()
+    
+    def get_report_stream_stats(self) -> Dict[str, Any]:
+        """Time to first report section over recent research queries"""
+        with self._report_stats_lock:
+            times = list(self._first_section_times)
+        return {
+            'reports': len(times),
+            'first_section_p50_ms': round(percentile(times, 50) * 1000, 2) if times else 0.0,
+            'first_section_p95_ms': round(percentile(times, 95) * 1000, 2) if times else 0.0,
+            'first_section_max_ms': round(max(times) * 1000, 2) if times else 0.0
+        }
+    
+    def get_prefetch_stats(self) -> Dict[str, Any]:
+        """Speculative prefetch hits, misses and wasted work"""
+        return self.prefetcher.get_stats() if self.prefetcher else {}
+    
+    def _start_prefetch(self, query: str) -> Optional[Prefetch]:
+        """Guess the category cheaply and start that agent's fetches while classification runs"""
+        if not self.prefetcher or not self.local_classifier:
+            return None
+        guess, confidence = self.local_classifier.predict(query)
+        if confidence < Config.get_speculative_prefetch_min_confidence():
+            return None
+        # The agent only builds the tasks; they call its stateless services after it is returned.
+        # Speculation must never queue for an agent the real request will need, so skip it
+        # when none is idle or creatable right now
+        try:
+            with self.factory.lease(guess, timeout=0) as agent:
+                tasks = agent.prefetch_tasks(query, guess)
+        except TimeoutError:
+            print(f"⏭️  Prefetch skipped: no idle {guess} agent")
+            return None
+        return self.prefetcher.start(guess, tasks)
+    
+    def get_last_query_metrics(self) -> Dict[str, Any]:
+        """Summary of the LLM calls made while answering the most recent query"""
+        return summarize_calls(self.last_query_calls)
+    
+    def get_last_stage_timings(self) -> Dict[str, Dict[str, Any]]:
+        """Start offset, duration and status of each research stage of the most recent query"""
+        return self.last_stage_timings
+    
+    def _analyze_query(self, user_query: str, on_token: Optional[Callable[[str], None]] = None,
+                       deadline: Optional[Deadline] = None,
+                       on_event: Optional[Callable[[ReportEvent], None]] = None) -> str:
         try:
             # Check if this is a follow-up question to existing research
             if self.memory.has_active_session() and not self._is_new_research_query(user_query):
                 print(f"🔄 Detected follow-up question about {self.memory.current_session['product']}")
-                return self._handle_followup_query(user_query)
+                with self.llm_service.telemetry_scope('followup', self.last_query_calls):
+                    return self._handle_followup_query(user_query, on_token, on_event)
             
             # Clear memory if starting new research
             if self.memory.has_active_session():
                 print(f"🔄 Starting new research, clearing previous session")
                 self.memory.clear_session()
             
-            # Step 1: Classify the query for new research
-            category = self.classify_query(user_query)
-            print(f"🏭 Getting agent for category: {category}")
-            
-            # Step 2: Get appropriate agent from factory
-            agent = self.factory.get_agent(category)
-            print(f"🤖 Got agent: {type(agent).__name__}")
-            
-            # Step 3: Process query with agent (full research)
-            context = {'category': category, 'memory': self.memory}
-            print(f"📤 Calling agent.process with context: {context}")
-            result = agent.process(user_query, context)
-            print(f"📥 Agent returned result length: {len(result)}")
+            # Step 1: Classify the query for new research, prefetching data for the likely category meanwhile
+            prefetch = self._start_prefetch(user_query)
+            category = None
+            try:
+                category = self.classify_query(user_query)
+                print(f"🏭 Getting agent for category: {category}")
+                
+                # Steps 2-3: research with a pooled agent, sharing an identical in-flight request if any
+                if on_token or on_event or not self.research_flight:
+                    result = self._run_agent(category, user_query, self.memory, on_token, prefetch, deadline, on_event)
+                else:
+                    result = self._run_coalesced(category, user_query, prefetch, deadline)
+                print(f"📥 Agent returned result length: {len(result)}")
+            finally:
+                if self.prefetcher:
+                    self.prefetcher.finish(prefetch, category)
             
             return result
             
@@ -107,60 +328,177 @@ class AIOrchestrator:
             traceback.print_exc()
             return f"Error processing query: {str(e)}"
     
+    def _run_agent(self, category: str, query: str, memory: MemoryService,
+                   on_token: Optional[Callable[[str], None]], prefetch: Optional[Prefetch],
+                   deadline: Optional[Deadline] = None,
+                   on_event: Optional[Callable[[ReportEvent], None]] = None) -> str:
+        """Check an agent out of the factory's pool and run the full research for query"""
+        with self.factory.lease(category) as agent:
+            print(f"🤖 Got agent: {type(agent).__name__}")
+            
+            context = {'category': category, 'memory': memory}
+            token_sink = on_token or self._token_events(on_event)
+            if token_sink:
+                context['on_token'] = token_sink
+            print(f"📤 Calling agent.process with context: {context}")
+            if prefetch and prefetch.category == category:
+                context['prefetch'] = prefetch
+            if deadline:
+                context['deadline'] = deadline
+            with self.llm_service.telemetry_scope(type(agent).__name__, self.last_query_calls):
+                try:
+                    return self._collect_events(agent.process_events(query, context), on_event, on_token)
+                finally:
+                    self._local.last_stage_timings = context.get('stage_timings', {})
+    
+    def _collect_events(self, events: Iterable[ReportEvent], on_event: Optional[Callable[[ReportEvent], None]],
+                        on_token: Optional[Callable[[str], None]] = None, track: bool = True) -> str:
+        """Timestamp and forward each report section as it arrives; returns the full report
+        
+        on_token receives the whole report as text: section headings before their streamed
+        tokens, and every section that was not streamed.
+        """
+        sections = []
+        for event in events:
+            event.elapsed = round(time.time() - self._local.started_at, 3)
+            if on_token:
+                on_token(event.stream_text)
+            if on_event:
+                on_event(event)
+            if not event.is_section:
+                continue
+            if not sections and track:
+                self._local.first_section_seconds = event.elapsed
+                with self._report_stats_lock:
+                    self._first_section_times.append(event.elapsed)
+            sections.append(event)
+        return render_report(sections)
+    
+    def _token_events(self, on_event: Optional[Callable[[ReportEvent], None]]) -> Optional[Callable[[str], None]]:
+        """Stream LLM text to an on_event caller as TOKEN events, when LLM streaming is enabled"""
+        if not on_event or not Config.get_llm_streaming_enabled():
+            return None
+        
+        def emit(text: str):
+            event = ReportEvent(ReportEvent.TOKEN, text)
+            event.elapsed = round(time.time() - self._local.started_at, 3)
+            on_event(event)
+        return emit
+    
+    def _run_coalesced(self, category: str, query: str, prefetch: Optional[Prefetch],
+                       deadline: Optional[Deadline] = None) -> str:
+        """Research query once for all concurrent identical requests (same normalized query and category)
+        
+        The shared run stores its research in scratch memory, which each caller then
+        copies into its own session so follow-ups work for every one of them. The run
+        uses the first caller's deadline.
+        """
+        def research():
+            scratch = MemoryService()
+            return self._run_agent(category, query, scratch, None, prefetch, deadline), scratch
+        
+        result, scratch = self.research_flight.do((normalize_query(query), category), research)
+        if scratch.has_active_session():
+            self.memory.adopt_session(scratch)
+        return result
+    
     def _is_new_research_query(self, query: str) -> bool:
         """Determine if this is a new research query or follow-up"""
-        query_lower = query.lower()
-        
-        # Keywords that clearly indicate follow-up questions
-        followup_keywords = [
-            'camera', 'battery', 'price', 'color', 'colors', 'screen', 'display', 
-            'performance', 'storage', 'memory', 'size', 'weight', 'features',
-            'what', 'how', 'when', 'where', 'why', 'is it', 'does it', 'can it',
-            'details', 'detail', 'about', 'specs', 'specification', 'tell me',
-            'more about', 'explain', 'describe', 'show me', 'good', 'bad',
-            'pros', 'cons', 'worth', 'buy', 'purchase', 'recommend'
-        ]
+        # Follow-up and new-research keywords (data/keywords.json) found in one pass
+        matched = get_matcher('followup').match_categories(query)
+        
+        # A specific product was named: compare it with the session's canonical product
+        session_key = self.memory.current_session.get('entity_key') if self.memory.current_session else None
+        entity = canonicalize(query)
+        if session_key and entity and entity.is_specific:
+            if entity.key != session_key:
+                return True
+            # A second product in the rest of the query ("pixel 9 vs iphone 15") is a comparison
+            other = canonicalize(' '.join(entity.residual)) if entity.residual else None
+            if other and other.is_specific and other.key != session_key:
+                return True
+            # Only the session's product and nothing else ("Google Pixel 9") is about the same research
+            if entity.is_exact and 'NEW_RESEARCH' not in matched:
+                return False
         
         # Short queries are likely follow-ups
         if len(query.split()) <= 3:
             return False
         
         # If it's clearly a follow-up question
-        if any(keyword in query_lower for keyword in followup_keywords):
+        if 'FOLLOWUP' in matched:
             return False
         
-        # Keywords that indicate new research
-        new_research_keywords = ['review of', 'analysis of', 'compare', 'vs', 'versus']
-        
         # If query contains completely different product names
         if self.memory.current_session:
-            current_product = self.memory.current_session['product'].lower()
-            # Check if query mentions a completely different product
-            product_brands = ['iphone', 'samsung', 'oneplus', 'xiaomi', 'huawei', 'sony', 'lg', 'pixel', 'galaxy']
-            mentioned_products = [p for p in product_brands if p in query_lower]
-            current_products = [p for p in product_brands if p in current_product]
+            brands = get_matcher('product_brands')
+            mentioned_products = set(brands.match_categories(query))
+            current_products = set(brands.match_categories(self.memory.current_session['product']))
             
-            if mentioned_products and current_products and not any(p in current_products for p in mentioned_products):
+            if mentioned_products and current_products and not mentioned_products & current_products:
                 return True
         
         # If it contains explicit new research keywords
-        return any(keyword in query_lower for keyword in new_research_keywords)
+        return 'NEW_RESEARCH' in matched
     
-    def _handle_followup_query(self, query: str) -> str:
+    def _handle_followup_query(self, query: str, on_token: Optional[Callable[[str], None]] = None,
+                               on_event: Optional[Callable[[ReportEvent], None]] = None) -> str:
         """Handle follow-up questions using cached research data"""
+        token_sink = on_token or self._token_events(on_event)
+        return self._collect_events(self._followup_events(query, token_sink), on_event, on_token, track=False)
+    
+    def _followup_events(self, query: str, on_token: Optional[Callable[[str], None]] = None) -> Iterator[ReportEvent]:
         print(f"💬 Conversational Mode: Answering follow-up about {self.memory.current_session['product']}")
         
-        # Get research context from memory
-        research_context = self.memory.get_research_context()
+        # Every follow-up of a session sends the same research prefix, so from the second one on
+        # Bedrock can serve it from the follow-up model's prompt cache. The cache is per model:
+        # the report's own entry is only hit when follow-ups run on the report model.
+        followup_model = get_task_profile('followup').model_id
+        research_prefix = self.memory.research_data.get('prompt_prefix')
+        if (research_prefix and self.memory.research_data.get('prompt_prefix_model') != followup_model
+                and estimate_tokens(research_prefix) > get_token_budget(followup_model) - self.FOLLOWUP_RESERVE_TOKENS):
+            # Fitted to the report model's larger budget; too big for the follow-up model
+            print("📏 Report prefix exceeds the follow-up model's budget, rebuilding it")
+            research_prefix = None
+        if not research_prefix:
+            builder = PromptBuilder(model_id=followup_model, reserve_tokens=self.FOLLOWUP_RESERVE_TOKENS)
+            builder.add_sections(self.memory.get_research_sections(include_conversation=False))
+            research_prefix = f"AVAILABLE RESEARCH DATA:\n{builder.build()}"
+            builder.log_report("Follow-up context")
+            # Later follow-ups send the same prefix
+            self.memory.research_data['prompt_prefix'] = research_prefix
+            self.memory.research_data['prompt_prefix_model'] = followup_model
         
-        # Create focused prompt for follow-up
-        followup_prompt = f"""
-        You are a product expert answering a follow-up question about {self.memory.current_session['product']}.
+        # Only the question and recent conversation change between follow-ups
+        followup_prompt = self._followup_prompt(query, self.memory.get_conversation_context())
         
-        USER QUESTION: {query}
+        product = self.memory.current_session['product']
+        header = f"""
+┌────────────────────────────────────────────────────────────────────────────────┐
+│ 💬 CONVERSATIONAL RESPONSE - {product.upper():<40} │
+└────────────────────────────────────────────────────────────────────────────────┘
+        """.strip()
+        if on_token:
+            yield ReportEvent.section_start(ReportEvent.ANSWER, header)
+        response = self.llm_service.query_llm_streaming(
+            followup_prompt, on_token, task='followup', cache_prefix=research_prefix
+        )
+        
+        # Add to conversation history
+        self.memory.add_conversation(query, response)
         
-        AVAILABLE RESEARCH DATA:
-        {research_context}
+        yield ReportEvent(ReportEvent.ANSWER, f"{header}\n\n{response}", streamed=bool(on_token))
+        yield ReportEvent(ReportEvent.FOOTER,
+                          f"💡 Continue asking questions about {product} or type 'exit' for new research.")
+    
+    def _followup_prompt(self, query: str, conversation_context: str) -> str:
+        """Instructions for answering a follow-up question from the research data above"""
+        return f"""
+        You are a product expert answering a follow-up question about {self.memory.current_session['product']},
+        using the research data above.
+        
+        {conversation_context}
+        USER QUESTION: {query}
         
         INSTRUCTIONS:
         - Answer the specific question using the research data provided
@@ -170,21 +508,6 @@ class AIOrchestrator:
         - Use a conversational, helpful tone
         - Structure your response clearly with bullet points if needed
         """
-        
-        response = self.llm_service.query_llm(followup_prompt)
-        
-        # Add to conversation history
-        self.memory.add_conversation(query, response)
-        
-        return f"""
-┌────────────────────────────────────────────────────────────────────────────────┐
-│ 💬 CONVERSATIONAL RESPONSE - {self.memory.current_session['product'].upper():<40} │
-└────────────────────────────────────────────────────────────────────────────────┘
-
-{response}
-
-💡 Continue asking questions about {self.memory.current_session['product']} or type 'exit' for new research.
-        """.strip()
     
     def clear_memory(self):
         """Clear conversation memory"""
@@ -192,6 +515,6 @@ class AIOrchestrator:
     
     def __del__(self):
         """Cleanup when orchestrator is destroyed"""
-        if hasattr(self, 'memory'):
-            self.memory.clear_session()
+        if hasattr(self, '_memory'):
+            self._memory.clear_session()
     
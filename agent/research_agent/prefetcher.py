@@ -0,0 +1,104 @@
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+class Prefetch:
+    """Speculative fetches started for a guessed category"""
+    
+    def __init__(self, category: str, futures: Dict[str, Future], durations: Dict[str, float]):
+        self.category = category
+        self.futures = futures
+        self.durations = durations  # name -> seconds spent, filled in as tasks finish
+        self.used = set()
+    
+    def has(self, name: str) -> bool:
+        return name in self.futures and not self.futures[name].cancelled()
+    
+    def result(self, name: str) -> Any:
+        """Wait for a prefetched result (re-raises the task's exception)"""
+        self.used.add(name)
+        return self.futures[name].result()
+    
+    def cancel(self) -> int:
+        """Cancel tasks that have not started; running ones finish and are ignored"""
+        return sum(1 for future in self.futures.values() if future.cancel())
+
+class SpeculativePrefetcher:
+    """Runs an agent's prefetch tasks alongside classification and tracks wasted work"""
+    
+    def __init__(self, max_workers: int = 4):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='prefetch')
+        self._lock = threading.Lock()
+        self.stats = {'speculations': 0, 'hits': 0, 'misses': 0, 'tasks_used': 0, 'tasks_wasted': 0,
+                      'tasks_cancelled': 0, 'wasted_seconds': 0.0}
+    
+    def start(self, category: str, tasks: Dict[str, Callable[[], Any]]) -> Optional[Prefetch]:
+        if not tasks:
+            return None
+        durations = {}
+        
+        def timed(name: str, task: Callable[[], Any]):
+            start = time.time()
+            try:
+                return task()
+            finally:
+                durations[name] = time.time() - start
+        
+        futures = {name: self._executor.submit(timed, name, task) for name, task in tasks.items()}
+        with self._lock:
+            self.stats['speculations'] += 1
+        print(f"🔮 Speculative prefetch for {category}: {', '.join(tasks)}")
+        return Prefetch(category, futures, durations)
+    
+    def finish(self, prefetch: Optional[Prefetch], category: str):
+        """Settle a prefetch once the real category is known and the agent is done with it"""
+        if prefetch is None:
+            return
+        hit = prefetch.category == category
+        cancelled = prefetch.cancel()
+        wasted = [name for name in prefetch.futures if name not in prefetch.used]
+        
+        def record_waste():
+            # Charged when the last unused task finishes, since running threads can't be stopped
+            seconds = sum(prefetch.durations.get(name, 0.0) for name in wasted)
+            with self._lock:
+                self.stats['wasted_seconds'] = round(self.stats['wasted_seconds'] + seconds, 3)
+        
+        with self._lock:
+            self.stats['hits' if hit else 'misses'] += 1
+            self.stats['tasks_used'] += len(prefetch.used)
+            self.stats['tasks_wasted'] += len(wasted)
+            self.stats['tasks_cancelled'] += cancelled
+        if wasted:
+            print(f"🔮 Prefetch {'partly unused' if hit else 'wasted'} (guessed {prefetch.category}, "
+                  f"was {category}): {', '.join(wasted)}")
+            pending = [prefetch.futures[name] for name in wasted if not prefetch.futures[name].cancelled()]
+            if pending:
+                remaining = [len(pending)]
+                
+                def on_done(future):
+                    with self._lock:
+                        remaining[0] -= 1
+                        last = remaining[0] == 0
+                    if last:
+                        record_waste()
+                
+                for future in pending:
+                    future.add_done_callback(on_done)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self.stats)
+
+def use_prefetched(context: Optional[Dict[str, Any]], name: str, compute: Callable[[], Any]) -> Any:
+    """Return the prefetched result for name if the orchestrator started one, else compute it"""
+    prefetch = context.get('prefetch') if context else None
+    if prefetch is not None and prefetch.has(name):
+        try:
+            result = prefetch.result(name)
+            print(f"🔮 Using prefetched {name}")
+            return result
+        except Exception as e:
+            print(f"Prefetched {name} failed ({e}); fetching again")
+    return compute()
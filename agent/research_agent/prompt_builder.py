@@ -0,0 +1,112 @@
+from typing import Dict, List
+from .config import Config
+
+# Default prompt token budget per model family (input side only)
+MODEL_TOKEN_BUDGETS = {
+    'anthropic.claude-3-5-sonnet': 12000,
+    'anthropic.claude-3-sonnet': 12000,
+    'anthropic.claude-3-haiku': 8000,
+    'anthropic.claude-v2': 6000
+}
+DEFAULT_TOKEN_BUDGET = 8000
+
+def estimate_tokens(text: str) -> int:
+    """Rough token estimate (~4 characters per token for English prose)"""
+    return (len(text) + 3) // 4
+
+def get_token_budget(model_id: str = None) -> int:
+    """Resolve the prompt budget for a model, honouring PROMPT_TOKEN_BUDGET overrides"""
+    override = Config.get_prompt_token_budget()
+    if override:
+        return override
+    for prefix, budget in MODEL_TOKEN_BUDGETS.items():
+        if model_id and model_id.startswith(prefix):
+            return budget
+    return DEFAULT_TOKEN_BUDGET
+
+class PromptSection:
+    def __init__(self, name: str, text: str, priority: int = 50, required: bool = False):
+        self.name = name
+        self.text = text
+        self.priority = priority
+        self.required = required
+    
+    @property
+    def tokens(self) -> int:
+        return estimate_tokens(self.text)
+
+class PromptBuilder:
+    """Assembles prompt sections under a token budget
+    
+    Sections keep their insertion order in the output. When the total is over
+    budget, the lowest-priority optional sections are trimmed or dropped first;
+    required sections are only trimmed as a last resort.
+    """
+    
+    # Below this many tokens a trimmed section is not worth keeping
+    MIN_SECTION_TOKENS = 100
+    TRUNCATION_MARKER = "\n[...truncated]\n"
+    
+    def __init__(self, token_budget: int = None, model_id: str = None, reserve_tokens: int = 0):
+        self.token_budget = (token_budget or get_token_budget(model_id)) - reserve_tokens
+        self.sections: List[PromptSection] = []
+        self.dropped: List[str] = []
+        self.trimmed: List[str] = []
+        self.token_count = 0
+    
+    def add_section(self, name: str, text: str, priority: int = 50, required: bool = False) -> 'PromptBuilder':
+        if text:
+            self.sections.append(PromptSection(name, text, priority, required))
+        return self
+    
+    def add_sections(self, sections: List[PromptSection]) -> 'PromptBuilder':
+        for section in sections:
+            self.add_section(section.name, section.text, section.priority, section.required)
+        return self
+    
+    def build(self, separator: str = "\n") -> str:
+        """Fit the sections to the budget and join them"""
+        total = sum(section.tokens for section in self.sections)
+        # Optional sections first, lowest priority first; later sections lose ties
+        order = sorted(
+            range(len(self.sections)),
+            key=lambda i: (self.sections[i].required, self.sections[i].priority, -i)
+        )
+        
+        for index in order:
+            if total <= self.token_budget:
+                break
+            section = self.sections[index]
+            excess = total - self.token_budget
+            keep_tokens = section.tokens - excess
+            if keep_tokens >= self.MIN_SECTION_TOKENS or section.required:
+                keep_chars = max(0, keep_tokens * 4 - len(self.TRUNCATION_MARKER))
+                total -= section.tokens
+                section.text = section.text[:keep_chars].rstrip() + self.TRUNCATION_MARKER
+                total += section.tokens
+                self.trimmed.append(section.name)
+            else:
+                total -= section.tokens
+                section.text = ""
+                self.dropped.append(section.name)
+        
+        kept = [section for section in self.sections if section.text]
+        self.sections = kept
+        self.token_count = total
+        return separator.join(section.text for section in kept)
+    
+    def get_report(self) -> Dict[str, object]:
+        """Summarize the last build for logging"""
+        return {
+            'token_count': self.token_count,
+            'token_budget': self.token_budget,
+            'sections': {section.name: section.tokens for section in self.sections},
+            'trimmed': list(self.trimmed),
+            'dropped': list(self.dropped)
+        }
+    
+    def log_report(self, label: str):
+        report = self.get_report()
+        print(f"📏 {label}: ~{report['token_count']} tokens (budget {report['token_budget']})"
+              + (f", trimmed {report['trimmed']}" if report['trimmed'] else "")
+              + (f", dropped {report['dropped']}" if report['dropped'] else ""))
@@ -0,0 +1,139 @@
+import json
+import math
+import os
+import re
+import threading
+import zlib
+from typing import Dict, List, Optional, Tuple
+from .config import Config
+
+CATEGORIES = ["STOCKS", "NEWS", "PRODUCT", "GENERAL"]
+DEFAULT_TRAINING_PATH = os.path.join(os.path.dirname(__file__), 'data', 'labelled_queries.jsonl')
+
+# Words that never change a query's category
+STOPWORDS = {
+    'a', 'an', 'the', 'of', 'for', 'to', 'in', 'on', 'at', 'by', 'with', 'and', 'or',
+    'is', 'are', 'was', 'be', 'please', 'me', 'my', 'i', 'can', 'you', 'your', 'about'
+}
+
+def normalize_query(query: str) -> str:
+    """Case-fold, drop surrounding punctuation and stopwords, and collapse whitespace"""
+    words = [word.strip('?!.,;:"\'()') for word in query.casefold().split()]
+    words = [word for word in words if word]
+    kept = [word for word in words if word not in STOPWORDS]
+    return ' '.join(kept or words)
+
+# Softmax temperatures tried when calibrating on held-out predictions
+CALIBRATION_TEMPERATURES = [1, 1.5, 2, 3, 4, 6, 8, 12, 16, 24, 32]
+
+def softmax(scores: Dict[str, float], temperature: float = 1.0) -> Dict[str, float]:
+    best = max(scores.values())
+    exps = {category: math.exp((score - best) / temperature) for category, score in scores.items()}
+    norm = sum(exps.values())
+    return {category: value / norm for category, value in exps.items()}
+
+def load_labelled_queries(path: str = DEFAULT_TRAINING_PATH) -> List[Tuple[str, str]]:
+    """Read (query, category) pairs from a JSONL file of {"query", "category"} records"""
+    examples = []
+    with open(path, encoding='utf-8') as source:
+        for line in source:
+            if line.strip():
+                record = json.loads(line)
+                examples.append((record['query'], record['category'].upper()))
+    return examples
+
+class QueryClassifier:
+    """Multinomial naive Bayes over hashed word unigrams and bigrams
+    
+    Small and dependency-free: trains in milliseconds from the bundled labelled
+    queries and classifies in microseconds. predict() returns the category and
+    its posterior probability so callers can defer uncertain queries to the LLM.
+    Naive Bayes posteriors are overconfident, so calibrate() softens them with a
+    temperature fitted on held-out predictions.
+    """
+    
+    def __init__(self, n_features: int = 2 ** 18, alpha: float = 0.1, temperature: float = 1.0):
+        self.n_features = n_features
+        self.alpha = alpha
+        self.temperature = temperature
+        self.feature_counts: Dict[str, Dict[int, int]] = {category: {} for category in CATEGORIES}
+        self.total_counts = {category: 0 for category in CATEGORIES}
+        self.doc_counts = {category: 0 for category in CATEGORIES}
+        self.vocabulary = set()
+    
+    def features(self, text: str) -> List[int]:
+        words = re.findall(r"[a-z0-9]+", text.lower())
+        grams = words + [f"{first} {second}" for first, second in zip(words, words[1:])]
+        # crc32 rather than hash() so buckets are stable across processes
+        return [zlib.crc32(gram.encode('utf-8')) % self.n_features for gram in grams]
+    
+    def train(self, examples: List[Tuple[str, str]]) -> 'QueryClassifier':
+        for text, category in examples:
+            self.doc_counts[category] += 1
+            counts = self.feature_counts[category]
+            for feature in self.features(text):
+                counts[feature] = counts.get(feature, 0) + 1
+                self.total_counts[category] += 1
+                self.vocabulary.add(feature)
+        return self
+    
+    def calibrate(self, examples: List[Tuple[str, str]], folds: int = 5) -> 'QueryClassifier':
+        """Fit the softmax temperature that minimizes log loss on out-of-fold predictions of examples"""
+        held_out = []
+        for fold in range(folds):
+            model = QueryClassifier(self.n_features, self.alpha).train(
+                [example for i, example in enumerate(examples) if i % folds != fold])
+            held_out.extend((model.log_scores(text), category)
+                            for i, (text, category) in enumerate(examples) if i % folds == fold)
+        if not held_out:
+            return self
+        
+        def log_loss(temperature: float) -> float:
+            return -sum(math.log(max(softmax(scores, temperature)[category], 1e-12)) for scores, category in held_out)
+        
+        self.temperature = min(CALIBRATION_TEMPERATURES, key=log_loss)
+        return self
+    
+    def log_scores(self, text: str) -> Dict[str, float]:
+        """Unnormalized log posterior per category"""
+        total_docs = sum(self.doc_counts.values()) or 1
+        # Features never seen in training carry no evidence for any class
+        features = [feature for feature in self.features(text) if feature in self.vocabulary]
+        vocabulary_size = len(self.vocabulary) or 1
+        
+        scores = {}
+        for category in CATEGORIES:
+            score = math.log((self.doc_counts[category] + 1) / (total_docs + len(CATEGORIES)))
+            denominator = self.total_counts[category] + self.alpha * vocabulary_size
+            counts = self.feature_counts[category]
+            for feature in features:
+                score += math.log((counts.get(feature, 0) + self.alpha) / denominator)
+            scores[category] = score
+        return scores
+    
+    def predict_proba(self, text: str) -> Dict[str, float]:
+        """Calibrated posterior probability per category (the class prior if no feature is known)"""
+        return softmax(self.log_scores(text), self.temperature)
+    
+    def predict(self, text: str) -> Tuple[str, float]:
+        """Return (category, confidence)"""
+        probabilities = self.predict_proba(text)
+        category = max(probabilities, key=probabilities.get)
+        return category, probabilities[category]
+
+_default_classifier: Optional[QueryClassifier] = None
+_default_classifier_lock = threading.Lock()
+
+def get_query_classifier() -> Optional[QueryClassifier]:
+    """Return the process-wide classifier trained on the bundled data (None if unavailable)"""
+    global _default_classifier
+    with _default_classifier_lock:
+        if _default_classifier is None:
+            path = Config.get_local_classifier_data_path() or DEFAULT_TRAINING_PATH
+            try:
+                examples = load_labelled_queries(path)
+                _default_classifier = QueryClassifier().train(examples).calibrate(examples)
+            except (OSError, ValueError, KeyError) as e:
+                print(f"Local classifier unavailable ({e}); classification will use the LLM")
+                return None
+        return _default_classifier
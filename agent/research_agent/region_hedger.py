@@ -0,0 +1,181 @@
+import io
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Dict, List, Tuple
+from .llm_metrics import percentile
+from .config import Config
+
+class RegionStats:
+    """Recent latencies (per model and operation) and outcomes for one region"""
+    
+    def __init__(self, window: int = 200):
+        # Models, and full invoke_model answers vs stream set-up times, have very different scales
+        self.window = window
+        self.latencies: Dict[Tuple[str, str], deque] = {}
+        self.requests = 0
+        self.errors = 0
+        self.hedges_sent = 0
+        self.hedge_wins = 0
+    
+    def get_latencies(self, key: Tuple[str, str]) -> List[float]:
+        return list(self.latencies.get(key, ()))
+    
+    def record_latency(self, key: Tuple[str, str], seconds: float):
+        if key not in self.latencies:
+            self.latencies[key] = deque(maxlen=self.window)
+        self.latencies[key].append(seconds)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        stats = {
+            'requests': self.requests,
+            'errors': self.errors,
+            'hedges_sent': self.hedges_sent,
+            'hedge_wins': self.hedge_wins,
+            'latency': {}
+        }
+        for (model_id, operation), latencies in self.latencies.items():
+            stats['latency'].setdefault(model_id, {}).update({
+                f'{operation}_p50': round(percentile(list(latencies), 50), 3),
+                f'{operation}_p95': round(percentile(list(latencies), 95), 3)
+            })
+        return stats
+
+class HedgedBedrockClient:
+    """bedrock-runtime stand-in that spreads each request over several regional clients
+    
+    A request goes to the region with the best recent median latency. If it has
+    not answered within that region's hedge threshold (a high percentile of its
+    recent latencies), a duplicate goes to the next region and whichever answers
+    first wins; the slower response is discarded. Errors fail over immediately.
+    """
+    
+    def __init__(self, clients: Dict[str, Any], hedge_percentile: float = 95, default_delay: float = 2.0,
+                 min_delay: float = 0.2, min_samples: int = 10, max_workers: int = None):
+        self.clients = clients
+        self.hedge_percentile = hedge_percentile
+        self.default_delay = default_delay
+        self.min_delay = min_delay
+        self.min_samples = min_samples
+        self.stats = {region: RegionStats() for region in clients}
+        self._lock = threading.Lock()
+        # As many calls in flight as the regional connection pools allow, so requests do not queue here
+        max_workers = max_workers or Config.get_bedrock_max_pool_connections() * len(clients)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='bedrock-hedge')
+    
+    def hedge_delay(self, region: str, key: Tuple[str, str]) -> float:
+        """Seconds to wait on a region before sending a duplicate elsewhere, for one (model, operation)"""
+        with self._lock:
+            latencies = self.stats[region].get_latencies(key)
+        if len(latencies) < self.min_samples:
+            return self.default_delay
+        return max(self.min_delay, percentile(latencies, self.hedge_percentile))
+    
+    def ranked_regions(self, key: Tuple[str, str]) -> List[str]:
+        """Regions ordered by recent median latency for one (model, operation)
+        
+        Untried regions come after measured ones, in config order, so primary traffic
+        stays on a known region and an untried one is only reached by a hedge or failover.
+        """
+        with self._lock:
+            latencies = {region: stats.get_latencies(key) for region, stats in self.stats.items()}
+        order = list(self.clients)
+        return sorted(order, key=lambda region: (
+            not latencies[region],
+            percentile(latencies[region], 50) if latencies[region] else 0.0,
+            order.index(region)
+        ))
+    
+    def get_region_stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {region: stats.get_stats() for region, stats in self.stats.items()}
+    
+    def _timed_call(self, region: str, key: Tuple[str, str], call, hedge: bool, started: threading.Event):
+        started.set()
+        start = time.time()
+        with self._lock:
+            self.stats[region].requests += 1
+            if hedge:
+                self.stats[region].hedges_sent += 1
+        try:
+            result = call(self.clients[region])
+        except Exception:
+            with self._lock:
+                self.stats[region].errors += 1
+            raise
+        with self._lock:
+            self.stats[region].record_latency(key, time.time() - start)
+        return result
+    
+    def _hedged(self, model_id: str, operation: str, call, discard=None):
+        """Run call(client) with hedging across regions and return the first success"""
+        key = (model_id, operation)
+        regions = self.ranked_regions(key)
+        pending = {}
+        last_error = None
+        
+        started = threading.Event()
+        
+        def launch():
+            nonlocal started
+            region = regions.pop(0)
+            started = threading.Event()
+            future = self._executor.submit(self._timed_call, region, key, call, bool(pending), started)
+            pending[future] = region
+            return region
+        
+        primary = launch()
+        delay = self.hedge_delay(primary, key)
+        while pending:
+            # The hedge timer runs from when the latest call starts, not while it queues for a worker
+            started.wait()
+            done, _ = wait(list(pending), timeout=delay if regions else None, return_when=FIRST_COMPLETED)
+            if not done:
+                # Every request in flight is slower than usual: hedge to the next region and
+                # keep a finite wait so the remaining regions still get their turn
+                region = launch()
+                print(f"⚡ Bedrock hedge: {primary} slower than {delay:.2f}s, also trying {region}")
+                delay = self.hedge_delay(region, key)
+                continue
+            
+            failed = False
+            for future in done:
+                region = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    last_error = e
+                    failed = True
+                    continue
+                if region != primary:
+                    with self._lock:
+                        self.stats[region].hedge_wins += 1
+                # The losing request can't be cancelled mid-flight; drop its response when it lands
+                for loser in pending:
+                    if discard:
+                        loser.add_done_callback(lambda f: f.exception() is None and discard(f.result()))
+                return result
+            
+            if failed and regions:
+                # Fail over immediately instead of waiting for a hedge
+                region = launch()
+                if len(pending) == 1:
+                    primary = region
+                delay = self.hedge_delay(region, key)
+        
+        raise last_error
+    
+    def invoke_model(self, **kwargs) -> Dict[str, Any]:
+        def call(client):
+            response = client.invoke_model(**kwargs)
+            # Read the body inside the hedged call so latency covers the whole answer
+            return {**response, 'body': io.BytesIO(response['body'].read())}
+        return self._hedged(kwargs.get('modelId', ''), 'invoke', call)
+    
+    def invoke_model_with_response_stream(self, **kwargs) -> Dict[str, Any]:
+        def discard(response):
+            close = getattr(response.get('body'), 'close', None)
+            if close:
+                close()
+        return self._hedged(kwargs.get('modelId', ''), 'stream', lambda client: client.invoke_model_with_response_stream(**kwargs), discard)
@@ -0,0 +1,49 @@
+from typing import Any, Dict, Iterable, Optional
+
+class ReportEvent:
+    """One typed section of an agent's report, emitted as soon as it is ready"""
+    
+    HEADER = 'header'                            # report title and query
+    SOURCES = 'sources'                          # header and data-source summary
+    STOCK_TABLES = 'stock_tables'                # real-time quote tables and market indices
+    MARKET_ANALYSIS = 'market_analysis'
+    PURCHASE_ASSESSMENT = 'purchase_assessment'
+    ANALYSIS = 'analysis'                        # single analysis section (stock reports)
+    ANSWER = 'answer'                            # follow-up answer
+    FOOTER = 'footer'
+    REPORT = 'report'                            # a whole report from an agent without sections
+    SECTION_START = 'section_start'              # heading of a section whose text is streamed next
+    TOKEN = 'token'                              # streamed LLM text of the section that last started
+    
+    def __init__(self, kind: str, text: str, data: Optional[Dict[str, Any]] = None, streamed: bool = False):
+        self.kind = kind
+        self.text = text
+        self.data = data or {}
+        self.streamed = streamed  # the text already went out as a section start plus streamed tokens
+        self.elapsed: Optional[float] = None  # seconds since the query started, set by the orchestrator
+    
+    @classmethod
+    def section_start(cls, section: str, heading: str) -> 'ReportEvent':
+        return cls(cls.SECTION_START, heading, {'section': section})
+    
+    @property
+    def is_section(self) -> bool:
+        """True for report content, False for stream markers"""
+        return self.kind not in (self.SECTION_START, self.TOKEN)
+    
+    @property
+    def stream_text(self) -> str:
+        """Text to print for this event in a live stream of the report"""
+        if self.kind == self.TOKEN:
+            return self.text
+        if self.streamed:
+            return "\n"  # heading and tokens already went out
+        return f"\n{self.text}\n"
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {'kind': self.kind, 'text': self.text, 'data': self.data, 'streamed': self.streamed,
+                'elapsed_seconds': self.elapsed}
+
+def render_report(events: Iterable[ReportEvent]) -> str:
+    """Join report sections into the full report text"""
+    return "\n\n".join(event.text for event in events if event.is_section).strip()
@@ -1,8 +1,11 @@
 import requests
 from bs4 import BeautifulSoup
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import time
 import random
+from .config import Config
+from .single_flight import get_single_flight
+from .deadline import Deadline, expired, remaining_timeout
 
 class ScraperService:
     def __init__(self):
@@ -16,18 +19,28 @@ class ScraperService:
         self.session = requests.Session()
         self.session.headers.update(self.headers)
     
-    def scrape_content(self, urls: List[str], max_content_length: int = 1000) -> List[Dict[str, Any]]:
-        """Scrape content from multiple URLs with enhanced fallback"""
+    def scrape_content(self, urls: List[str], max_content_length: int = 1000,
+                       deadline: Optional[Deadline] = None) -> List[Dict[str, Any]]:
+        """Scrape content from multiple URLs with enhanced fallback
+        
+        With a deadline, request timeouts shrink to the remaining budget and URLs not
+        reached before it expires are left out.
+        """
         scraped_data = []
         
         for url in urls[:5]:  # Process up to 5 URLs
+            if expired(deadline):
+                print(f"⏱️  Time budget used up, skipping {url}")
+                continue
             try:
-                content = self._scrape_single_url(url, max_content_length)
+                content = self._scrape_coalesced(url, max_content_length, remaining_timeout(deadline, 15))
                 if content:
                     scraped_data.append(content)
                 
                 # Add delay to be respectful
-                time.sleep(random.uniform(0.5, 1.5))
+                delay = random.uniform(0.5, 1.5)
+                if deadline is None or deadline.remaining() > delay:
+                    time.sleep(delay)
                 
             except Exception as e:
                 print(f"Failed to scrape {url}: {e}")
@@ -42,11 +55,20 @@ class ScraperService:
         
         return scraped_data
     
-    def _scrape_single_url(self, url: str, max_length: int) -> Dict[str, Any]:
+    def _scrape_coalesced(self, url: str, max_length: int, timeout: float = 15) -> Dict[str, Any]:
+        """Scrape a URL, sharing the fetch with any agent already scraping it"""
+        if not Config.get_request_coalescing_enabled():
+            return self._scrape_single_url(url, max_length, timeout)
+        content = get_single_flight('scrape').do(
+            (url, max_length), lambda: self._scrape_single_url(url, max_length, timeout)
+        )
+        return dict(content) if content else content
+    
+    def _scrape_single_url(self, url: str, max_length: int, timeout: float = 15) -> Dict[str, Any]:
         """Scrape content from a single URL with better encoding handling"""
         try:
             print(f"Scraping: {url}")
-            response = self.session.get(url, timeout=15)
+            response = self.session.get(url, timeout=timeout)
             response.raise_for_status()
             
             # Handle encoding issues
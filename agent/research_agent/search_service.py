@@ -1,17 +1,34 @@
-import requests
 import urllib.parse
 import os
 from typing import Dict, List, Any
-from .enhanced_search_service import EnhancedSearchService
+from .config import Config
+from .single_flight import get_single_flight
 
 class SearchService:
     def __init__(self, google_cse_id: str):
         self.google_cse_id = google_cse_id
         self.google_api_key = os.getenv('GOOGLE_API_KEY')
         self.base_url = "https://www.googleapis.com/customsearch/v1"
-        self.enhanced_search = EnhancedSearchService()
+        self._enhanced_search = None
     
-    def search_products(self, query: str, num_results: int = 5) -> List[Dict[str, Any]]:
+    @property
+    def enhanced_search(self):
+        """Multi-source scraping search (requests + bs4), built on first use"""
+        if self._enhanced_search is None:
+            from .enhanced_search_service import EnhancedSearchService
+            self._enhanced_search = EnhancedSearchService()
+        return self._enhanced_search
+    
+    def search_products(self, query: str, num_results: int = 5, timeout: float = 10) -> List[Dict[str, Any]]:
+        """Search for product information, sharing an identical search already in flight"""
+        if not Config.get_request_coalescing_enabled():
+            return self._search_products(query, num_results, timeout)
+        results = get_single_flight('search').do(
+            (query.strip().lower(), num_results), lambda: self._search_products(query, num_results, timeout)
+        )
+        return [dict(result) for result in results]
+    
+    def _search_products(self, query: str, num_results: int = 5, timeout: float = 10) -> List[Dict[str, Any]]:
         """Search for product information using Google Custom Search"""
         try:
             print(f"Searching products for: {query}")
@@ -34,7 +51,8 @@ class SearchService:
                 'num': min(num_results, 10)
             }
             
-            response = requests.get(self.base_url, params=params, timeout=10)
+            import requests
+            response = requests.get(self.base_url, params=params, timeout=timeout)
             response.raise_for_status()
             data = response.json()
             
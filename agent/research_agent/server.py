@@ -0,0 +1,370 @@
+import asyncio
+import json
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+from .memory_service import MemoryService
+from .config import Config
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+class Session:
+    """One client's conversation memory; its lock keeps that client's requests in order"""
+    
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+        self.memory = MemoryService()
+        self.lock = asyncio.Lock()
+        self.last_used = time.time()
+
+class SessionStore:
+    """Sessions by ID, expired after ttl seconds idle and capped at max_sessions (LRU)"""
+    
+    def __init__(self, ttl: float = 3600, max_sessions: int = 1000):
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self._sessions: 'OrderedDict[str, Session]' = OrderedDict()
+    
+    def get(self, session_id: str) -> Optional[Session]:
+        self._expire()
+        session = self._sessions.get(session_id)
+        if session:
+            session.last_used = time.time()
+            self._sessions.move_to_end(session_id)
+        return session
+    
+    def get_or_create(self, session_id: str = None) -> Session:
+        session = self.get(session_id) if session_id else None
+        if session is None:
+            session = Session(session_id or uuid.uuid4().hex)
+            self._sessions[session.session_id] = session
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+        return session
+    
+    def remove(self, session_id: str) -> Optional[Session]:
+        return self._sessions.pop(session_id, None)
+    
+    def _expire(self):
+        cutoff = time.time() - self.ttl
+        while self._sessions:
+            session = next(iter(self._sessions.values()))
+            if session.last_used >= cutoff:
+                break
+            self._sessions.popitem(last=False)
+    
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+class ResearchServer:
+    """asyncio HTTP/1.1 JSON API in front of one shared AIOrchestrator
+    
+    POST /research   {"query", "session_id"?, "deadline_seconds"?}
+                                                research, or a follow-up if the session has one
+    POST /research/stream                       same, as NDJSON report sections as they complete
+    POST /followup   {"question", "session_id"} answer from the session's research only
+    POST /reset      {"session_id"}            drop the session's research and conversation
+    GET  /health                                sessions, in-flight work, pool and cache stats
+    
+    Each session ID gets its own MemoryService; agent work runs on a bounded thread
+    pool and requests beyond max_pending in flight are refused with 503, so the
+    warm clients, caches and agent pools are shared by every client.
+    """
+    
+    def __init__(self, orchestrator, max_workers: int = None, max_pending: int = None,
+                 session_ttl: float = None, max_sessions: int = None, max_body_bytes: int = None):
+        self.orchestrator = orchestrator
+        self.max_workers = max_workers or Config.get_server_max_workers()
+        self.max_pending = max_pending or Config.get_server_max_pending()
+        self.max_body_bytes = max_body_bytes or Config.get_server_max_body_bytes()
+        self.sessions = SessionStore(
+            ttl=session_ttl or Config.get_server_session_ttl(),
+            max_sessions=max_sessions or Config.get_server_max_sessions()
+        )
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='research')
+        self.in_flight = 0
+        self.stats = {'requests': 0, 'rejected': 0, 'errors': 0}
+        self.routes = {
+            ('POST', '/research'): self._research,
+            ('POST', '/followup'): self._followup,
+            ('POST', '/reset'): self._reset,
+            ('GET', '/health'): self._health,
+        }
+        # Handlers that yield items, each sent as one NDJSON line of a chunked response
+        self.stream_routes = {
+            ('POST', '/research/stream'): self._research_stream,
+        }
+    
+    async def _run_blocking(self, function, *args) -> Any:
+        """Run agent work on the bounded executor, refusing work past max_pending"""
+        if self.in_flight >= self.max_pending:
+            self.stats['rejected'] += 1
+            raise HTTPError(503, f"Server busy ({self.in_flight} requests in flight)")
+        self.in_flight += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, function, *args)
+        finally:
+            self.in_flight -= 1
+    
+    def _timed(self, function, *args) -> Dict[str, Any]:
+        """Run on a worker thread: the answer plus the LLM metrics collected on that thread"""
+        start = time.time()
+        result = function(*args)
+        return {
+            'result': result,
+            'elapsed_seconds': round(time.time() - start, 3),
+            'llm': self.orchestrator.get_last_query_metrics(),
+            'stages': self.orchestrator.get_last_stage_timings(),
+            'first_section_seconds': self.orchestrator.last_first_section_seconds
+        }
+    
+    @staticmethod
+    def _required(payload: Dict[str, Any], field: str) -> str:
+        value = payload.get(field)
+        if not isinstance(value, str) or not value.strip():
+            raise HTTPError(400, f"'{field}' must be a non-empty string")
+        return value.strip()
+    
+    @staticmethod
+    def _deadline(payload: Dict[str, Any]) -> Optional[float]:
+        deadline = payload.get('deadline_seconds')
+        if deadline is not None and (isinstance(deadline, bool) or not isinstance(deadline, (int, float))
+                                     or deadline <= 0):
+            raise HTTPError(400, "'deadline_seconds' must be a positive number")
+        return deadline
+    
+    async def _research(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        query = self._required(payload, 'query')
+        deadline = self._deadline(payload)
+        session = self.sessions.get_or_create(payload.get('session_id'))
+        async with session.lock:
+            response = await self._run_blocking(
+                self._timed, lambda: self.orchestrator.analyze_query(query, memory=session.memory, deadline=deadline)
+            )
+        response.update({'session_id': session.session_id, 'session': session.memory.get_session_info()})
+        return response
+    
+    async def _research_stream(self, payload: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """Research, yielding {"event": ...} per report section, then a final {"done": true, ...}"""
+        query = self._required(payload, 'query')
+        deadline = self._deadline(payload)
+        session = self.sessions.get_or_create(payload.get('session_id'))
+        loop = asyncio.get_running_loop()
+        events: asyncio.Queue = asyncio.Queue()
+        
+        def on_event(event):
+            # Called on the worker thread as each section completes
+            loop.call_soon_threadsafe(events.put_nowait, event.to_dict())
+        
+        async with session.lock:
+            work = asyncio.ensure_future(self._run_blocking(
+                self._timed, lambda: self.orchestrator.analyze_query(
+                    query, memory=session.memory, deadline=deadline, on_event=on_event
+                )
+            ))
+            while not work.done() or not events.empty():
+                next_event = asyncio.ensure_future(events.get())
+                await asyncio.wait({next_event, work}, return_when=asyncio.FIRST_COMPLETED)
+                if next_event.done():
+                    yield {'session_id': session.session_id, 'event': next_event.result()}
+                else:
+                    next_event.cancel()
+            response = work.result()
+        # The sections were already sent; the final line carries the metrics
+        response.pop('result', None)
+        response.update({'session_id': session.session_id, 'session': session.memory.get_session_info(),
+                         'done': True})
+        yield response
+    
+    async def _followup(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        question = self._required(payload, 'question')
+        deadline = self._deadline(payload)
+        session = self.sessions.get(self._required(payload, 'session_id'))
+        if session is None:
+            raise HTTPError(404, "Unknown or expired session")
+        async with session.lock:
+            if not session.memory.has_active_session():
+                raise HTTPError(409, "Session has no research to follow up on; POST /research first")
+            response = await self._run_blocking(
+                self._timed, lambda: self.orchestrator.answer_followup(question, memory=session.memory, deadline=deadline)
+            )
+        response.update({'session_id': session.session_id, 'session': session.memory.get_session_info()})
+        return response
+    
+    async def _reset(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        session_id = self._required(payload, 'session_id')
+        session = self.sessions.remove(session_id)
+        if session is None:
+            raise HTTPError(404, "Unknown or expired session")
+        async with session.lock:
+            session.memory.clear_session()
+        return {'session_id': session_id, 'reset': True}
+    
+    async def _health(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            'status': 'ok',
+            'sessions': len(self.sessions),
+            'in_flight': self.in_flight,
+            'max_workers': self.max_workers,
+            'max_pending': self.max_pending,
+            'requests': dict(self.stats),
+            'agent_pools': self.orchestrator.get_agent_pool_stats(),
+            'coalescing': self.orchestrator.get_coalescing_stats(),
+            'report_stream': self.orchestrator.get_report_stream_stats(),
+            'classification': self.orchestrator.get_classification_stats(),
+            'llm_cache': self.orchestrator.llm_service.get_cache_stats()
+        }
+    
+    @staticmethod
+    def _parse_payload(body: bytes) -> Dict[str, Any]:
+        payload = json.loads(body) if body else {}
+        if not isinstance(payload, dict):
+            raise HTTPError(400, "Request body must be a JSON object")
+        return payload
+    
+    async def _dispatch(self, method: str, path: str, body: bytes) -> Tuple[int, Dict[str, Any]]:
+        handler = self.routes.get((method, path))
+        if handler is None:
+            if any(route_path == path for _, route_path in list(self.routes) + list(self.stream_routes)):
+                return 405, {'error': f"{method} not allowed on {path}"}
+            return 404, {'error': f"No route for {path}"}
+        try:
+            return 200, await handler(self._parse_payload(body))
+        except json.JSONDecodeError as e:
+            return 400, {'error': f"Invalid JSON: {e}"}
+        except HTTPError as e:
+            return e.status, {'error': e.message}
+        except Exception as e:
+            self.stats['errors'] += 1
+            print(f"Error handling {method} {path}: {e}")
+            return 500, {'error': str(e)}
+    
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve requests on one connection until the client closes it (keep-alive supported)"""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                try:
+                    method, target, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    await self._write_response(writer, 400, {'error': 'Malformed request line'}, False)
+                    break
+                
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                
+                keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+                length = int(headers.get('content-length') or 0)
+                if length > self.max_body_bytes:
+                    await self._write_response(writer, 413, {'error': 'Request body too large'}, False)
+                    break
+                body = await reader.readexactly(length) if length else b''
+                
+                self.stats['requests'] += 1
+                path = urlsplit(target).path
+                stream_handler = self.stream_routes.get((method.upper(), path))
+                if stream_handler:
+                    await self._stream(stream_handler, body, writer, keep_alive)
+                else:
+                    status, payload = await self._dispatch(method.upper(), path, body)
+                    await self._write_response(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+    
+    async def _stream(self, handler, body: bytes, writer: asyncio.StreamWriter, keep_alive: bool):
+        """Send each item a streaming handler yields as one NDJSON line of a chunked response
+        
+        Errors raised before the first item get a normal JSON error response; later ones
+        end the stream with an {"error": ...} line.
+        """
+        items = None
+        try:
+            items = handler(self._parse_payload(body))
+            first = await items.__anext__()
+        except json.JSONDecodeError as e:
+            await self._write_response(writer, 400, {'error': f"Invalid JSON: {e}"}, keep_alive)
+            return
+        except HTTPError as e:
+            await self._write_response(writer, e.status, {'error': e.message}, keep_alive)
+            return
+        except StopAsyncIteration:
+            first = None
+        except Exception as e:
+            self.stats['errors'] += 1
+            print(f"Error handling stream: {e}")
+            await self._write_response(writer, 500, {'error': str(e)}, keep_alive)
+            return
+        
+        writer.write((f"HTTP/1.1 200 OK\r\n"
+                      f"Content-Type: application/x-ndjson\r\n"
+                      f"Transfer-Encoding: chunked\r\n"
+                      f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n").encode('latin-1'))
+        try:
+            if first is not None:
+                await self._write_chunk(writer, first)
+                async for item in items:
+                    await self._write_chunk(writer, item)
+        except HTTPError as e:
+            await self._write_chunk(writer, {'error': e.message, 'status': e.status})
+        except Exception as e:
+            self.stats['errors'] += 1
+            print(f"Error handling stream: {e}")
+            await self._write_chunk(writer, {'error': str(e), 'status': 500})
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+    
+    @staticmethod
+    async def _write_chunk(writer: asyncio.StreamWriter, item: Dict[str, Any]):
+        line = json.dumps(item, default=str).encode('utf-8') + b"\n"
+        writer.write(f"{len(line):x}\r\n".encode('latin-1') + line + b"\r\n")
+        await writer.drain()
+    
+    @staticmethod
+    async def _write_response(writer: asyncio.StreamWriter, status: int, payload: Dict[str, Any], keep_alive: bool):
+        reasons = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed', 409: 'Conflict',
+                   413: 'Payload Too Large', 500: 'Internal Server Error', 503: 'Service Unavailable'}
+        body = json.dumps(payload, default=str).encode('utf-8')
+        head = (f"HTTP/1.1 {status} {reasons.get(status, 'Error')}\r\n"
+                f"Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode('latin-1') + body)
+        await writer.drain()
+    
+    async def serve(self, host: str, port: int):
+        server = await asyncio.start_server(self._handle_connection, host, port)
+        print(f"🌐 Research API listening on http://{host}:{port} "
+              f"({self.max_workers} workers, {self.max_pending} max in flight)")
+        async with server:
+            await server.serve_forever()
+    
+    def run(self, host: str = None, port: int = None):
+        """Serve until interrupted"""
+        try:
+            asyncio.run(self.serve(host or Config.get_server_host(), port or Config.get_server_port()))
+        except KeyboardInterrupt:
+            print("\nServer stopped")
+        finally:
+            self.executor.shutdown(wait=False)
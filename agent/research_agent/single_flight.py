@@ -0,0 +1,68 @@
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable
+
+class SingleFlight:
+    """Coalesces concurrent calls for the same key into one execution
+    
+    The first caller for a key runs the function; callers arriving while it is in
+    flight wait for it and receive the same result (or exception). Nothing is
+    cached: once the call finishes, the next caller for the key runs it again.
+    Callers share the result object, so copy it before mutating.
+    """
+    
+    def __init__(self, name: str):
+        self.name = name
+        self._in_flight: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self.stats = {'calls': 0, 'executions': 0, 'coalesced': 0, 'errors': 0}
+    
+    def do(self, key: Hashable, function: Callable[[], Any]) -> Any:
+        """Run function for key, or wait for the identical call already in flight"""
+        with self._lock:
+            self.stats['calls'] += 1
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = self._in_flight[key] = Future()
+                self.stats['executions'] += 1
+            else:
+                self.stats['coalesced'] += 1
+        
+        if not leader:
+            return future.result()
+        
+        try:
+            result = function()
+        except BaseException as e:
+            with self._lock:
+                self.stats['errors'] += 1
+                del self._in_flight[key]
+            future.set_exception(e)
+            raise
+        with self._lock:
+            del self._in_flight[key]
+        future.set_result(result)
+        return result
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+            stats['in_flight'] = len(self._in_flight)
+        return stats
+
+_flights: Dict[str, SingleFlight] = {}
+_flights_lock = threading.Lock()
+
+def get_single_flight(name: str) -> SingleFlight:
+    """Return the process-wide coalescing group for name (e.g. 'research', 'scrape')"""
+    with _flights_lock:
+        if name not in _flights:
+            _flights[name] = SingleFlight(name)
+        return _flights[name]
+
+def get_single_flight_stats() -> Dict[str, Dict[str, Any]]:
+    """Coalescing counters for every group"""
+    with _flights_lock:
+        flights = dict(_flights)
+    return {name: flight.get_stats() for name, flight in flights.items()}
@@ -0,0 +1,130 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Sequence
+
+class Stage:
+    def __init__(self, name: str, function: Callable[[Dict[str, Any]], Any], depends: Sequence[str] = ()):
+        self.name = name
+        self.function = function  # called with {dependency name: its result}
+        self.depends = tuple(depends)
+
+class StageRun:
+    """Results, status and timing of every stage of one graph run"""
+    
+    def __init__(self, stage_names: List[str]):
+        self.results: Dict[str, Any] = {}
+        self.errors: Dict[str, str] = {}
+        self.timings: Dict[str, Dict[str, Any]] = {name: {'status': 'pending'} for name in stage_names}
+        self.started_at = time.time()
+        self.seconds = 0.0
+    
+    def status(self, name: str) -> str:
+        return self.timings[name]['status']
+    
+    def ok(self, name: str) -> bool:
+        return name in self.timings and self.status(name) == 'done'
+    
+    def get(self, name: str, default: Any = None) -> Any:
+        """A stage's result, or default if it failed, was skipped or was never declared"""
+        return self.results[name] if self.ok(name) else default
+    
+    def summary(self) -> str:
+        parts = []
+        for name, timing in self.timings.items():
+            if timing['status'] == 'done':
+                parts.append(f"{name} {timing['seconds']:.1f}s")
+            else:
+                parts.append(f"{name} {timing['status']}")
+        return f"{' | '.join(parts)} (wall {self.seconds:.1f}s)"
+
+class StageGraph:
+    """Small dependency graph of named stages run on a thread pool
+    
+    A stage starts as soon as every stage it depends on has finished, so independent
+    branches overlap. A failed stage's dependents are skipped rather than run on
+    missing input. Per-stage start offset, duration and status are recorded.
+    """
+    
+    def __init__(self, name: str = 'stages', max_workers: int = 4):
+        self.name = name
+        self.max_workers = max_workers
+        self.stages: Dict[str, Stage] = {}
+    
+    def add(self, name: str, function: Callable[[Dict[str, Any]], Any], depends: Sequence[str] = ()) -> 'StageGraph':
+        """Declare a stage; dependencies must already be declared, which keeps the graph acyclic"""
+        if name in self.stages:
+            raise ValueError(f"Stage '{name}' already declared")
+        missing = [dependency for dependency in depends if dependency not in self.stages]
+        if missing:
+            raise ValueError(f"Stage '{name}' depends on undeclared stages: {', '.join(missing)}")
+        self.stages[name] = Stage(name, function, depends)
+        return self
+    
+    def _run_stage(self, stage: Stage, inputs: Dict[str, Any], run: StageRun) -> Any:
+        start = time.time()
+        timing = run.timings[stage.name]
+        timing.update({'status': 'running', 'start': round(start - run.started_at, 3)})
+        try:
+            return stage.function(inputs)
+        finally:
+            # A stage abandoned at the timeout keeps its cut-off duration
+            if timing['status'] == 'running':
+                timing['seconds'] = round(time.time() - start, 3)
+    
+    def run(self, timeout: float = None) -> StageRun:
+        """Run every stage; with a timeout, stages still running then are abandoned as 'timed_out'
+        
+        Threads can't be interrupted, so an abandoned stage keeps running in the background
+        and its result is discarded; stages that never started are 'skipped'.
+        """
+        run = StageRun(list(self.stages))
+        deadline = run.started_at + timeout if timeout is not None else None
+        pending = dict(self.stages)
+        running = {}
+        workers = max(1, min(self.max_workers, len(self.stages)))
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=self.name)
+        try:
+            while pending or running:
+                for name, stage in list(pending.items()):
+                    statuses = [run.status(dependency) for dependency in stage.depends]
+                    if any(status in ('failed', 'skipped', 'timed_out') for status in statuses):
+                        del pending[name]
+                        run.timings[name]['status'] = 'skipped'
+                    elif all(status == 'done' for status in statuses):
+                        del pending[name]
+                        inputs = {dependency: run.results[dependency] for dependency in stage.depends}
+                        running[executor.submit(self._run_stage, stage, inputs, run)] = name
+                if not running:
+                    continue
+                remaining = max(0.0, deadline - time.time()) if deadline is not None else None
+                done, _ = wait(running, timeout=remaining, return_when=FIRST_COMPLETED)
+                if not done:
+                    self._abandon(running, pending, run)
+                    break
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        run.results[name] = future.result()
+                        run.timings[name]['status'] = 'done'
+                    except Exception as e:
+                        run.errors[name] = str(e)
+                        run.timings[name]['status'] = 'failed'
+                        print(f"Stage {name} failed: {e}")
+        finally:
+            executor.shutdown(wait=not running)
+        run.seconds = round(time.time() - run.started_at, 3)
+        return run
+    
+    def _abandon(self, running: Dict[Any, str], pending: Dict[str, Stage], run: StageRun):
+        """Give up on unfinished stages once the timeout has passed"""
+        for future, name in running.items():
+            timing = run.timings[name]
+            if future.cancel() or timing['status'] == 'pending':
+                timing['status'] = 'skipped'
+            else:
+                timing['status'] = 'timed_out'
+                timing['seconds'] = round(time.time() - run.started_at - timing['start'], 3)
+                print(f"Stage {name} timed out after {timing['seconds']:.1f}s")
+        for name in pending:
+            run.timings[name]['status'] = 'skipped'
+        pending.clear()
@@ -1,20 +1,29 @@
-import yfinance as yf
-from typing import Dict, Any, List
-import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Dict, Any, List, Optional
+from .keyword_matcher import get_matcher
+from .deadline import Deadline, expired, remaining_timeout
 
 class StockService:
     def __init__(self):
-        pass
+        # Ticker.info has no request timeout, so it runs here and is abandoned when late
+        self._info_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='stock-info')
     
-    def get_stock_data(self, symbol: str) -> Dict[str, Any]:
-        """Get real-time stock data for a symbol"""
+    def get_stock_data(self, symbol: str, timeout: float = 10) -> Dict[str, Any]:
+        """Get real-time stock data for a symbol (timeout bounds each of the history and info requests)"""
         try:
+            # yfinance (and pandas under it) is imported on the first quote, not at startup
+            import yfinance as yf
             stock = yf.Ticker(symbol)
-            info = stock.info
-            hist = stock.history(period="5d")
+            hist = stock.history(period="5d", timeout=timeout)
             
             if hist.empty:
                 return None
+            try:
+                info = self._info_executor.submit(lambda: stock.info).result(timeout=timeout)
+            except FutureTimeout:
+                # Prices come from the history; only the name and key metrics are left out
+                print(f"⏱️  Company info for {symbol} timed out after {timeout:.1f}s")
+                info = {}
             
             # Current day data
             current_price = hist['Close'].iloc[-1]
@@ -64,36 +73,17 @@ class StockService:
             return None
     
     def search_stock_symbol(self, query: str) -> List[str]:
-        """Search for stock symbols based on company name"""
-        # Common stock symbols mapping
-        common_stocks = {
-            'apple': 'AAPL', 'microsoft': 'MSFT', 'google': 'GOOGL', 'alphabet': 'GOOGL',
-            'amazon': 'AMZN', 'tesla': 'TSLA', 'meta': 'META', 'facebook': 'META',
-            'netflix': 'NFLX', 'nvidia': 'NVDA', 'intel': 'INTC', 'amd': 'AMD',
-            'reliance': 'RELIANCE.NS', 'tcs': 'TCS.NS', 'infosys': 'INFY.NS',
-            'hdfc': 'HDFCBANK.NS', 'icici': 'ICICIBANK.NS', 'sbi': 'SBIN.NS'
-        }
-        
-        query_lower = query.lower()
+        """Search for stock symbols based on company name or ticker"""
+        # Company names and tickers map to symbols in data/keywords.json
         symbols = []
-        
-        # Direct symbol match
-        if query.upper() in ['AAPL', 'MSFT', 'GOOGL', 'AMZN', 'TSLA', 'META', 'NFLX', 'NVDA']:
-            symbols.append(query.upper())
-        
-        # Check if query contains stock symbol
-        if 'nvda' in query_lower or 'nvidia' in query_lower:
-            symbols.append('NVDA')
-        
-        # Company name match
-        for company, symbol in common_stocks.items():
-            if company in query_lower:
+        for _, symbol in get_matcher('stock_symbols').match(query):
+            if symbol not in symbols:
                 symbols.append(symbol)
         
         return symbols[:3]  # Return top 3 matches
     
-    def get_market_summary(self) -> Dict[str, Any]:
-        """Get major market indices"""
+    def get_market_summary(self, deadline: Optional[Deadline] = None) -> Dict[str, Any]:
+        """Get major market indices, leaving out those not fetched before deadline"""
         try:
             indices = {
                 'S&P 500': '^GSPC',
@@ -104,7 +94,10 @@ class StockService:
             
             summary = {}
             for name, symbol in indices.items():
-                data = self.get_stock_data(symbol)
+                if expired(deadline):
+                    print(f"⏱️  Time budget used up, skipping remaining market indices")
+                    break
+                data = self.get_stock_data(symbol, timeout=remaining_timeout(deadline, 10))
                 if data:
                     summary[name] = {
                         'price': data['current_price'],
@@ -0,0 +1,80 @@
+import io
+import json
+import re
+import threading
+import time
+from typing import Any, Dict, List
+
+class StubBedrockClient:
+    """Local stand-in for the bedrock-runtime client (no network, canned answers)
+    
+    Classification prompts get a keyword-based category so the orchestrator routes
+    normally; everything else gets a short deterministic analysis. Enable it with
+    BEDROCK_BACKEND=stub or pass an instance to LLMService(bedrock_client=...).
+    """
+    
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.calls: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+    
+    def _prompt_text(self, body: Dict[str, Any]) -> str:
+        content = body['messages'][0]['content']
+        if isinstance(content, list):
+            return "\n".join(block.get('text', '') for block in content)
+        return content
+    
+    def _answer(self, model_id: str, body: Dict[str, Any]) -> str:
+        prompt = self._prompt_text(body)
+        with self._lock:
+            self.calls.append({'model_id': model_id, 'prompt': prompt})
+        if self.latency:
+            time.sleep(self.latency)
+        
+        # Micro-batched prompts: answer every packed request as a JSON object
+        requests = re.findall(r'<request id="(\d+)">\n(.*?)\n</request>', prompt, re.DOTALL)
+        if requests:
+            return json.dumps({request_id: self._canned(model_id, text) for request_id, text in requests})
+        return self._canned(model_id, prompt)
+    
+    def _canned(self, model_id: str, prompt: str) -> str:
+        if "Respond with only: STOCKS, NEWS, PRODUCT, or GENERAL" in prompt:
+            # Match on the quoted query only; the category descriptions mention every keyword
+            match = re.search(r'Query: "(.*)"', prompt)
+            query = (match.group(1) if match else prompt).lower()
+            if any(word in query for word in ["stock", "share", "trading", "nasdaq"]):
+                return "STOCKS"
+            if any(word in query for word in ["news", "breaking"]):
+                return "NEWS"
+            if any(word in query for word in ["review", "phone", "laptop", "buy", "price"]):
+                return "PRODUCT"
+            return "GENERAL"
+        return f"[stub analysis from {model_id}] {len(prompt)} prompt characters received."
+    
+    def _usage(self, body: Dict[str, Any], text: str) -> Dict[str, int]:
+        return {'input_tokens': len(self._prompt_text(body)) // 4, 'output_tokens': len(text) // 4}
+    
+    def invoke_model(self, body: str, modelId: str, **kwargs) -> Dict[str, Any]:
+        request = json.loads(body)
+        text = self._answer(modelId, request)
+        payload = {'content': [{'type': 'text', 'text': text}], 'usage': self._usage(request, text)}
+        return {'body': io.BytesIO(json.dumps(payload).encode('utf-8'))}
+    
+    def invoke_model_with_response_stream(self, body: str, modelId: str, **kwargs) -> Dict[str, Any]:
+        request = json.loads(body)
+        text = self._answer(modelId, request)
+        usage = self._usage(request, text)
+        
+        def events():
+            yield {'chunk': {'bytes': json.dumps({
+                'type': 'message_start', 'message': {'usage': {'input_tokens': usage['input_tokens']}}
+            }).encode('utf-8')}}
+            for word in text.split(' '):
+                yield {'chunk': {'bytes': json.dumps({
+                    'type': 'content_block_delta', 'delta': {'type': 'text_delta', 'text': word + ' '}
+                }).encode('utf-8')}}
+            yield {'chunk': {'bytes': json.dumps({
+                'type': 'message_delta', 'usage': {'output_tokens': usage['output_tokens']}
+            }).encode('utf-8')}}
+        
+        return {'body': events()}
@@ -0,0 +1,48 @@
+from typing import Any, Dict, List, Optional
+from .config import Config
+
+# Default Bedrock model per tier (LLM_MODEL_SMALL / LLM_MODEL_LARGE override)
+MODEL_TIERS = {
+    'small': 'anthropic.claude-3-haiku-20240307-v1:0',
+    'large': 'anthropic.claude-3-5-sonnet-20240620-v1:0'
+}
+
+class TaskProfile:
+    """Model tier and generation parameters for one kind of LLM call"""
+    
+    def __init__(self, name: str, tier: str, max_tokens: int, temperature: Optional[float] = None,
+                 stop_sequences: List[str] = None):
+        self.name = name
+        self.tier = tier
+        self.max_tokens = max_tokens
+        self.temperature = temperature
+        self.stop_sequences = stop_sequences or []
+    
+    @property
+    def model_id(self) -> str:
+        return Config.get_llm_tier_model(self.tier, MODEL_TIERS[self.tier])
+    
+    def generation_params(self, max_tokens: int = None) -> Dict[str, Any]:
+        """Request parameters for this profile; max_tokens overrides the profile's own"""
+        params = {
+            "anthropic_version": "bedrock-2023-05-31",
+            "max_tokens": max_tokens or self.max_tokens
+        }
+        if self.temperature is not None:
+            params["temperature"] = self.temperature
+        if self.stop_sequences:
+            params["stop_sequences"] = list(self.stop_sequences)
+        return params
+
+TASK_PROFILES = {
+    # One-word category answer: smallest model, a handful of tokens, stop at the first line
+    'classify': TaskProfile('classify', 'small', max_tokens=10, temperature=0.0, stop_sequences=["\n"]),
+    'followup': TaskProfile('followup', 'small', max_tokens=600, temperature=0.3),
+    'report': TaskProfile('report', 'large', max_tokens=1000, temperature=0.5),
+    'validate': TaskProfile('validate', 'large', max_tokens=800, temperature=0.0),
+    'default': TaskProfile('default', 'large', max_tokens=1000)
+}
+
+def get_task_profile(task: str) -> TaskProfile:
+    """Return the profile for a task name, or the default profile for unknown tasks"""
+    return TASK_PROFILES.get(task, TASK_PROFILES['default'])
@@ -6,6 +6,7 @@ import re
 import json
 import time
 import random
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
 
 try:
     from youtube_transcript_api import YouTubeTranscriptApi
@@ -21,6 +22,8 @@ class YouTubeService:
         }
         self.session = requests.Session()
         self.session.headers.update(self.headers)
+        # The transcript API has no request timeout, so calls run here and are abandoned when late
+        self._transcript_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='yt-transcript')
     
     def search_reviews(self, product: str, max_results: int = 10) -> List[Dict[str, Any]]:
         """Search YouTube for product reviews"""
@@ -67,8 +70,8 @@ class YouTubeService:
         print(f"Generated {len(videos)} YouTube reviews for {product}")
         return videos
     
-    def get_video_transcript(self, video_url: str) -> str:
-        """Extract transcript from YouTube video"""
+    def get_video_transcript(self, video_url: str, timeout: float = 10) -> str:
+        """Extract transcript from YouTube video, waiting at most timeout seconds for the transcript API"""
         try:
             print(f"Extracting transcript from: {video_url}")
             
@@ -80,11 +83,15 @@ class YouTubeService:
             # Method 1: Try YouTube Transcript API
             if TRANSCRIPT_API_AVAILABLE:
                 try:
-                    transcript_list = YouTubeTranscriptApi.get_transcript(video_id, languages=['en', 'en-US'])
+                    transcript_list = self._transcript_executor.submit(
+                        YouTubeTranscriptApi.get_transcript, video_id, languages=['en', 'en-US']
+                    ).result(timeout=timeout)
                     transcript_text = ' '.join([item['text'] for item in transcript_list])
                     if transcript_text and len(transcript_text) > 100:
                         print(f"Successfully extracted {len(transcript_text)} characters via API")
                         return transcript_text[:2000]
+                except FutureTimeout:
+                    print(f"Transcript API timed out after {timeout:.1f}s")
                 except Exception as api_error:
                     print(f"Transcript API failed: {api_error}")
             
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Accuracy and latency of the local query classifier vs the LLM classification call
+
+    python benchmark_classifier.py                 # local classifier only
+    python benchmark_classifier.py --llm           # also call Bedrock for every held-out query
+    BEDROCK_BACKEND=stub python benchmark_classifier.py --llm   # offline dry run
+"""
+
+import argparse
+import random
+import time
+from dotenv import load_dotenv
+from agent.research_agent.config import Config
+from agent.research_agent.llm_metrics import percentile
+from agent.research_agent.query_classifier import QueryClassifier, load_labelled_queries, DEFAULT_TRAINING_PATH
+
+load_dotenv()
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the local query classifier against the LLM")
+    parser.add_argument('--data', default=DEFAULT_TRAINING_PATH, help='Labelled queries JSONL')
+    parser.add_argument('--holdout', type=float, default=0.25, help='Fraction of queries held out for evaluation')
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--threshold', type=float, default=Config.get_local_classifier_threshold())
+    parser.add_argument('--llm', action='store_true', help='Also classify the held-out queries with Bedrock')
+    parser.add_argument('--uncalibrated', action='store_true', help='Skip temperature calibration (raw naive Bayes posteriors)')
+    return parser.parse_args()
+
+def latency_summary(latencies):
+    return (f"mean {sum(latencies) / len(latencies) * 1000:.2f}ms | p50 {percentile(latencies, 50) * 1000:.2f}ms | "
+            f"p99 {percentile(latencies, 99) * 1000:.2f}ms")
+
+def main():
+    args = parse_args()
+    examples = load_labelled_queries(args.data)
+    random.Random(args.seed).shuffle(examples)
+    split = int(len(examples) * (1 - args.holdout))
+    train, test = examples[:split], examples[split:]
+    
+    start = time.perf_counter()
+    classifier = QueryClassifier().train(train)
+    if not args.uncalibrated:
+        # Calibrated on the training split only, so the held-out queries stay unseen
+        classifier.calibrate(train)
+    print(f"Trained on {len(train)} queries in {(time.perf_counter() - start) * 1000:.1f}ms "
+          f"(temperature {classifier.temperature}), evaluating {len(test)}")
+    
+    local = []
+    for query, expected in test:
+        start = time.perf_counter()
+        category, confidence = classifier.predict(query)
+        local.append((query, expected, category, confidence, time.perf_counter() - start))
+    
+    confident = [row for row in local if row[3] >= args.threshold]
+    print("\n=== LOCAL CLASSIFIER ===")
+    print(f"Accuracy: {sum(row[1] == row[2] for row in local) / len(local):.1%}")
+    print(f"Confident (>= {args.threshold}): {len(confident) / len(local):.1%} of queries, "
+          f"accuracy {sum(row[1] == row[2] for row in confident) / max(1, len(confident)):.1%}")
+    # Confidently wrong queries skip the LLM and are misrouted, so this is the rate that matters
+    print(f"Confident but wrong: {sum(row[1] != row[2] for row in confident) / len(local):.1%} of queries")
+    print(f"Latency: {latency_summary([row[4] for row in local])}")
+    
+    if not args.llm:
+        return
+    
+    # Imported here so the local benchmark runs without the research service dependencies
+    from agent.research_agent.llm_service import LLMService
+    from agent.research_agent.orchestrator import AIOrchestrator
+    llm_service = LLMService(Config.get_aws_access_key(), Config.get_aws_secret_key(), Config.get_aws_region(),
+                             enable_cache=False)
+    llm = []
+    for query, expected, _, _, _ in local:
+        start = time.perf_counter()
+        answer = llm_service.query_llm(AIOrchestrator.classification_prompt(query), task='classify').strip().upper()
+        llm.append((expected, answer, time.perf_counter() - start))
+    
+    print("\n=== LLM CLASSIFICATION ===")
+    print(f"Accuracy: {sum(expected == answer for expected, answer, _ in llm) / len(llm):.1%}")
+    print(f"Latency: {latency_summary([row[2] for row in llm])}")
+    
+    # What the orchestrator does: local answer when confident, LLM otherwise
+    hybrid_correct, hybrid_latencies = 0, []
+    for (_, expected, category, confidence, local_time), (_, answer, llm_time) in zip(local, llm):
+        if confidence >= args.threshold:
+            hybrid_correct += expected == category
+            hybrid_latencies.append(local_time)
+        else:
+            hybrid_correct += expected == answer
+            hybrid_latencies.append(local_time + llm_time)
+    print("\n=== HYBRID (local when confident, else LLM) ===")
+    print(f"Accuracy: {hybrid_correct / len(llm):.1%}")
+    print(f"Latency: {latency_summary(hybrid_latencies)}")
+
+if __name__ == "__main__":
+    main()
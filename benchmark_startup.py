@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""Cold-start time of the CLI to its first prompt, with an -X importtime breakdown
+
+    python benchmark_startup.py                  # median of 5 cold starts + slowest imports
+    python benchmark_startup.py --max-ms 800     # exit non-zero if startup regresses past 800ms
+
+Fails as well if any of the heavy dependencies below is imported before the first
+prompt; they are meant to load only with the agent or service that needs them.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+MAIN = os.path.join(ROOT, 'main.py')
+PROMPT = b'Enter your product/market query'
+HEAVY_MODULES = ['boto3', 'botocore', 'yfinance', 'pandas', 'bs4', 'langchain', 'requests', 'selenium']
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark CLI cold start to the first prompt")
+    parser.add_argument('--runs', type=int, default=5, help='Cold starts to time')
+    parser.add_argument('--top', type=int, default=15, help='Slowest imports to list')
+    parser.add_argument('--max-ms', type=float, help='Fail if the median time to the first prompt exceeds this')
+    return parser.parse_args()
+
+def time_to_prompt(python_args, env):
+    """Start main.py, wait for the first prompt, answer 'quit'; returns (seconds, stderr text)"""
+    with tempfile.TemporaryFile() as stderr:
+        start = time.perf_counter()
+        process = subprocess.Popen([sys.executable, *python_args, MAIN], cwd=ROOT, env=env,
+                                   stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=stderr)
+        seen = b''
+        while PROMPT not in seen:
+            chunk = os.read(process.stdout.fileno(), 4096)
+            if not chunk:
+                break
+            seen += chunk
+        elapsed = time.perf_counter() - start
+        process.communicate(b'quit\n', timeout=60)
+        stderr.seek(0)
+        errors = stderr.read().decode('utf-8', errors='replace')
+    if PROMPT not in seen:
+        raise RuntimeError(f"main.py exited before the first prompt:\n{seen.decode(errors='replace')[-2000:]}{errors[-2000:]}")
+    return elapsed, errors
+
+def parse_importtime(text):
+    """(module, self_us, cumulative_us) for every line of -X importtime output"""
+    imports = []
+    for line in text.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, module = line[len('import time:'):].split('|')
+        imports.append((module.strip(), int(self_us), int(cumulative_us)))
+    return imports
+
+def main():
+    args = parse_args()
+    env = dict(os.environ)
+    # main.py stops before the prompt without these; their values are never used here
+    env.setdefault('NEWSDATA_API_KEY', 'benchmark')
+    env.setdefault('GOOGLE_CSE_ID', 'benchmark')
+    
+    timings = [time_to_prompt([], env)[0] for _ in range(args.runs)]
+    median = statistics.median(timings)
+    print("=== COLD START TO FIRST PROMPT ===")
+    print(f"Runs: {args.runs} | median {median * 1000:.0f}ms | min {min(timings) * 1000:.0f}ms | "
+          f"max {max(timings) * 1000:.0f}ms")
+    
+    _, errors = time_to_prompt(['-X', 'importtime'], env)
+    imports = parse_importtime(errors)
+    top_level = [row for row in imports if '.' not in row[0]]
+    print(f"\n=== SLOWEST IMPORTS (cumulative, {len(imports)} modules, "
+          f"{sum(row[1] for row in imports) / 1000:.0f}ms total) ===")
+    for module, _, cumulative_us in sorted(top_level, key=lambda row: row[2], reverse=True)[:args.top]:
+        print(f"{cumulative_us / 1000:8.1f}ms  {module}")
+    
+    loaded = sorted({module.split('.')[0] for module, _, _ in imports} & set(HEAVY_MODULES))
+    print(f"\nHeavy dependencies imported before the first prompt: {', '.join(loaded) or 'none'}")
+    
+    failed = bool(loaded)
+    if args.max_ms is not None and median * 1000 > args.max_ms:
+        print(f"Median startup {median * 1000:.0f}ms exceeds --max-ms {args.max_ms:.0f}ms")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,132 @@
 #!/usr/bin/env python3
 
+import argparse
+import sys
+import time
 from dotenv import load_dotenv
 from agent.research_agent.orchestrator import AIOrchestrator
 from agent.research_agent.config import Config
+from agent.research_agent.llm_service import LLMService
+from agent.research_agent.batch_runner import BatchRunner, BatchManifestClient
+from agent.research_agent.llm_metrics import format_footer
 
 # Load environment variables from .env file
 load_dotenv()
 
+class StreamPrinter:
+    """Prints streamed report text as it arrives and tracks perceived latency"""
+    
+    def __init__(self):
+        self.started_at = time.time()
+        self.first_output_at = None
+    
+    def __call__(self, text: str):
+        if self.first_output_at is None:
+            self.first_output_at = time.time()
+        sys.stdout.write(text)
+        sys.stdout.flush()
+    
+    @property
+    def streamed(self) -> bool:
+        return self.first_output_at is not None
+    
+    def timing_summary(self) -> str:
+        total = time.time() - self.started_at
+        first = self.first_output_at - self.started_at
+        return f"⏱️  First output after {first:.1f}s | Total {total:.1f}s"
+
+class SectionPrinter(StreamPrinter):
+    """Prints report sections as the agent finishes them, and LLM text as it streams (LLM_STREAMING)"""
+    
+    def __init__(self):
+        super().__init__()
+        self.first_section_at = None
+    
+    def __call__(self, event):
+        if event.is_section and self.first_section_at is None:
+            self.first_section_at = time.time()
+        super().__call__(event.stream_text)
+    
+    def timing_summary(self) -> str:
+        summary = super().timing_summary()
+        if self.first_section_at is None:
+            return summary
+        first_section = self.first_section_at - self.started_at
+        return summary.replace(" | Total", f" | First section after {first_section:.1f}s | Total")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="AI Research Orchestrator")
+    parser.add_argument('--batch', metavar='INPUT.jsonl',
+                        help='Run every {"id", "query"} line of a JSONL file instead of the interactive loop')
+    parser.add_argument('--output', metavar='RESULTS.jsonl', default='batch_results.jsonl',
+                        help='Batch results file; also the checkpoint used to resume a crashed run')
+    parser.add_argument('--workers', type=int, default=Config.get_batch_max_workers(),
+                        help='Queries researched concurrently in batch mode')
+    parser.add_argument('--manifest', metavar='MANIFEST.jsonl',
+                        help='Write LLM calls to Bedrock batch-inference manifests (MANIFEST.<model>.jsonl, '
+                             'one per model) instead of invoking models')
+    parser.add_argument('--serve', action='store_true',
+                        help='Run the HTTP API server (POST /research, /followup, /reset) instead of the interactive loop')
+    parser.add_argument('--host', default=Config.get_server_host(), help='Server bind address')
+    parser.add_argument('--port', type=int, default=Config.get_server_port(), help='Server port')
+    return parser.parse_args()
+
+def run_batch(args):
+    """Run a JSONL file of queries through the orchestrator"""
+    if args.manifest:
+        # Placeholder answers must not be cached as real reports
+        llm_service = LLMService(bedrock_client=BatchManifestClient(args.manifest), enable_cache=False)
+    else:
+        llm_service = LLMService(
+            Config.get_aws_access_key(), Config.get_aws_secret_key(), Config.get_aws_region(),
+            max_concurrency=max(Config.get_llm_max_concurrency(), args.workers)
+        )
+    
+    # One factory for every worker, so agents come from shared, bounded pools
+    factory = AIOrchestrator.create_factory(Config.get_newsdata_api_key(), Config.get_google_cse_id(), llm_service)
+    
+    def create_orchestrator():
+        return AIOrchestrator(
+            newsdata_api_key=Config.get_newsdata_api_key(),
+            google_cse_id=Config.get_google_cse_id(),
+            llm_service=llm_service,
+            factory=factory
+        )
+    
+    runner = BatchRunner(create_orchestrator, max_workers=args.workers, deferred=bool(args.manifest))
+    summary = runner.run(args.batch, args.output)
+    print(f"Results written to {args.output}")
+    if args.manifest:
+        manifest_client = llm_service.bedrock_client
+        print(f"Bedrock batch manifests ({manifest_client.records} records, one job per model):")
+        for model_id, path in manifest_client.manifests.items():
+            print(f"  {model_id}: {path}")
+    print(f"LLM cache: {llm_service.get_cache_stats()}")
+    print(f"LLM latency by agent: {llm_service.metrics.get_summary('agent')}")
+    print(f"Agent pools: {factory.get_pool_stats()}")
+    if llm_service.get_region_stats():
+        print(f"Bedrock regions: {llm_service.get_region_stats()}")
+    return summary
+
+def run_server(args):
+    """Serve concurrent clients from one orchestrator, with a memory session per client"""
+    # Imported here so the interactive CLI does not load the server module
+    from agent.research_agent.server import ResearchServer
+    llm_service = LLMService(
+        Config.get_aws_access_key(), Config.get_aws_secret_key(), Config.get_aws_region(),
+        max_concurrency=max(Config.get_llm_max_concurrency(), Config.get_server_max_workers())
+    )
+    orchestrator = AIOrchestrator(
+        newsdata_api_key=Config.get_newsdata_api_key(),
+        google_cse_id=Config.get_google_cse_id(),
+        llm_service=llm_service
+    )
+    ResearchServer(orchestrator).run(args.host, args.port)
+
 def main():
     """Main function to run the Research Agent"""
+    args = parse_args()
+    
     print("=== AI Research Orchestrator ===")
     print("Clean Architecture Multi-Agent LLM System:")
     print("📰 News/Stocks Agent → Real-time NewsData.io API")
@@ -28,6 +146,14 @@ def main():
         print("\nGet NewsData API key from: https://newsdata.io/")
         return
     
+    if args.batch:
+        run_batch(args)
+        return
+    
+    if args.serve:
+        run_server(args)
+        return
+    
     # Initialize the AI orchestrator
     try:
         orchestrator = AIOrchestrator(
@@ -70,11 +196,19 @@ def main():
                 continue
             
             print()
-            # Process the query
-            result = orchestrator.analyze_query(user_input)
-            print(result)
+            # Process the query, printing report sections as they complete and, with
+            # LLM streaming enabled, the LLM text of each section as it is generated
+            printer = SectionPrinter()
+            result = orchestrator.analyze_query(user_input, on_event=printer)
+            if printer.streamed:
+                print()
+                print(printer.timing_summary())
+            else:
+                print(result)
+            if Config.get_llm_metrics_footer():
+                print(format_footer(orchestrator.last_query_calls))
             print()
-            
+        
         except KeyboardInterrupt:
             print("\nGoodbye!")
             break
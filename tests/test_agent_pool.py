@@ -0,0 +1,111 @@
+import threading
+import time
+import unittest
+from agent.research_agent.agent_pool import AgentPool
+
+class CountingFactory:
+    """Builds numbered stand-in agents, optionally failing"""
+    
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.built = 0
+        self.lock = threading.Lock()
+    
+    def __call__(self):
+        if self.fail:
+            raise RuntimeError("agent construction failed")
+        with self.lock:
+            self.built += 1
+            return f"agent-{self.built}"
+
+class AgentPoolTest(unittest.TestCase):
+    
+    def test_instances_are_created_on_demand_and_reused(self):
+        create = CountingFactory()
+        pool = AgentPool('PRODUCT', create, max_size=2)
+        
+        first = pool.checkout()
+        pool.checkin(first)
+        self.assertEqual(pool.checkout(), first)
+        self.assertEqual(create.built, 1)
+    
+    def test_size_never_exceeds_max(self):
+        create = CountingFactory()
+        pool = AgentPool('PRODUCT', create, max_size=2)
+        active = []
+        peak = []
+        lock = threading.Lock()
+        
+        def request():
+            with pool.lease(timeout=5) as agent:
+                with lock:
+                    active.append(agent)
+                    peak.append(len(active))
+                time.sleep(0.02)
+                with lock:
+                    active.remove(agent)
+        
+        threads = [threading.Thread(target=request) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+        
+        self.assertEqual(create.built, 2)
+        self.assertLessEqual(max(peak), 2)
+        stats = pool.get_stats()
+        self.assertEqual((stats['checkouts'], stats['size'], stats['in_use']), (6, 2, 0))
+        self.assertGreater(stats['waited'], 0)
+    
+    def test_checkout_times_out_when_exhausted(self):
+        pool = AgentPool('NEWS', CountingFactory(), max_size=1)
+        pool.checkout()
+        
+        started = time.time()
+        with self.assertRaises(TimeoutError):
+            pool.checkout(timeout=0.05)
+        self.assertGreaterEqual(time.time() - started, 0.05)
+        self.assertEqual(pool.get_stats()['timeouts'], 1)
+    
+    def test_zero_timeout_fails_immediately(self):
+        pool = AgentPool('NEWS', CountingFactory(), max_size=1)
+        pool.checkout()
+        
+        with self.assertRaises(TimeoutError):
+            pool.checkout(timeout=0)
+    
+    def test_waiting_checkout_gets_returned_agent(self):
+        pool = AgentPool('NEWS', CountingFactory(), max_size=1)
+        agent = pool.checkout()
+        threading.Timer(0.05, pool.checkin, args=(agent,)).start()
+        
+        self.assertEqual(pool.checkout(timeout=5), agent)
+    
+    def test_failed_creation_frees_its_slot(self):
+        create = CountingFactory(fail=True)
+        pool = AgentPool('GENERAL', create, max_size=1)
+        
+        with self.assertRaises(RuntimeError):
+            pool.checkout(timeout=0)
+        create.fail = False
+        self.assertEqual(pool.checkout(timeout=0), 'agent-1')
+    
+    def test_warm_up_creates_min_size(self):
+        create = CountingFactory()
+        pool = AgentPool('STOCKS', create, min_size=2, max_size=3)
+        
+        self.assertEqual(pool.warm_up(), 2)
+        self.assertEqual(pool.warm_up(), 0)
+        stats = pool.get_stats()
+        self.assertEqual((stats['size'], stats['idle']), (2, 2))
+    
+    def test_lease_returns_agent_on_error(self):
+        pool = AgentPool('NEWS', CountingFactory(), max_size=1)
+        
+        with self.assertRaises(ValueError):
+            with pool.lease():
+                raise ValueError("agent failed mid-request")
+        self.assertEqual(pool.get_stats()['idle'], 1)
+
+if __name__ == '__main__':
+    unittest.main()
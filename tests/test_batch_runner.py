@@ -0,0 +1,156 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+from agent.research_agent.batch_runner import BatchManifestClient, BatchRunner
+from agent.research_agent.bedrock_client import clear_bedrock_clients, get_bedrock_client
+from agent.research_agent.llm_service import LLMService
+from agent.research_agent.stub_bedrock_client import StubBedrockClient
+
+class StubOrchestrator:
+    """Stands in for AIOrchestrator: one LLM call per query (BEDROCK_BACKEND decides the client if none is given)"""
+    
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+    
+    def __init__(self, bedrock_client=None, delay: float = 0.0):
+        self.llm_service = LLMService(bedrock_client=bedrock_client, enable_cache=False)
+        self.delay = delay
+    
+    def clear_memory(self):
+        pass
+    
+    def analyze_query(self, query: str) -> str:
+        with StubOrchestrator.lock:
+            StubOrchestrator.active += 1
+            StubOrchestrator.peak = max(StubOrchestrator.peak, StubOrchestrator.active)
+        try:
+            time.sleep(self.delay)
+            return self.llm_service.query_llm(f"Research: {query}", task='report', use_cache=False)
+        finally:
+            with StubOrchestrator.lock:
+                StubOrchestrator.active -= 1
+    
+    def get_last_query_metrics(self):
+        return {}
+    
+    def get_last_stage_timings(self):
+        return {}
+    
+    last_first_section_seconds = None
+
+def read_jsonl(path: str):
+    with open(path, encoding='utf-8') as source:
+        return [json.loads(line) for line in source if line.strip()]
+
+class BatchRunnerTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.input_path = os.path.join(self.directory, 'queries.jsonl')
+        self.output_path = os.path.join(self.directory, 'results.jsonl')
+        with open(self.input_path, 'w', encoding='utf-8') as queries:
+            for i in range(8):
+                queries.write(json.dumps({'id': f'q{i}', 'query': f'pixel {i} review'}) + "\n")
+        StubOrchestrator.active = StubOrchestrator.peak = 0
+    
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+    
+    @mock.patch.dict(os.environ, {'BEDROCK_BACKEND': 'stub', 'BEDROCK_REGIONS': ''})
+    def test_concurrency_is_bounded_by_max_workers(self):
+        clear_bedrock_clients()
+        runner = BatchRunner(lambda: StubOrchestrator(delay=0.05), max_workers=3)
+        
+        summary = runner.run(self.input_path, self.output_path)
+        
+        self.assertEqual(summary['succeeded'], 8)
+        self.assertLessEqual(StubOrchestrator.peak, 3)
+        self.assertGreater(StubOrchestrator.peak, 1)
+        self.assertEqual(len(get_bedrock_client('us-east-1').calls), 8)
+        clear_bedrock_clients()
+    
+    def test_resume_skips_finished_queries_only(self):
+        with open(self.output_path, 'w', encoding='utf-8') as results:
+            results.write(json.dumps({'id': 'q0', 'status': 'ok'}) + "\n")
+            results.write(json.dumps({'id': 'q1', 'status': 'error'}) + "\n")
+            results.write(json.dumps({'id': 'q2', 'status': 'deferred'}) + "\n")
+            results.write('{"id": "q3", "stat')  # partial line from a crash
+        client = StubBedrockClient()
+        runner = BatchRunner(lambda: StubOrchestrator(client), max_workers=2)
+        
+        summary = runner.run(self.input_path, self.output_path)
+        
+        self.assertEqual(summary['skipped'], 1)
+        self.assertEqual(summary['succeeded'], 7)
+        researched = {call['prompt'] for call in client.calls}
+        self.assertNotIn("Research: pixel 0 review", researched)
+        self.assertIn("Research: pixel 2 review", researched)
+    
+    def test_manifest_run_is_deferred_not_done(self):
+        manifest_path = os.path.join(self.directory, 'manifest.jsonl')
+        client = BatchManifestClient(manifest_path)
+        runner = BatchRunner(lambda: StubOrchestrator(client), max_workers=2, deferred=True)
+        
+        summary = runner.run(self.input_path, self.output_path)
+        
+        self.assertEqual(summary['deferred'], 8)
+        self.assertEqual({record['status'] for record in read_jsonl(self.output_path)}, {'deferred'})
+        self.assertEqual(BatchRunner.load_completed_ids(self.output_path), set())
+        # Resuming the manifest run does not write the same calls again
+        again = BatchRunner(lambda: StubOrchestrator(client), max_workers=2, deferred=True)
+        self.assertEqual(again.run(self.input_path, self.output_path)['skipped'], 8)
+        self.assertEqual(client.records, 8)
+
+class BatchManifestClientTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.manifest_path = os.path.join(self.directory, 'manifest.jsonl')
+    
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+    
+    def invoke(self, client, model_id: str, text: str = 'hello'):
+        body = json.dumps({'max_tokens': 10, 'messages': [{'role': 'user', 'content': text}]})
+        response = client.invoke_model(body=body, modelId=model_id)
+        return json.loads(response['body'].read())['content'][0]['text']
+    
+    def test_record_format(self):
+        client = BatchManifestClient(self.manifest_path)
+        answer = self.invoke(client, 'anthropic.claude-3-haiku-20240307-v1:0')
+        
+        records = read_jsonl(client.manifests['anthropic.claude-3-haiku-20240307-v1:0'])
+        self.assertEqual(len(records), 1)
+        self.assertEqual(set(records[0]), {'recordId', 'modelInput'})
+        self.assertRegex(records[0]['recordId'], r'^[A-Za-z0-9]{11}$')
+        self.assertEqual(records[0]['modelInput']['messages'][0]['content'], 'hello')
+        self.assertIn(records[0]['recordId'], answer)
+    
+    def test_one_manifest_per_model(self):
+        client = BatchManifestClient(self.manifest_path)
+        self.invoke(client, 'anthropic.claude-3-haiku-20240307-v1:0')
+        self.invoke(client, 'anthropic.claude-3-5-sonnet-20240620-v1:0')
+        self.invoke(client, 'anthropic.claude-3-haiku-20240307-v1:0')
+        
+        self.assertEqual(len(client.manifests), 2)
+        self.assertEqual([len(read_jsonl(path)) for path in client.manifests.values()], [2, 1])
+    
+    def test_record_ids_continue_across_runs(self):
+        first = BatchManifestClient(self.manifest_path)
+        self.invoke(first, 'anthropic.claude-3-haiku-20240307-v1:0')
+        self.invoke(first, 'anthropic.claude-3-5-sonnet-20240620-v1:0')
+        second = BatchManifestClient(self.manifest_path)
+        self.invoke(second, 'anthropic.claude-3-haiku-20240307-v1:0')
+        
+        record_ids = [record['recordId'] for path in first.manifests.values() for record in read_jsonl(path)]
+        self.assertEqual(len(record_ids), 3)
+        self.assertEqual(len(set(record_ids)), 3)
+
+if __name__ == '__main__':
+    unittest.main()
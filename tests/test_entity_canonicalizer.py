@@ -0,0 +1,66 @@
+import unittest
+from agent.research_agent.entity_canonicalizer import EntityCanonicalizer, canonicalize, entity_key
+
+class EntityCanonicalizerTest(unittest.TestCase):
+    
+    def assertSameKey(self, key: str, *queries: str):
+        for query in queries:
+            self.assertEqual(entity_key(query), key, query)
+    
+    def test_phrasings_share_one_key(self):
+        self.assertSameKey('google/pixel/9/pro',
+                           'pixel 9 pro review', 'Google Pixel 9 Pro analysis', 'google pixel 9 pro')
+        self.assertSameKey('apple/iphone/15/pro-max', 'iphone 15 pro max price', 'Apple iPhone 15 Pro Max')
+    
+    def test_bare_model_number_implies_line(self):
+        self.assertSameKey('samsung/galaxy/s24/ultra',
+                           'galaxy s24 ultra', 'samsung s24 ultra review', 's24 ultra')
+    
+    def test_model_spacing_is_not_significant(self):
+        self.assertSameKey('samsung/galaxy/zfold5/-', 'samsung galaxy z fold 5', 'galaxy zfold5')
+    
+    def test_display_name(self):
+        self.assertEqual(canonicalize('s24 ultra').display_name, 'Samsung Galaxy S24 Ultra')
+        self.assertEqual(canonicalize('samsung galaxy z fold 5').display_name, 'Samsung Galaxy Z Fold 5')
+        self.assertEqual(canonicalize('pixel 8a').display_name, 'Google Pixel 8a')
+    
+    def test_residual_words_make_entity_inexact(self):
+        entity = canonicalize('pixel 9 pro battery life')
+        
+        self.assertTrue(entity.is_specific)
+        self.assertFalse(entity.is_exact)
+        self.assertEqual(entity.residual, ['battery', 'life'])
+        self.assertTrue(canonicalize('pixel 9 pro review').is_exact)
+    
+    def test_brand_alone_has_no_key(self):
+        entity = canonicalize('google')
+        
+        self.assertEqual(entity.key, 'google/-/-/-')
+        self.assertFalse(entity.is_specific)
+        self.assertIsNone(entity_key('google'))
+    
+    def test_second_brand_ends_the_entity(self):
+        entity = canonicalize('samsung vs apple')
+        
+        self.assertEqual(entity.brand, 'samsung')
+        self.assertIn('apple', entity.residual)
+    
+    def test_unknown_product_is_none(self):
+        self.assertIsNone(canonicalize('best laptop 2024'))
+        self.assertIsNone(entity_key('best laptop 2024'))
+    
+    def test_custom_alias_dictionary(self):
+        canonicalizer = EntityCanonicalizer({
+            'brands': {'acme': {'name': 'Acme', 'aliases': ['acme', 'acme corp']}},
+            'lines': {'rocket': {'brand': 'acme', 'name': 'Rocket', 'aliases': ['rocket', 'rkt']}},
+            'variants': ['turbo'],
+            'intent_words': ['review']
+        })
+        
+        entity = canonicalizer.canonicalize('Acme Corp RKT 3 turbo review')
+        self.assertEqual(entity.key, 'acme/rocket/3/turbo')
+        self.assertEqual(entity.display_name, 'Acme Rocket 3 Turbo')
+        self.assertTrue(entity.is_exact)
+
+if __name__ == '__main__':
+    unittest.main()
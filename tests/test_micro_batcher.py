@@ -0,0 +1,158 @@
+import json
+import re
+import threading
+import time
+import unittest
+from unittest import mock
+from agent.research_agent.llm_service import LLMService
+from agent.research_agent.micro_batcher import MicroBatcher
+from agent.research_agent.stub_bedrock_client import StubBedrockClient
+
+KEY = ('classify', 'model', None)
+
+def submit_all(batcher: MicroBatcher, prompts, key=KEY):
+    """Submit prompts from one thread each; return {prompt: answer or exception}"""
+    results = {}
+    
+    def run(prompt):
+        try:
+            results[prompt] = batcher.submit(key, prompt)
+        except Exception as e:
+            results[prompt] = e
+    
+    threads = [threading.Thread(target=run, args=(prompt,)) for prompt in prompts]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    return results
+
+class RecordingCalls:
+    """Fake run_batch/run_single that echo each prompt and remember what they were asked"""
+    
+    def __init__(self, raw: str = None, fail: bool = False):
+        self.raw = raw
+        self.fail = fail
+        self.batches = []
+        self.singles = []
+        self.lock = threading.Lock()
+    
+    def run_batch(self, key, prompt, count):
+        with self.lock:
+            self.batches.append(count)
+        if self.fail:
+            raise RuntimeError("batch throttled")
+        if self.raw is not None:
+            return self.raw
+        requests = re.findall(r'<request id="(\d+)">\n(.*?)\n</request>', prompt, re.DOTALL)
+        return json.dumps({request_id: f"batched: {text}" for request_id, text in requests})
+    
+    def run_single(self, key, prompt):
+        with self.lock:
+            self.singles.append(prompt)
+        if self.fail:
+            raise RuntimeError(f"{prompt} throttled")
+        return f"single: {prompt}"
+
+class MicroBatcherTest(unittest.TestCase):
+    
+    def test_full_batch_flushes_without_waiting(self):
+        calls = RecordingCalls()
+        batcher = MicroBatcher(calls.run_batch, calls.run_single, max_batch_size=3, max_wait=2.0)
+        
+        started = time.time()
+        results = submit_all(batcher, ['a', 'b', 'c'])
+        
+        self.assertLess(time.time() - started, 1.0)
+        self.assertEqual(calls.batches, [3])
+        self.assertEqual(calls.singles, [])
+        self.assertEqual(results, {'a': 'batched: a', 'b': 'batched: b', 'c': 'batched: c'})
+        self.assertEqual(batcher.get_stats()['batched_items'], 3)
+    
+    def test_size_cap_splits_batches(self):
+        calls = RecordingCalls()
+        batcher = MicroBatcher(calls.run_batch, calls.run_single, max_batch_size=2, max_wait=0.2)
+        
+        submit_all(batcher, ['a', 'b', 'c', 'd'])
+        
+        self.assertEqual(calls.batches, [2, 2])
+    
+    def test_partial_batch_flushes_after_max_wait(self):
+        calls = RecordingCalls()
+        batcher = MicroBatcher(calls.run_batch, calls.run_single, max_batch_size=8, max_wait=0.1)
+        
+        started = time.time()
+        submit_all(batcher, ['a', 'b'])
+        
+        self.assertGreaterEqual(time.time() - started, 0.1)
+        self.assertEqual(calls.batches, [2])
+    
+    def test_lone_prompt_is_sent_on_its_own(self):
+        calls = RecordingCalls()
+        batcher = MicroBatcher(calls.run_batch, calls.run_single, max_batch_size=8, max_wait=0.05)
+        
+        self.assertEqual(batcher.submit(KEY, 'a'), 'single: a')
+        self.assertEqual(calls.batches, [])
+        self.assertEqual(batcher.get_stats()['single_items'], 1)
+    
+    def test_malformed_answer_falls_back_to_single_calls(self):
+        calls = RecordingCalls(raw='{"1": "first", "2": ')
+        batcher = MicroBatcher(calls.run_batch, calls.run_single, max_batch_size=2, max_wait=1.0)
+        
+        results = submit_all(batcher, ['a', 'b'])
+        
+        self.assertEqual(results, {'a': 'single: a', 'b': 'single: b'})
+        self.assertEqual(sorted(calls.singles), ['a', 'b'])
+        self.assertEqual(batcher.get_stats()['item_fallbacks'], 2)
+    
+    def test_missing_item_is_asked_again(self):
+        calls = RecordingCalls(raw='{"1": "first"}')
+        batcher = MicroBatcher(calls.run_batch, calls.run_single, max_batch_size=2, max_wait=1.0)
+        
+        results = submit_all(batcher, ['a', 'b'])
+        
+        self.assertEqual(len(calls.singles), 1)
+        self.assertEqual(sorted(results.values()), ['first', f"single: {calls.singles[0]}"])
+    
+    def test_leader_failure_reaches_followers(self):
+        calls = RecordingCalls(fail=True)
+        batcher = MicroBatcher(calls.run_batch, calls.run_single, max_batch_size=3, max_wait=1.0)
+        
+        results = submit_all(batcher, ['a', 'b', 'c'])
+        
+        self.assertEqual(set(results), {'a', 'b', 'c'})
+        for prompt, result in results.items():
+            self.assertIsInstance(result, RuntimeError)
+            self.assertIn(prompt, str(result))
+
+class MicroBatchTelemetryTest(unittest.TestCase):
+    
+    def test_every_batched_caller_records_its_call(self):
+        with mock.patch.dict('os.environ', {'LLM_MICRO_BATCH': 'true', 'LLM_MICRO_BATCH_SIZE': '3',
+                                            'LLM_MICRO_BATCH_WAIT_MS': '2000'}):
+            service = LLMService(bedrock_client=StubBedrockClient(), enable_cache=False)
+        recorded = len(service.metrics.get_records())
+        scopes = {}
+        
+        def classify(name):
+            with service.telemetry_scope(name) as calls:
+                service.query_llm(f"Classify: {name}", task='classify', use_cache=False)
+            scopes[name] = calls
+        
+        threads = [threading.Thread(target=classify, args=(name,)) for name in ('a', 'b', 'c')]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+        
+        self.assertEqual(service.micro_batcher.get_stats()['batched_items'], 3)
+        for name, calls in scopes.items():
+            self.assertEqual(len(calls), 1, name)
+            self.assertTrue(calls[0]['batched'])
+            self.assertEqual(calls[0]['agent'], name)
+            self.assertIsNotNone(calls[0]['model'])
+        # The packed Bedrock request is the only call in the process-wide metrics
+        self.assertEqual(len(service.metrics.get_records()) - recorded, 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+import time
+import unittest
+from agent.research_agent.llm_service import LLMService
+from agent.research_agent.model_router import CircuitBreaker, ModelRouter, classify_error
+from agent.research_agent.stub_bedrock_client import StubBedrockClient
+
+PRIMARY = 'anthropic.claude-3-5-sonnet-20241022-v2:0'
+FALLBACK = 'anthropic.claude-3-haiku-20240307-v1:0'
+
+class CredentialError(Exception):
+    """Shaped like a botocore ClientError for bad credentials"""
+    
+    def __init__(self):
+        super().__init__("The security token included in the request is invalid")
+        self.response = {'Error': {'Code': 'UnrecognizedClientException'}}
+
+class BadCredentialsStub(StubBedrockClient):
+    def _canned(self, model_id: str, prompt: str) -> str:
+        raise CredentialError()
+
+class ModelRouterTest(unittest.TestCase):
+    
+    def router(self, recovery_timeout: float = 30.0):
+        return ModelRouter(failure_threshold=2, recovery_timeout=recovery_timeout)
+    
+    def fail(self, router: ModelRouter, model: str, times: int = 1):
+        for _ in range(times):
+            self.assertTrue(router.acquire(model))
+            router.record_failure(model, 'ThrottlingException', 0.1)
+    
+    def test_preference_order_when_healthy(self):
+        self.assertEqual(self.router().route([PRIMARY, FALLBACK, PRIMARY]), [PRIMARY, FALLBACK])
+    
+    def test_breaker_trips_after_threshold(self):
+        router = self.router()
+        self.fail(router, PRIMARY)
+        self.assertEqual(router.route([PRIMARY, FALLBACK]), [FALLBACK, PRIMARY])
+        
+        self.fail(router, PRIMARY)
+        self.assertEqual(router.get_stats()[PRIMARY]['state'], CircuitBreaker.OPEN)
+        self.assertEqual(router.route([PRIMARY, FALLBACK]), [FALLBACK])
+        self.assertFalse(router.acquire(PRIMARY))
+    
+    def test_half_open_allows_a_single_probe(self):
+        router = self.router(recovery_timeout=0.05)
+        self.fail(router, PRIMARY, times=2)
+        time.sleep(0.06)
+        
+        # A recovering primary keeps its preference position
+        self.assertEqual(router.route([PRIMARY, FALLBACK]), [PRIMARY, FALLBACK])
+        self.assertTrue(router.acquire(PRIMARY))
+        self.assertEqual(router.get_stats()[PRIMARY]['state'], CircuitBreaker.HALF_OPEN)
+        self.assertFalse(router.acquire(PRIMARY))
+        self.assertEqual(router.route([PRIMARY, FALLBACK]), [FALLBACK])
+        
+        # A probe that never reported frees its slot on release
+        router.release(PRIMARY)
+        self.assertTrue(router.acquire(PRIMARY))
+        router.record_success(PRIMARY, 0.1)
+        self.assertEqual(router.get_stats()[PRIMARY]['state'], CircuitBreaker.CLOSED)
+        self.assertTrue(router.acquire(PRIMARY))
+    
+    def test_failed_probe_reopens_circuit(self):
+        router = self.router(recovery_timeout=0.05)
+        self.fail(router, PRIMARY, times=2)
+        time.sleep(0.06)
+        
+        self.fail(router, PRIMARY)
+        self.assertEqual(router.get_stats()[PRIMARY]['state'], CircuitBreaker.OPEN)
+        self.assertFalse(router.acquire(PRIMARY))
+    
+    def test_recent_error_rate_demotes_model(self):
+        router = self.router()
+        # Alternating outcomes never trip the breaker, but half the calls fail
+        for _ in range(4):
+            self.fail(router, PRIMARY)
+            router.record_success(PRIMARY, 0.1)
+        
+        self.assertEqual(router.get_stats()[PRIMARY]['recent_error_rate'], 0.5)
+        self.assertEqual(router.route([PRIMARY, FALLBACK]), [FALLBACK, PRIMARY])
+    
+    def test_stray_failure_does_not_reorder(self):
+        router = self.router()
+        for _ in range(9):
+            router.record_success(PRIMARY, 0.1)
+        self.fail(router, PRIMARY)
+        router.record_success(PRIMARY, 0.1)
+        
+        self.assertEqual(router.route([PRIMARY, FALLBACK]), [PRIMARY, FALLBACK])
+    
+    def test_credential_error_stops_routing(self):
+        router = self.router()
+        self.assertEqual(classify_error(CredentialError()), 'UnrecognizedClientException')
+        router.record_failure(PRIMARY, classify_error(CredentialError()), 0.1)
+        
+        self.assertTrue(router.credentials_invalid)
+        self.assertEqual(router.route([PRIMARY, FALLBACK]), [])
+        router.reset()
+        self.assertEqual(router.route([PRIMARY, FALLBACK]), [PRIMARY, FALLBACK])
+    
+    def test_llm_service_fails_fast_on_bad_credentials(self):
+        client = BadCredentialsStub()
+        service = LLMService(bedrock_client=client, enable_cache=False, router=self.router())
+        
+        with service.telemetry_scope('test') as calls:
+            first = service.query_llm("hello", model_id=PRIMARY, use_cache=False)
+            second = service.query_llm("hello again", model_id=PRIMARY, use_cache=False)
+        
+        # Only the first model was tried, and nothing after the credentials were found bad
+        self.assertEqual(len(client.calls), 1)
+        self.assertEqual(first, service._fallback_response("hello"))
+        self.assertEqual(second, service._fallback_response("hello again"))
+        self.assertEqual([call['attempts'] for call in calls], [1, 0])
+
+if __name__ == '__main__':
+    unittest.main()
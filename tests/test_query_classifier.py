@@ -0,0 +1,83 @@
+import unittest
+from unittest import mock
+from agent.research_agent.llm_service import LLMService
+from agent.research_agent.orchestrator import AIOrchestrator
+from agent.research_agent.query_classifier import CATEGORIES, QueryClassifier, get_query_classifier, softmax
+from agent.research_agent.stub_bedrock_client import StubBedrockClient
+
+def ambiguous_examples():
+    """Two phrasings whose labels disagree a third of the time, so raw posteriors are overconfident"""
+    examples = []
+    for i in range(40):
+        examples.append((f"market update {i}", 'STOCKS' if i % 3 else 'NEWS'))
+        examples.append((f"market report {i}", 'NEWS' if i % 3 else 'STOCKS'))
+    return examples
+
+class QueryClassifierTest(unittest.TestCase):
+    
+    def test_softmax_temperature_flattens(self):
+        scores = {'STOCKS': -1.0, 'NEWS': -3.0}
+        sharp, flat = softmax(scores), softmax(scores, temperature=4)
+        
+        self.assertAlmostEqual(sum(flat.values()), 1.0)
+        self.assertGreater(sharp['STOCKS'], flat['STOCKS'])
+        self.assertGreater(flat['STOCKS'], flat['NEWS'])
+    
+    def test_bundled_classifier_answers_clear_queries(self):
+        classifier = get_query_classifier()
+        
+        for query, category in [("apple stock price today", 'STOCKS'), ("latest news on the election", 'NEWS'),
+                                ("pixel 9 pro review", 'PRODUCT'), ("what is the meaning of life", 'GENERAL')]:
+            self.assertEqual(classifier.predict(query)[0], category, query)
+        self.assertAlmostEqual(sum(classifier.predict_proba("tell me about tesla").values()), 1.0)
+    
+    def test_calibration_lowers_overconfident_posteriors(self):
+        raw = QueryClassifier().train(ambiguous_examples())
+        calibrated = QueryClassifier().train(ambiguous_examples()).calibrate(ambiguous_examples())
+        
+        self.assertGreater(calibrated.temperature, 1)
+        raw_category, raw_confidence = raw.predict("market update")
+        category, confidence = calibrated.predict("market update")
+        self.assertEqual(category, raw_category)
+        self.assertLess(confidence, raw_confidence)
+    
+    def test_unknown_words_fall_back_to_the_prior(self):
+        classifier = QueryClassifier().train([("stock price", 'STOCKS')] * 3 + [("election news", 'NEWS')])
+        
+        self.assertEqual(classifier.predict("zzz qqq")[0], 'STOCKS')
+        self.assertEqual(set(classifier.predict_proba("zzz qqq")), set(CATEGORIES))
+
+class ClassificationThresholdTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.client = StubBedrockClient()
+        service = LLMService(bedrock_client=self.client, enable_cache=False)
+        with mock.patch.dict('os.environ', {'CLASSIFICATION_CACHE': 'false'}):
+            self.orchestrator = AIOrchestrator('', '', llm_service=service, factory=mock.Mock(llm_service=service))
+    
+    def classify(self, query: str, threshold: str) -> str:
+        with mock.patch.dict('os.environ', {'LOCAL_CLASSIFIER_THRESHOLD': threshold}):
+            return self.orchestrator.classify_query(query)
+    
+    def test_confident_query_skips_the_llm(self):
+        self.assertEqual(self.classify("pixel 9 pro review", '0.95'), 'PRODUCT')
+        
+        self.assertEqual(len(self.client.calls), 0)
+        self.assertEqual(self.orchestrator.get_classification_stats()['local'], 1)
+    
+    def test_uncertain_query_goes_to_the_llm(self):
+        self.classify("tell me about tesla", '0.95')
+        
+        self.assertEqual(len(self.client.calls), 1)
+        self.assertEqual(self.orchestrator.get_classification_stats()['llm'], 1)
+    
+    def test_threshold_applies_to_calibrated_confidence(self):
+        # Raw naive Bayes is about 0.77 confident here; calibrated, it is below 0.5
+        self.orchestrator.local_classifier = QueryClassifier().train(ambiguous_examples()).calibrate(ambiguous_examples())
+        self.classify("market update", '0.7')
+        
+        self.assertEqual(len(self.client.calls), 1)
+        self.assertEqual(self.orchestrator.get_classification_stats()['local'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+import json
+import time
+import unittest
+from agent.research_agent.region_hedger import HedgedBedrockClient
+from agent.research_agent.stub_bedrock_client import StubBedrockClient
+
+MODEL = 'anthropic.claude-3-haiku-20240307-v1:0'
+OTHER_MODEL = 'anthropic.claude-3-5-sonnet-20241022-v2:0'
+
+class RegionStub(StubBedrockClient):
+    """Local stub endpoint for one region: answers with its region name after latency seconds"""
+    
+    def __init__(self, region: str, latency: float = 0.0, fail: bool = False):
+        super().__init__(latency=latency)
+        self.region = region
+        self.fail = fail
+    
+    def _canned(self, model_id: str, prompt: str) -> str:
+        if self.fail:
+            raise RuntimeError(f"{self.region} throttled")
+        return self.region
+
+def request(model_id: str = MODEL):
+    body = json.dumps({'messages': [{'role': 'user', 'content': 'hello'}]})
+    return {'modelId': model_id, 'body': body}
+
+def answered_by(response) -> str:
+    return json.loads(response['body'].read())['content'][0]['text']
+
+class HedgedBedrockClientTest(unittest.TestCase):
+    
+    def hedger(self, **regions):
+        return HedgedBedrockClient(regions, default_delay=0.1, min_delay=0.05, min_samples=3)
+    
+    def test_fast_primary_is_not_hedged(self):
+        hedger = self.hedger(east=RegionStub('east'), west=RegionStub('west'))
+        
+        self.assertEqual(answered_by(hedger.invoke_model(**request())), 'east')
+        self.assertEqual(len(hedger.clients['west'].calls), 0)
+        self.assertEqual(hedger.get_region_stats()['east']['requests'], 1)
+    
+    def test_slow_primary_is_hedged_and_faster_region_wins(self):
+        hedger = self.hedger(east=RegionStub('east', latency=1.0), west=RegionStub('west'))
+        
+        start = time.time()
+        self.assertEqual(answered_by(hedger.invoke_model(**request())), 'west')
+        self.assertLess(time.time() - start, 0.5)
+        stats = hedger.get_region_stats()
+        self.assertEqual(stats['west']['hedges_sent'], 1)
+        self.assertEqual(stats['west']['hedge_wins'], 1)
+    
+    def test_error_fails_over_without_waiting(self):
+        hedger = self.hedger(east=RegionStub('east', fail=True), west=RegionStub('west'))
+        
+        self.assertEqual(answered_by(hedger.invoke_model(**request())), 'west')
+        self.assertEqual(hedger.get_region_stats()['east']['errors'], 1)
+    
+    def test_remaining_regions_are_tried_after_a_hedge(self):
+        hedger = self.hedger(east=RegionStub('east', latency=1.0), west=RegionStub('west', latency=1.0),
+                             central=RegionStub('central'))
+        
+        start = time.time()
+        self.assertEqual(answered_by(hedger.invoke_model(**request())), 'central')
+        self.assertLess(time.time() - start, 0.5)
+    
+    def test_hedge_error_launches_the_next_region(self):
+        hedger = self.hedger(east=RegionStub('east', latency=1.0), west=RegionStub('west', fail=True),
+                             central=RegionStub('central'))
+        
+        start = time.time()
+        self.assertEqual(answered_by(hedger.invoke_model(**request())), 'central')
+        self.assertLess(time.time() - start, 0.5)
+    
+    def test_all_regions_failing_raises_last_error(self):
+        hedger = self.hedger(east=RegionStub('east', fail=True), west=RegionStub('west', fail=True))
+        
+        with self.assertRaises(RuntimeError):
+            hedger.invoke_model(**request())
+    
+    def test_latency_history_is_kept_per_model(self):
+        hedger = self.hedger(east=RegionStub('east', latency=0.2))
+        for _ in range(3):
+            hedger.invoke_model(**request(MODEL))
+        
+        # A slow model's history must not set the hedge threshold of another model
+        self.assertGreaterEqual(hedger.hedge_delay('east', (MODEL, 'invoke')), 0.2)
+        self.assertEqual(hedger.hedge_delay('east', (OTHER_MODEL, 'invoke')), 0.1)
+        self.assertEqual(hedger.hedge_delay('east', (MODEL, 'stream')), 0.1)
+        self.assertEqual(list(hedger.get_region_stats()['east']['latency']), [MODEL])
+    
+    def test_untried_regions_rank_after_measured_ones(self):
+        hedger = self.hedger(east=RegionStub('east'), west=RegionStub('west'))
+        for _ in range(3):
+            hedger.invoke_model(**request())
+        
+        self.assertEqual(hedger.ranked_regions((MODEL, 'invoke')), ['east', 'west'])
+        self.assertEqual(len(hedger.clients['west'].calls), 0)
+    
+    def test_time_queued_for_a_worker_does_not_trigger_a_hedge(self):
+        hedger = HedgedBedrockClient({'east': RegionStub('east', latency=0.05), 'west': RegionStub('west')},
+                                     default_delay=0.1, max_workers=1)
+        busy = hedger._executor.submit(time.sleep, 0.3)
+        
+        self.assertEqual(answered_by(hedger.invoke_model(**request())), 'east')
+        busy.result()
+        self.assertEqual(hedger.get_region_stats()['west']['requests'], 0)
+    
+    def test_stream_is_hedged(self):
+        hedger = self.hedger(east=RegionStub('east', latency=1.0), west=RegionStub('west'))
+        
+        response = hedger.invoke_model_with_response_stream(**request())
+        text = ''.join(json.loads(event['chunk']['bytes']).get('delta', {}).get('text', '')
+                       for event in response['body'])
+        self.assertEqual(text.strip(), 'west')
+
+if __name__ == '__main__':
+    unittest.main()
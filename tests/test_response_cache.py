@@ -0,0 +1,86 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from agent.research_agent.response_cache import ResponseCache
+
+class ResponseCacheTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.directory, 'cache.sqlite')
+    
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+    
+    def test_key_is_stable_and_content_addressed(self):
+        self.assertEqual(ResponseCache.make_key('m', {'b': 1, 'a': 2}), ResponseCache.make_key('m', {'a': 2, 'b': 1}))
+        self.assertNotEqual(ResponseCache.make_key('m', 'prompt'), ResponseCache.make_key('m', 'prompt!'))
+    
+    def test_entry_expires_after_ttl(self):
+        cache = ResponseCache(default_ttl=60)
+        cache.set('short', 'value', ttl=0.05)
+        cache.set('long', 'value')
+        
+        self.assertEqual(cache.get('short'), 'value')
+        time.sleep(0.06)
+        self.assertIsNone(cache.get('short'))
+        self.assertEqual(cache.get('long'), 'value')
+        self.assertEqual(cache.get_stats()['misses'], 1)
+    
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = ResponseCache(max_entries=2)
+        cache.set('a', '1')
+        cache.set('b', '2')
+        cache.get('a')
+        cache.set('c', '3')
+        
+        self.assertEqual(cache.get('a'), '1')
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('c'), '3')
+        self.assertEqual(cache.get_stats()['entries'], 2)
+    
+    def test_disk_tier_survives_a_new_instance(self):
+        ResponseCache(db_path=self.db_path).set('key', 'stored')
+        
+        cache = ResponseCache(db_path=self.db_path)
+        self.assertEqual(cache.get('key'), 'stored')
+        self.assertEqual(cache.get('key'), 'stored')
+        stats = cache.get_stats()
+        self.assertEqual((stats['disk_hits'], stats['hits']), (1, 1))
+    
+    def test_disk_tier_backs_evicted_entries(self):
+        cache = ResponseCache(max_entries=1, db_path=self.db_path)
+        cache.set('a', '1')
+        cache.set('b', '2')
+        
+        self.assertEqual(cache.get('a'), '1')
+        self.assertEqual(cache.get_stats()['disk_hits'], 1)
+    
+    def test_expired_disk_entry_is_removed(self):
+        ResponseCache(db_path=self.db_path).set('key', 'stored', ttl=0.05)
+        time.sleep(0.06)
+        
+        cache = ResponseCache(db_path=self.db_path)
+        self.assertIsNone(cache.get('key'))
+        row = cache._db.execute("SELECT COUNT(*) FROM cache").fetchone()
+        self.assertEqual(row[0], 0)
+    
+    def test_unusable_db_path_disables_disk_tier(self):
+        cache = ResponseCache(db_path=os.path.join(self.directory, 'missing', 'cache.sqlite'))
+        cache.set('key', 'value')
+        
+        self.assertIsNone(cache._db)
+        self.assertEqual(cache.get('key'), 'value')
+    
+    def test_clear_empties_both_tiers(self):
+        cache = ResponseCache(db_path=self.db_path)
+        cache.set('key', 'value')
+        cache.clear()
+        
+        self.assertIsNone(cache.get('key'))
+        self.assertIsNone(ResponseCache(db_path=self.db_path).get('key'))
+
+if __name__ == '__main__':
+    unittest.main()
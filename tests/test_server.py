@@ -0,0 +1,87 @@
+import asyncio
+import json
+import threading
+import unittest
+from agent.research_agent.server import ResearchServer
+
+class BlockingOrchestrator:
+    """Stands in for AIOrchestrator: each query blocks until release is set"""
+    
+    last_first_section_seconds = None
+    
+    def __init__(self):
+        self.release = threading.Event()
+        self.started = 0
+        self.lock = threading.Lock()
+    
+    def analyze_query(self, query: str, memory=None, deadline=None, on_event=None) -> str:
+        with self.lock:
+            self.started += 1
+        self.release.wait(5)
+        return f"Report on {query}"
+    
+    def get_last_query_metrics(self):
+        return {}
+    
+    def get_last_stage_timings(self):
+        return {}
+
+def research(server: ResearchServer, query: str, session_id: str):
+    body = json.dumps({'query': query, 'session_id': session_id}).encode('utf-8')
+    return server._dispatch('POST', '/research', body)
+
+class ServerBackPressureTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.orchestrator = BlockingOrchestrator()
+        self.server = ResearchServer(self.orchestrator, max_workers=1, max_pending=2)
+    
+    def tearDown(self):
+        self.orchestrator.release.set()
+        self.server.executor.shutdown(wait=True)
+    
+    def test_requests_past_max_pending_get_503(self):
+        async def scenario():
+            accepted = [asyncio.ensure_future(research(self.server, f"query {i}", f"s{i}")) for i in range(2)]
+            while self.server.in_flight < 2:
+                await asyncio.sleep(0.005)
+            
+            status, payload = await research(self.server, "one too many", 's2')
+            self.orchestrator.release.set()
+            return status, payload, await asyncio.gather(*accepted)
+        
+        status, payload, accepted = asyncio.run(scenario())
+        
+        self.assertEqual(status, 503)
+        self.assertIn('busy', payload['error'])
+        self.assertEqual([status for status, _ in accepted], [200, 200])
+        self.assertEqual(accepted[0][1]['result'], "Report on query 0")
+        self.assertEqual(self.server.stats['rejected'], 1)
+        self.assertEqual(self.server.in_flight, 0)
+        # The refused request never reached the orchestrator
+        self.assertEqual(self.orchestrator.started, 2)
+    
+    def test_capacity_frees_up_after_completion(self):
+        self.orchestrator.release.set()
+        
+        async def scenario():
+            first = await research(self.server, "first", 's0')
+            second = await research(self.server, "second", 's1')
+            third = await research(self.server, "third", 's2')
+            return [first[0], second[0], third[0]]
+        
+        self.assertEqual(asyncio.run(scenario()), [200, 200, 200])
+        self.assertEqual(self.server.stats['rejected'], 0)
+    
+    def test_invalid_request_is_refused_before_queueing(self):
+        async def scenario():
+            return await self.server._dispatch('POST', '/research', b'{"query": ""}')
+        
+        status, payload = asyncio.run(scenario())
+        
+        self.assertEqual(status, 400)
+        self.assertEqual(self.server.in_flight, 0)
+        self.assertEqual(self.orchestrator.started, 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+import threading
+import time
+import unittest
+from agent.research_agent.single_flight import SingleFlight, get_single_flight
+
+class SingleFlightTest(unittest.TestCase):
+    
+    def run_concurrently(self, flight: SingleFlight, key, function, callers: int = 4):
+        """Have callers all call do(key) while the first execution is blocked; return their outcomes"""
+        outcomes = []
+        lock = threading.Lock()
+        
+        def call():
+            try:
+                outcome = flight.do(key, function)
+            except Exception as e:
+                outcome = e
+            with lock:
+                outcomes.append(outcome)
+        
+        threads = [threading.Thread(target=call) for _ in range(callers)]
+        for thread in threads:
+            thread.start()
+        return threads, outcomes
+    
+    def wait_for_followers(self, flight: SingleFlight, callers: int):
+        while flight.get_stats()['calls'] < callers:
+            time.sleep(0.005)
+    
+    def test_concurrent_calls_share_one_execution(self):
+        flight = SingleFlight('test')
+        release = threading.Event()
+        executions = []
+        
+        def research():
+            executions.append(1)
+            release.wait(5)
+            return {'report': 'shared'}
+        
+        threads, outcomes = self.run_concurrently(flight, 'pixel 9', research)
+        self.wait_for_followers(flight, 4)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+        
+        self.assertEqual(len(executions), 1)
+        self.assertEqual(outcomes, [{'report': 'shared'}] * 4)
+        stats = flight.get_stats()
+        self.assertEqual((stats['executions'], stats['coalesced'], stats['in_flight']), (1, 3, 0))
+    
+    def test_error_reaches_every_waiting_caller(self):
+        flight = SingleFlight('test')
+        release = threading.Event()
+        
+        def research():
+            release.wait(5)
+            raise RuntimeError("search quota exhausted")
+        
+        threads, outcomes = self.run_concurrently(flight, 'pixel 9', research)
+        self.wait_for_followers(flight, 4)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+        
+        self.assertEqual(len(outcomes), 4)
+        for outcome in outcomes:
+            self.assertIsInstance(outcome, RuntimeError)
+        self.assertEqual(flight.get_stats()['errors'], 1)
+    
+    def test_nothing_is_cached_after_completion(self):
+        flight = SingleFlight('test')
+        calls = []
+        
+        for _ in range(2):
+            flight.do('key', lambda: calls.append(1) or len(calls))
+        
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(flight.get_stats()['coalesced'], 0)
+    
+    def test_failed_key_runs_again(self):
+        flight = SingleFlight('test')
+        
+        with self.assertRaises(ValueError):
+            flight.do('key', lambda: int('not a number'))
+        self.assertEqual(flight.do('key', lambda: 'recovered'), 'recovered')
+    
+    def test_different_keys_do_not_coalesce(self):
+        flight = SingleFlight('test')
+        release = threading.Event()
+        started = []
+        
+        def research(key):
+            started.append(key)
+            release.wait(5)
+            return key
+        
+        threads = [threading.Thread(target=flight.do, args=(key, lambda key=key: research(key))) for key in 'ab']
+        for thread in threads:
+            thread.start()
+        self.wait_for_followers(flight, 2)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+        
+        self.assertEqual(sorted(started), ['a', 'b'])
+        self.assertEqual(flight.get_stats()['executions'], 2)
+    
+    def test_groups_are_shared_per_name(self):
+        self.assertIs(get_single_flight('test-group'), get_single_flight('test-group'))
+        self.assertIsNot(get_single_flight('test-group'), get_single_flight('other-group'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import threading
+import time
+import unittest
+from agent.research_agent.stage_graph import StageGraph
+
+def sleeper(seconds: float, value=None):
+    def stage(inputs):
+        time.sleep(seconds)
+        return value
+    return stage
+
+def failing(inputs):
+    raise RuntimeError("scrape blocked")
+
+class StageGraphTest(unittest.TestCase):
+    
+    def test_dependents_receive_results(self):
+        graph = StageGraph()
+        graph.add('search', lambda inputs: ['url'])
+        graph.add('scrape', lambda inputs: inputs['search'] + ['page'], depends=['search'])
+        
+        run = graph.run()
+        
+        self.assertEqual(run.get('scrape'), ['url', 'page'])
+        self.assertEqual(run.status('scrape'), 'done')
+    
+    def test_independent_branches_overlap(self):
+        graph = StageGraph(max_workers=2)
+        graph.add('youtube', sleeper(0.1, 'videos'))
+        graph.add('scrape', sleeper(0.1, 'pages'))
+        
+        run = graph.run()
+        
+        self.assertLess(run.seconds, 0.18)
+        self.assertEqual((run.get('youtube'), run.get('scrape')), ('videos', 'pages'))
+    
+    def test_failure_skips_every_dependent(self):
+        graph = StageGraph()
+        graph.add('search', lambda inputs: ['url'])
+        graph.add('scrape', failing, depends=['search'])
+        graph.add('analysis', lambda inputs: 'report', depends=['scrape'])
+        graph.add('summary', lambda inputs: 'summary', depends=['analysis'])
+        graph.add('youtube', lambda inputs: 'videos')
+        
+        run = graph.run()
+        
+        self.assertEqual(run.status('scrape'), 'failed')
+        self.assertEqual(run.errors['scrape'], 'scrape blocked')
+        self.assertEqual((run.status('analysis'), run.status('summary')), ('skipped', 'skipped'))
+        self.assertEqual(run.get('analysis', 'fallback'), 'fallback')
+        self.assertEqual(run.get('youtube'), 'videos')
+    
+    def test_timeout_abandons_running_and_skips_the_rest(self):
+        release = threading.Event()
+        graph = StageGraph()
+        graph.add('fast', lambda inputs: 'done')
+        graph.add('slow', lambda inputs: release.wait(5))
+        graph.add('after_slow', lambda inputs: 'never', depends=['slow'])
+        
+        started = time.time()
+        run = graph.run(timeout=0.1)
+        release.set()
+        
+        self.assertLess(time.time() - started, 1.0)
+        self.assertEqual(run.status('fast'), 'done')
+        self.assertEqual(run.status('slow'), 'timed_out')
+        self.assertGreaterEqual(run.timings['slow']['seconds'], 0.05)
+        self.assertEqual(run.status('after_slow'), 'skipped')
+        self.assertIsNone(run.get('slow'))
+    
+    def test_queued_stage_is_skipped_at_timeout(self):
+        release = threading.Event()
+        graph = StageGraph(max_workers=1)
+        graph.add('slow', lambda inputs: release.wait(5))
+        graph.add('queued', lambda inputs: 'never')
+        
+        run = graph.run(timeout=0.05)
+        release.set()
+        
+        self.assertEqual(run.status('slow'), 'timed_out')
+        self.assertEqual(run.status('queued'), 'skipped')
+    
+    def test_dependencies_must_be_declared_first(self):
+        graph = StageGraph()
+        graph.add('search', lambda inputs: None)
+        
+        with self.assertRaises(ValueError):
+            graph.add('analysis', lambda inputs: None, depends=['scrape'])
+        with self.assertRaises(ValueError):
+            graph.add('search', lambda inputs: None)
+    
+    def test_summary_lists_every_stage(self):
+        graph = StageGraph()
+        graph.add('search', lambda inputs: None)
+        graph.add('scrape', failing, depends=['search'])
+        
+        summary = graph.run().summary()
+        
+        self.assertIn('search 0.0s', summary)
+        self.assertIn('scrape failed', summary)
+
+if __name__ == '__main__':
+    unittest.main()